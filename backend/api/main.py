@@ -9,11 +9,12 @@ from typing import Optional
 
 from fastapi import FastAPI, File, Form, HTTPException, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 
 from backend.config.settings import load_settings
 from backend.logging_utils.json_logger import tail_logs
-from backend.models.types import ReviewDecision, RunRecord, RunState, RunStatus, Stage
+from backend.models.types import CameraProfile, RethresholdRequest, ReviewDecision, RunRecord, RunState, RunStatus, Stage
+from backend.pipeline.cameras import CameraProfileStore, camera_roi_config
 from backend.pipeline.orchestrator import export_run, run_pipeline
 from backend.pipeline.store import RunStore
 from backend.utils.io import read_json, write_json
@@ -21,7 +22,9 @@ from backend.utils.io import read_json, write_json
 
 settings = load_settings()
 store = RunStore(settings.runs_dir)
+cameras = CameraProfileStore(settings.cameras_dir)
 threads: dict[str, threading.Thread] = {}
+live_stops: dict[str, threading.Event] = {}
 
 app = FastAPI(title="Civic Lens API", version="0.1.0")
 app.add_middleware(
@@ -39,6 +42,22 @@ def _read_or_default(path: Path, default: dict[str, Any]) -> dict[str, Any]:
     return default
 
 
+def _roi_payload(roi_config_json: Optional[str], camera_id: Optional[str]) -> dict[str, Any]:
+    if roi_config_json and camera_id:
+        raise HTTPException(status_code=400, detail="send either camera_id or roi_config_json, not both")
+    if camera_id:
+        try:
+            profile = cameras.get(camera_id)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        if profile is None:
+            raise HTTPException(status_code=404, detail="camera_id not found")
+        return camera_roi_config(profile)
+    if roi_config_json:
+        return __import__("json").loads(roi_config_json)
+    return read_json(Path("backend/config/default_roi_config.json"))
+
+
 def _anchor_paths(packet: dict[str, Any]) -> list[str]:
     out: list[str] = []
     for item in packet.get("anchor_frames", [])[:3]:
@@ -224,6 +243,21 @@ def _build_live_events(run_dir: Path) -> list[dict[str, Any]]:
     return events
 
 
+def _frame_store_jpeg(run_dir: Path, path: str) -> Optional[bytes]:
+    from backend.video.manifest import load_manifest
+
+    manifest = load_manifest(run_dir)
+    if manifest is None or (manifest.get("frame_store") or {}).get("backend") != "memmap":
+        return None
+    from backend.video.frame_store import open_frame_store
+
+    frame_store = open_frame_store(manifest)
+    try:
+        return frame_store.encode_jpeg(path)
+    finally:
+        frame_store.close()
+
+
 @app.get("/api/health")
 def health() -> dict[str, str]:
     return {"status": "ok"}
@@ -233,7 +267,9 @@ def health() -> dict[str, str]:
 async def create_run(
     video: UploadFile = File(...),
     roi_config_json: Optional[str] = Form(default=None),
+    camera_id: Optional[str] = Form(default=None),
 ) -> dict[str, str]:
+    roi_payload = _roi_payload(roi_config_json, camera_id)
     run_id = f"run_{uuid.uuid4().hex[:10]}"
     run_dir = settings.runs_dir / run_id
     input_dir = run_dir / "input"
@@ -245,20 +281,80 @@ async def create_run(
     with video_path.open("wb") as f:
         shutil.copyfileobj(video.file, f)
 
-    if roi_config_json:
-        roi_payload = __import__("json").loads(roi_config_json)
-    else:
-        roi_payload = read_json(Path("backend/config/default_roi_config.json"))
+    roi_path = cfg_dir / "roi_config.json"
+    write_json(roi_path, roi_payload)
+
+    status = RunStatus(run_id=run_id, state=RunState.PENDING, stage=Stage.INGEST, progress_pct=0)
+    record = RunRecord(
+        run_id=run_id, video_path=str(video_path), roi_config_path=str(roi_path), status=status, camera_id=camera_id
+    )
+    store.register(record)
+    return {"run_id": run_id}
+
+
+def _live_source(source: str) -> str:
+    """Only files under ``LIVE_SOURCES_DIR`` and URLs listed in ``LIVE_SOURCE_URLS`` may be followed."""
+    if "://" in source:
+        if not any(source == url or (url.endswith("/") and source.startswith(url)) for url in settings.live_source_urls):
+            raise HTTPException(status_code=403, detail="source URL not allowed")
+        return source
+    resolved = (settings.live_sources_dir / source).resolve()
+    if not resolved.is_relative_to(settings.live_sources_dir):
+        raise HTTPException(status_code=403, detail="source must be under LIVE_SOURCES_DIR")
+    if not resolved.is_file():
+        raise HTTPException(status_code=400, detail="source not found")
+    return str(resolved)
+
+
+@app.post("/api/runs/live")
+def create_live_run(
+    source: str = Form(...),
+    roi_config_json: Optional[str] = Form(default=None),
+    camera_id: Optional[str] = Form(default=None),
+) -> dict[str, str]:
+    """Register a run that follows a growing video file or a stream URL instead of an upload."""
+    source = _live_source(source)
+    roi_payload = _roi_payload(roi_config_json, camera_id)
+    run_id = f"run_{uuid.uuid4().hex[:10]}"
+    cfg_dir = settings.runs_dir / run_id / "config"
+    cfg_dir.mkdir(parents=True, exist_ok=True)
 
     roi_path = cfg_dir / "roi_config.json"
     write_json(roi_path, roi_payload)
 
     status = RunStatus(run_id=run_id, state=RunState.PENDING, stage=Stage.INGEST, progress_pct=0)
-    record = RunRecord(run_id=run_id, video_path=str(video_path), roi_config_path=str(roi_path), status=status)
+    record = RunRecord(
+        run_id=run_id, video_path=source, roi_config_path=str(roi_path), status=status, source_type="live", camera_id=camera_id
+    )
     store.register(record)
     return {"run_id": run_id}
 
 
+@app.get("/api/cameras")
+def list_cameras() -> dict:
+    return {"cameras": [profile.model_dump(mode="json") for profile in cameras.all()]}
+
+
+@app.get("/api/cameras/{camera_id}")
+def get_camera(camera_id: str) -> dict:
+    try:
+        profile = cameras.get(camera_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if profile is None:
+        raise HTTPException(status_code=404, detail="camera_id not found")
+    return profile.model_dump(mode="json")
+
+
+@app.post("/api/cameras")
+def save_camera(profile: CameraProfile) -> dict:
+    """Create or replace a camera profile; its compiled masks are cached by polygon hash, so edits never go stale."""
+    try:
+        return cameras.put(profile).model_dump(mode="json")
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
 @app.post("/api/runs/{run_id}/start")
 def start_run(run_id: str) -> dict[str, str]:
     if not store.exists(run_id):
@@ -267,12 +363,25 @@ def start_run(run_id: str) -> dict[str, str]:
     if run_id in threads and threads[run_id].is_alive():
         return {"status": "ALREADY_RUNNING"}
 
-    thread = threading.Thread(target=run_pipeline, args=(run_id, store, settings), daemon=True)
+    stop_event = threading.Event()
+    live_stops[run_id] = stop_event
+    thread = threading.Thread(target=run_pipeline, args=(run_id, store, settings, stop_event), daemon=True)
     thread.start()
     threads[run_id] = thread
     return {"status": "STARTED"}
 
 
+@app.post("/api/runs/{run_id}/stop")
+def stop_run(run_id: str) -> dict[str, str]:
+    """End a live run: ingest stops, packets already emitted still go through Pro and merge."""
+    if not store.exists(run_id):
+        raise HTTPException(status_code=404, detail="run_id not found")
+    if store.get(run_id).source_type != "live" or run_id not in live_stops:
+        return {"status": "NOT_LIVE"}
+    live_stops[run_id].set()
+    return {"status": "STOPPING"}
+
+
 @app.get("/api/runs")
 def list_runs() -> dict:
     return {
@@ -327,6 +436,66 @@ def save_review(run_id: str, event_id: str, decision: ReviewDecision) -> dict[st
     return {"status": "OK"}
 
 
+# Written by the Gemini, postprocess and review stages from the previous candidates.
+_DOWNSTREAM_ARTIFACTS = (
+    "flash_events.json",
+    "pro_events.json",
+    "flash_decisions.json",
+    "pro_decisions.json",
+    "events_final.json",
+    "trace.json",
+    "review.json",
+)
+
+
+@app.post("/api/runs/{run_id}/rethreshold")
+def rethreshold(run_id: str, request: RethresholdRequest) -> dict:
+    """Rebuild local candidates/packets from the run's stored features; Gemini stages are not re-run.
+
+    Gemini decisions, final events, trace and review of the old candidates are
+    removed and the run goes back to PENDING at LOCAL_PROPOSALS; exported runs
+    are refused.
+    """
+    if not store.exists(run_id):
+        raise HTTPException(status_code=404, detail="run_id not found")
+    if run_id in threads and threads[run_id].is_alive():
+        raise HTTPException(status_code=409, detail="run is still in progress")
+    status = store.get(run_id).status
+    if status.state == RunState.EXPORTED:
+        raise HTTPException(status_code=409, detail="run is already exported")
+    from backend.local_engine.rethreshold import rethreshold_proposals
+    from backend.logging_utils.json_logger import RunLogger
+
+    run_dir = settings.runs_dir / run_id
+    try:
+        payload = rethreshold_proposals(
+            run_id,
+            run_dir,
+            Path("backend/config/proposal_config.json"),
+            request.overrides,
+            RunLogger(run_id, run_dir / "pipeline.log.jsonl"),
+        )
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    for name in _DOWNSTREAM_ARTIFACTS:
+        (run_dir / name).unlink(missing_ok=True)
+    local_stages = (Stage.INGEST.value, Stage.LOCAL_PROPOSALS.value)
+    store.update_status(
+        run_id,
+        RunStatus(
+            run_id=run_id,
+            state=RunState.PENDING,
+            stage=Stage.LOCAL_PROPOSALS,
+            progress_pct=50,
+            stage_message="Proposals rebuilt from stored features; Gemini stages not run",
+            timings_ms={k: v for k, v in status.timings_ms.items() if k in local_stages},
+        ),
+    )
+    return payload
+
+
 @app.get("/api/runs/{run_id}/logs")
 def get_logs(run_id: str, tail: int = 50) -> dict:
     if not store.exists(run_id):
@@ -349,6 +518,10 @@ def get_artifact(run_id: str, path: str):
         resolved = (run_dir / requested).resolve()
     if not str(resolved).startswith(str(run_dir)):
         raise HTTPException(status_code=400, detail="invalid artifact path")
+    if not resolved.exists():
+        frame_bytes = _frame_store_jpeg(run_dir, path)
+        if frame_bytes is not None:
+            return Response(content=frame_bytes, media_type="image/jpeg")
     if not resolved.exists() or not resolved.is_file():
         raise HTTPException(status_code=404, detail="artifact not found")
     return FileResponse(resolved)
@@ -0,0 +1,76 @@
+"""Decode throughput of the ingest sampling strategies on synthetic clips.
+
+Usage: python -m backend.benchmarks.decode_sampling [--seconds 30] [--strides 8,15,60,150]
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+import cv2
+
+from backend.benchmarks.synthetic import write_synthetic_clip
+from backend.video.sampling import iter_sampled_frames
+
+
+STRATEGIES = ("read", "grab", "seek")
+
+
+def bench_strategy(video_path: Path, sample_every: int, strategy: str) -> dict[str, Any]:
+    cap = cv2.VideoCapture(str(video_path))
+    checksums: list[float] = []
+    indices: list[int] = []
+    start = time.perf_counter()
+    for frame_idx, frame in iter_sampled_frames(cap, sample_every, strategy):
+        indices.append(frame_idx)
+        checksums.append(float(frame[::16, ::16].mean()))
+    wall = time.perf_counter() - start
+    cap.release()
+    return {
+        "strategy": strategy,
+        "sample_every": sample_every,
+        "frames": len(indices),
+        "wall_s": wall,
+        "fps": len(indices) / wall if wall > 0 else 0.0,
+        "indices": indices,
+        "checksums": checksums,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--strides", default="8,15,60,150", help="comma separated sample_every values")
+    parser.add_argument("--video", type=Path, default=None, help="benchmark an existing clip instead of a synthetic one")
+    args = parser.parse_args(argv)
+
+    strides = [max(1, int(s)) for s in args.strides.split(",") if s.strip()]
+    with tempfile.TemporaryDirectory() as tmp:
+        video = args.video or write_synthetic_clip(Path(tmp) / "synthetic.mp4", args.seconds, args.width, args.height, args.fps)
+        print(f"video={video} strides={strides}")
+        print(f"{'sample_every':>12} {'strategy':>8} {'frames':>7} {'wall_s':>8} {'frames/s':>9} {'speedup':>8} {'match':>6}")
+        for stride in strides:
+            baseline = None
+            for strategy in STRATEGIES:
+                row = bench_strategy(video, stride, strategy)
+                if baseline is None:
+                    baseline = row
+                match = row["indices"] == baseline["indices"] and all(
+                    abs(a - b) < 1.0 for a, b in zip(row["checksums"], baseline["checksums"])
+                )
+                speedup = baseline["wall_s"] / row["wall_s"] if row["wall_s"] > 0 else 0.0
+                print(
+                    f"{stride:>12} {strategy:>8} {row['frames']:>7} {row['wall_s']:>8.3f} "
+                    f"{row['fps']:>9.1f} {speedup:>7.2f}x {'yes' if match else 'NO':>6}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Candidates and Gemini calls avoided by ego-motion compensation on moving-camera clips.
+
+Usage: python -m backend.benchmarks.ego_motion [--pans 0,2,4] [--video clip.mp4 ...] [--model affine]
+
+Each clip is ingested once, then the local proposal engine runs with
+``ego_motion_compensation`` off and on. ``flash`` is the number of packets the
+Flash stage would be sent under the perf config's ``flash_min_local_score`` and
+``gemini_flash_max_candidates``; Pro calls are bounded by the same packets (at
+most ``gemini_pro_max_candidates``). The synthetic clips use the street
+texture and pan it by ``--pans`` pixels per frame over the same scripted
+events (red signal, one wrong-side vehicle at 4-9 s, a burst of central
+movers at 10-16 s).
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+from backend.benchmarks.synthetic import write_synthetic_clip
+from backend.config.perf import load_perf_config
+from backend.local_engine.proposal_engine import _build_proposals, _load_config, _working_size, extract_features
+from backend.logging_utils.json_logger import RunLogger
+from backend.models.types import Candidate
+from backend.pipeline.ingest import ingest_video
+from backend.utils.io import read_json
+
+
+def flash_calls(candidates: list[Candidate], perf: dict[str, Any]) -> int:
+    """Packet count ``GeminiClient`` would send to Flash (its selection keeps at least one packet)."""
+    if not candidates:
+        return 0
+    eligible = sum(1 for c in candidates if c.score >= perf["flash_min_local_score"])
+    return min(int(perf["gemini_flash_max_candidates"]), max(1, eligible))
+
+
+def run_once(run_dir: Path, manifest: Any, roi_cfg: dict[str, Any], cfg: dict[str, Any], perf: dict[str, Any]) -> tuple[list[Candidate], float]:
+    source_w = int(manifest.get("source_width") or manifest.frame_width)
+    source_h = int(manifest.get("source_height") or manifest.frame_height)
+    work_w, work_h, _scale = _working_size(source_w, source_h, perf)
+    start = time.perf_counter()
+    extractor, _workers = extract_features(run_dir, manifest, roi_cfg, cfg, work_w, work_h, dict(perf, proposal_workers=1))
+    pruned, _packets = _build_proposals("bench", run_dir, manifest, extractor, cfg, extractor.detectors)
+    return pruned, (time.perf_counter() - start) * 1000.0 / max(1, len(manifest))
+
+
+def _types(candidates: list[Candidate]) -> str:
+    counts = Counter(c.event_type.value for c in candidates)
+    return ",".join(f"{name.split('_')[0]}:{n}" for name, n in sorted(counts.items())) or "-"
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pans", default="0,2,4", help="comma separated synthetic pan speeds (px/frame)")
+    parser.add_argument("--video", type=Path, action="append", default=[], help="recorded clip; repeat for several")
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--model", default="affine", help="ego_motion_model")
+    parser.add_argument("--perf-config", type=Path, default=Path("backend/config/perf_config.json"))
+    parser.add_argument("--roi-config", type=Path, default=Path("backend/config/default_roi_config.json"))
+    parser.add_argument("--proposal-config", type=Path, default=Path("backend/config/proposal_config.json"))
+    args = parser.parse_args(argv)
+
+    perf = load_perf_config(args.perf_config)
+    roi_cfg = read_json(args.roi_config)
+    base_cfg = _load_config(args.proposal_config)
+    pans = [float(p) for p in args.pans.split(",") if p.strip()]
+
+    print(
+        f"{'clip':>20} {'cand_off':>8} {'cand_on':>7} {'avoided':>7} {'flash_off':>9} {'flash_on':>8} "
+        f"{'ms_off':>7} {'ms_on':>6}  types_off -> types_on"
+    )
+    totals = Counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        clips = [
+            (
+                f"pan_{pan:g}px",
+                write_synthetic_clip(
+                    Path(tmp) / f"pan_{pan:g}.mp4", args.seconds, args.width, args.height, args.fps, pan, street_texture=True
+                ),
+            )
+            for pan in pans
+        ]
+        clips += [(video.name, video) for video in args.video]
+        for label, video in clips:
+            run_dir = Path(tmp) / f"run_{label}"
+            manifest = ingest_video(
+                video,
+                run_dir,
+                int(perf["analysis_fps_short"]),
+                int(perf["analysis_fps_long"]),
+                int(perf["long_video_threshold_sec"]),
+                RunLogger("bench", Path(tmp) / "bench.log.jsonl"),
+            )
+            off, ms_off = run_once(run_dir, manifest, roi_cfg, dict(base_cfg, ego_motion_compensation=False), perf)
+            on, ms_on = run_once(run_dir, manifest, roi_cfg, dict(base_cfg, ego_motion_compensation=True, ego_motion_model=args.model), perf)
+            f_off, f_on = flash_calls(off, perf), flash_calls(on, perf)
+            totals.update(cand_off=len(off), cand_on=len(on), flash_off=f_off, flash_on=f_on)
+            print(
+                f"{label:>20} {len(off):>8} {len(on):>7} {len(off) - len(on):>7} {f_off:>9} {f_on:>8} "
+                f"{ms_off:>7.2f} {ms_on:>6.2f}  {_types(off)} -> {_types(on)}"
+            )
+    print(
+        f"{'total':>20} {totals['cand_off']:>8} {totals['cand_on']:>7} {totals['cand_off'] - totals['cand_on']:>7} "
+        f"{totals['flash_off']:>9} {totals['flash_on']:>8}  flash calls avoided: {totals['flash_off'] - totals['flash_on']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
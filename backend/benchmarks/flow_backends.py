@@ -0,0 +1,94 @@
+"""Wrong-side flow backends: dense Farneback vs sparse Lucas-Kanade on the padded lane crop.
+
+Usage: python -m backend.benchmarks.flow_backends [--video clip.mp4 ...] [--max-corners 100] [--min-motion 0.5]
+
+Reports ms per frame pair for each backend and how well LK agrees with the
+dense path: ``p95_diff`` of ``flow_cos``, ``hit_flips`` at the wrong-side
+threshold, and ``dir_agree`` (share of pairs with a clear dense direction,
+``|flow_cos| >= 0.5``, where LK has the same sign).
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+from typing import Optional
+
+import numpy as np
+
+from backend.benchmarks.roi_flow import load_gray_frames
+from backend.benchmarks.synthetic import write_synthetic_clip
+from backend.local_engine.geometry import RoiStats
+from backend.local_engine.proposal_engine import mean_flow_cos, sparse_flow_cos
+from backend.utils.io import read_json
+
+
+def bench_backend(
+    grays: list[np.ndarray],
+    roi: RoiStats,
+    flow_fn: Callable[[np.ndarray, np.ndarray], Optional[float]],
+) -> tuple[float, list[float]]:
+    values: list[float] = []
+    start = time.perf_counter()
+    for prev, cur in zip(grays, grays[1:]):
+        cos = flow_fn(roi.crop(prev), roi.crop(cur))
+        values.append(float("nan") if cos is None else cos)
+    wall = time.perf_counter() - start
+    return wall * 1000.0 / max(1, len(values)), values
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--video", type=Path, action="append", default=[], help="recorded clip; repeat for several")
+    parser.add_argument("--seconds", type=float, default=20.0, help="synthetic clip length when no --video is given")
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--analysis-fps", type=float, default=4.0)
+    parser.add_argument("--long-edge", type=int, default=640)
+    parser.add_argument("--pad", type=int, default=64, help="flow_roi_pad_px")
+    parser.add_argument("--max-corners", type=int, default=100, help="lk_max_corners")
+    parser.add_argument("--min-motion", type=float, default=0.5, help="lk_min_motion_px")
+    parser.add_argument("--threshold", type=float, default=-0.25, help="wrong_flow_threshold used for hit_flips")
+    parser.add_argument("--roi-config", type=Path, default=Path("backend/config/default_roi_config.json"))
+    args = parser.parse_args(argv)
+
+    roi_cfg = read_json(args.roi_config)
+    expected_dir = np.array(roi_cfg.get("expected_direction_vector", [1.0, 0.0]), dtype=np.float32)
+    expected_dir = expected_dir / (np.linalg.norm(expected_dir) or 1.0)
+
+    print(f"{'clip':>24} {'pairs':>6} {'dense_ms':>9} {'lk_ms':>7} {'speedup':>8} {'p95_diff':>9} {'hit_flips':>9} {'dir_agree':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        videos = args.video or [write_synthetic_clip(Path(tmp) / "synthetic.mp4", args.seconds, fps=args.fps)]
+        for video in videos:
+            # Sample at the analysis rate, assuming the source runs at --fps.
+            grays = load_gray_frames(video, args.long_edge, max(1, int(round(args.fps / args.analysis_fps))))
+            if len(grays) < 2:
+                print(f"{video.name:>24} too few frames")
+                continue
+            work_h, work_w = grays[0].shape[:2]
+            roi = RoiStats.from_polygon(roi_cfg.get("wrong_side_lane_polygon", []), work_w, work_h, args.pad)
+            if roi.empty:
+                print(f"{video.name:>24} wrong_side_lane_polygon is empty")
+                continue
+            crop_mask = roi.crop_mask
+
+            dense_ms, dense = bench_backend(grays, roi, lambda a, b: mean_flow_cos(a, b, crop_mask, expected_dir))
+            lk_ms, lk = bench_backend(
+                grays, roi, lambda a, b: sparse_flow_cos(a, b, crop_mask, expected_dir, args.max_corners, args.min_motion)
+            )
+            d = np.nan_to_num(np.array(dense))
+            s = np.nan_to_num(np.array(lk))
+            p95_diff = float(np.percentile(np.abs(d - s), 95))
+            hit_flips = int(np.sum((d <= args.threshold) != (s <= args.threshold)))
+            clear = np.abs(d) >= 0.5
+            dir_agree = float(np.mean(np.sign(d[clear]) == np.sign(s[clear]))) if np.any(clear) else 1.0
+            speedup = dense_ms / lk_ms if lk_ms > 0 else 0.0
+            print(
+                f"{video.name:>24} {len(dense):>6} {dense_ms:>9.2f} {lk_ms:>7.2f} {speedup:>7.2f}x "
+                f"{p95_diff:>9.4f} {hit_flips:>9} {dir_agree:>9.2%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
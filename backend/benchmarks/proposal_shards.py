@@ -0,0 +1,98 @@
+"""Scaling of the process-pool sharded proposal engine vs the sequential pass.
+
+Usage: python -m backend.benchmarks.proposal_shards [--seconds 120] [--workers 1,2,4,8] [--warmup 60] [--min-shard-samples 1]
+
+Each shard re-primes ``prev_gray`` and its MOG2 models on the ``warmup`` samples
+before its start. Anything derived from the background model (``fg_ratio`` and
+with it reckless/helmet hits, plus the cascade foreground gate) can still differ
+right after a shard boundary; ``mismatch`` counts hits that differ from the
+sequential pass and ``in_tol`` how many of those fall inside the warm-up
+tolerance: the first ``max(warmup, MOG2_HISTORY)`` samples of a shard, since
+a background model that has seen fewer than ``MOG2_HISTORY`` frames still
+learns faster than the sequential one. ``tracks`` counts distinct track ids;
+tracks crossing a shard boundary are stitched through the warm-up overlap, so
+it stays close to the sequential count unless the warm-up tracker lost them.
+With tracking on, the warm-up is never shorter than ``MOG2_HISTORY``.
+``--min-shard-samples`` defaults to 1 so short clips are sharded too; the
+pipeline's ``proposal_min_shard_samples`` keeps them sequential.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from backend.benchmarks.synthetic import write_synthetic_clip
+from backend.config.perf import load_perf_config
+from backend.local_engine.proposal_engine import MOG2_HISTORY, _load_config, _working_size, extract_features
+from backend.logging_utils.json_logger import RunLogger
+from backend.pipeline.ingest import ingest_video
+from backend.utils.io import read_json
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=120.0)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--workers", default="1,2,4,8", help="comma separated proposal_workers values")
+    parser.add_argument("--warmup", type=int, default=60, help="proposal_warmup_frames")
+    parser.add_argument(
+        "--min-shard-samples", type=int, default=1, help="proposal_min_shard_samples (default 1: shard any clip)"
+    )
+    parser.add_argument("--perf-config", type=Path, default=Path("backend/config/perf_config.json"))
+    parser.add_argument("--roi-config", type=Path, default=Path("backend/config/default_roi_config.json"))
+    parser.add_argument("--proposal-config", type=Path, default=Path("backend/config/proposal_config.json"))
+    parser.add_argument("--video", type=Path, default=None, help="benchmark an existing clip instead of a synthetic one")
+    args = parser.parse_args(argv)
+
+    perf = load_perf_config(args.perf_config)
+    roi_cfg = read_json(args.roi_config)
+    cfg = _load_config(args.proposal_config)
+    worker_counts = [max(1, int(w)) for w in args.workers.split(",") if w.strip()]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        run_dir = Path(tmp) / "run"
+        video = args.video or write_synthetic_clip(Path(tmp) / "synthetic.mp4", args.seconds, args.width, args.height, args.fps)
+        manifest = ingest_video(
+            video,
+            run_dir,
+            int(perf["analysis_fps_short"]),
+            int(perf["analysis_fps_long"]),
+            int(perf["long_video_threshold_sec"]),
+            RunLogger("bench", Path(tmp) / "bench.log.jsonl"),
+        )
+        source_w = int(manifest.get("source_width") or manifest.frame_width)
+        source_h = int(manifest.get("source_height") or manifest.frame_height)
+        work_w, work_h, _scale = _working_size(source_w, source_h, perf)
+        print(f"video={video} samples={len(manifest)} working={work_w}x{work_h} warmup={args.warmup}")
+        print(f"{'workers':>7} {'used':>5} {'wall_s':>8} {'speedup':>8} {'mismatch':>9} {'in_tol':>7} {'snap_diff':>9} {'tracks':>7}")
+
+        baseline = None
+        for workers in worker_counts:
+            run_perf = dict(
+                perf, proposal_workers=workers, proposal_warmup_frames=args.warmup, proposal_min_shard_samples=args.min_shard_samples
+            )
+            start = time.perf_counter()
+            extractor, used = extract_features(run_dir, manifest, roi_cfg, cfg, work_w, work_h, run_perf)
+            wall = time.perf_counter() - start
+            hits = {event_type: set(indices) for event_type, indices in extractor.hits.items()}
+            if baseline is None:
+                baseline = (wall, hits, dict(extractor.feature_snapshots))
+            base_wall, base_hits, base_snaps = baseline
+
+            shard_starts = [len(manifest) * k // used for k in range(1, used)]
+            mismatched = sorted(i for event_type in hits for i in hits[event_type] ^ base_hits[event_type])
+            tolerance = max(args.warmup, MOG2_HISTORY)
+            in_tol = sum(1 for i in mismatched if any(s <= i < s + tolerance for s in shard_starts))
+            snap_diff = sum(1 for i, snap in extractor.feature_snapshots.items() if snap != base_snaps.get(i))
+            speedup = base_wall / wall if wall > 0 else 0.0
+            tracks = len({row[0] for rows in extractor.track_rows.values() for row in rows})
+            print(f"{workers:>7} {used:>5} {wall:>8.2f} {speedup:>7.2f}x {len(mismatched):>9} {in_tol:>7} {snap_diff:>9} {tracks:>7}")
+
+
+if __name__ == "__main__":
+    main()
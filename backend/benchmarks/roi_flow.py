@@ -0,0 +1,109 @@
+"""Per-frame cost of wrong-side optical flow: full working frame vs padded ROI crop.
+
+Usage: python -m backend.benchmarks.roi_flow [--seconds 20] [--pads 0,16,32,64,96] [--tolerance 0.05]
+
+``p95_diff`` is the 95th percentile of ``|flow_cos(crop) - flow_cos(full)|``; frames
+with almost no mean flow have a noisy direction, so ``hit_flips`` (frames whose
+``flow_cos <= wrong_flow_threshold`` decision changes) is the number that matters.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from backend.benchmarks.synthetic import write_synthetic_clip
+from backend.local_engine.geometry import RoiStats, denormalize_polygon, polygon_mask, working_size
+from backend.local_engine.proposal_engine import mean_flow_cos
+from backend.utils.io import read_json
+
+
+def load_gray_frames(video_path: Path, long_edge: int, sample_every: int) -> list[np.ndarray]:
+    cap = cv2.VideoCapture(str(video_path))
+    frames: list[np.ndarray] = []
+    idx = 0
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        if idx % sample_every == 0:
+            h, w = frame.shape[:2]
+            work_w, work_h, scale = working_size(w, h, long_edge)
+            if scale < 1.0:
+                frame = cv2.resize(frame, (work_w, work_h), interpolation=cv2.INTER_AREA)
+            frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+        idx += 1
+    cap.release()
+    return frames
+
+
+def bench_flow(grays: list[np.ndarray], mask: np.ndarray, roi: Optional[RoiStats], expected_dir: np.ndarray) -> tuple[float, list[float]]:
+    full_mask = np.ascontiguousarray((mask > 0).astype(np.uint8) * 255)
+    values: list[float] = []
+    start = time.perf_counter()
+    for prev, cur in zip(grays, grays[1:]):
+        if roi is None:
+            cos = mean_flow_cos(prev, cur, full_mask, expected_dir)
+        else:
+            cos = mean_flow_cos(roi.crop(prev), roi.crop(cur), roi.crop_mask, expected_dir)
+        values.append(0.0 if cos is None else cos)
+    wall = time.perf_counter() - start
+    return wall * 1000.0 / max(1, len(values)), values
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--analysis-fps", type=float, default=4.0)
+    parser.add_argument("--long-edge", type=int, default=640)
+    parser.add_argument("--pads", default="0,16,32,64,96", help="comma separated flow_roi_pad_px values")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="max p95 |flow_cos| difference counted as a match")
+    parser.add_argument("--threshold", type=float, default=-0.25, help="wrong_flow_threshold used for hit_flips")
+    parser.add_argument("--roi-config", type=Path, default=Path("backend/config/default_roi_config.json"))
+    parser.add_argument("--video", type=Path, default=None, help="benchmark an existing clip instead of a synthetic one")
+    args = parser.parse_args(argv)
+
+    roi_cfg = read_json(args.roi_config)
+    expected_dir = np.array(roi_cfg.get("expected_direction_vector", [1.0, 0.0]), dtype=np.float32)
+    expected_dir = expected_dir / (np.linalg.norm(expected_dir) or 1.0)
+    pads = [max(0, int(p)) for p in args.pads.split(",") if p.strip()]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = args.video or write_synthetic_clip(Path(tmp) / "synthetic.mp4", args.seconds, args.width, args.height, args.fps)
+        sample_every = max(1, int(round(args.fps / args.analysis_fps)))
+        grays = load_gray_frames(video, args.long_edge, sample_every)
+
+    work_h, work_w = grays[0].shape[:2]
+    mask = polygon_mask((work_h, work_w), denormalize_polygon(roi_cfg.get("wrong_side_lane_polygon", []), work_w, work_h))
+    full_ms, full_values = bench_flow(grays, mask, None, expected_dir)
+    print(f"video={video} working={work_w}x{work_h} frame_pairs={len(full_values)}")
+    print(f"{'pad_px':>7} {'crop':>10} {'area':>6} {'ms/frame':>9} {'speedup':>8} {'p95_diff':>9} {'hit_flips':>9} {'match':>6}")
+    print(f"{'full':>7} {f'{work_w}x{work_h}':>10} {1.0:>6.2f} {full_ms:>9.2f} {1.0:>7.2f}x {0.0:>9.4f} {0:>9} {'yes':>6}")
+    for pad in pads:
+        roi = RoiStats(mask, pad)
+        if roi.empty:
+            print(f"{pad:>7} wrong_side_lane_polygon is empty")
+            return
+        x0, y0, x1, y1 = roi.rect
+        crop_ms, values = bench_flow(grays, mask, roi, expected_dir)
+        diffs = np.abs(np.array(values) - np.array(full_values))
+        p95_diff = float(np.percentile(diffs, 95)) if diffs.size else 0.0
+        hit_flips = sum((a <= args.threshold) != (b <= args.threshold) for a, b in zip(values, full_values))
+        area = (x1 - x0) * (y1 - y0) / float(work_w * work_h)
+        speedup = full_ms / crop_ms if crop_ms > 0 else 0.0
+        print(
+            f"{pad:>7} {f'{x1 - x0}x{y1 - y0}':>10} {area:>6.2f} {crop_ms:>9.2f} {speedup:>7.2f}x "
+            f"{p95_diff:>9.4f} {hit_flips:>9} {'yes' if p95_diff <= args.tolerance and hit_flips == 0 else 'NO':>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Flash calls saved by merging same-track candidates, and the tracker's per-frame cost.
+
+Usage: python -m backend.benchmarks.track_merge [--pans 0,2,4] [--video clip.mp4 ...]
+
+Each clip is ingested once, then the local proposal engine runs three times:
+without tracking, with tracking but ``merge_same_track`` off, and with both on.
+``flash`` counts the packets the Flash stage would be sent (see
+``backend.benchmarks.ego_motion.flash_calls``). The synthetic street clips
+are panned by ``--pans`` pixels per frame without ego-motion compensation,
+which makes several detectors fire on the same moving foreground.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+from backend.benchmarks.ego_motion import flash_calls, run_once
+from backend.benchmarks.synthetic import write_synthetic_clip
+from backend.config.perf import load_perf_config
+from backend.local_engine.proposal_engine import _load_config
+from backend.logging_utils.json_logger import RunLogger
+from backend.pipeline.ingest import ingest_video
+from backend.utils.io import read_json
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pans", default="0,2,4", help="comma separated synthetic pan speeds (px/frame)")
+    parser.add_argument("--video", type=Path, action="append", default=[], help="recorded clip; repeat for several")
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--perf-config", type=Path, default=Path("backend/config/perf_config.json"))
+    parser.add_argument("--roi-config", type=Path, default=Path("backend/config/default_roi_config.json"))
+    parser.add_argument("--proposal-config", type=Path, default=Path("backend/config/proposal_config.json"))
+    args = parser.parse_args(argv)
+
+    perf = load_perf_config(args.perf_config)
+    roi_cfg = read_json(args.roi_config)
+    base_cfg = _load_config(args.proposal_config)
+    pans = [float(p) for p in args.pans.split(",") if p.strip()]
+
+    print(
+        f"{'clip':>20} {'flash_split':>11} {'flash_merged':>12} {'tracked':>7} {'tracks':>6} "
+        f"{'ms_untracked':>12} {'ms_tracked':>10}"
+    )
+    totals = Counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        clips = [
+            (
+                f"pan_{pan:g}px",
+                write_synthetic_clip(
+                    Path(tmp) / f"pan_{pan:g}.mp4", args.seconds, args.width, args.height, args.fps, pan, street_texture=True
+                ),
+            )
+            for pan in pans
+        ]
+        clips += [(video.name, video) for video in args.video]
+        for label, video in clips:
+            run_dir = Path(tmp) / f"run_{label}"
+            manifest = ingest_video(
+                video,
+                run_dir,
+                int(perf["analysis_fps_short"]),
+                int(perf["analysis_fps_long"]),
+                int(perf["long_video_threshold_sec"]),
+                RunLogger("bench", Path(tmp) / "bench.log.jsonl"),
+            )
+            _plain, ms_plain = run_once(run_dir, manifest, roi_cfg, dict(base_cfg, tracking_enabled=False, merge_same_track=False), perf)
+            split, _ms = run_once(run_dir, manifest, roi_cfg, dict(base_cfg, tracking_enabled=True, merge_same_track=False), perf)
+            merged, ms_tracked = run_once(run_dir, manifest, roi_cfg, dict(base_cfg, tracking_enabled=True, merge_same_track=True), perf)
+            f_split, f_merged = flash_calls(split, perf), flash_calls(merged, perf)
+            tracked = sum(1 for c in split if c.track_ids)
+            tracks = len({t for c in split for t in c.track_ids})
+            totals.update(flash_split=f_split, flash_merged=f_merged)
+            print(
+                f"{label:>20} {f_split:>11} {f_merged:>12} {tracked:>3}/{len(split):<3} {tracks:>6} "
+                f"{ms_plain:>12.2f} {ms_tracked:>10.2f}"
+            )
+    print(
+        f"{'total':>20} {totals['flash_split']:>11} {totals['flash_merged']:>12}  "
+        f"flash calls avoided: {totals['flash_split'] - totals['flash_merged']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
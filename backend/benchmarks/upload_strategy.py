@@ -0,0 +1,139 @@
+"""Bytes uploaded and time to the first Flash result per Gemini upload strategy.
+
+Usage: python -m backend.benchmarks.upload_strategy [--video clip.mp4 ...] [--uplink-mbps 20] [--gemini]
+
+Each clip is ingested and run through the local proposal engine. The packets
+Flash would be sent are then prepared both ways:
+
+* ``full``: the whole file is uploaded once before any Flash call
+* ``clips``: one padded window clip per packet, cut locally and uploaded in parallel
+
+Offline, the first-result column estimates when the first file is ready on
+the server, assuming ``--uplink-mbps`` is shared by ``gemini_flash_concurrency``
+parallel clip uploads. The estimate ignores Files API processing and model
+latency. With ``--gemini`` (needs ``GEMINI_API_KEY``), both strategies run the
+real Flash/Pro passes instead. The measured ``gemini_upload_bytes`` and
+``gemini_first_flash_ms`` run metrics are printed; the response cache and upload
+registry are off, so nothing is reused.
+"""
+from __future__ import annotations
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+from backend.benchmarks.synthetic import write_synthetic_clip
+from backend.config.perf import load_perf_config
+from backend.config.settings import load_settings
+from backend.gemini.client import CLIP_FPS, GeminiClient
+from backend.local_engine.proposal_engine import run_local_proposals
+from backend.logging_utils.json_logger import RunLogger
+from backend.models.types import Candidate
+from backend.pipeline.ingest import ingest_video
+from backend.utils.io import read_json
+from backend.video.clips import cut_clip
+
+
+def _flash_candidates(run_dir: Path, perf: dict[str, Any]) -> list[Candidate]:
+    candidates = [Candidate(**c) for c in read_json(run_dir / "candidates.json").get("candidates", [])]
+    selector = GeminiClient(None, "", "", RunLogger("bench", run_dir / "bench.log.jsonl"))
+    return selector._select_flash_candidates(
+        sorted(candidates, key=lambda c: c.score, reverse=True),
+        int(perf["gemini_flash_max_candidates"]),
+        float(perf["flash_min_local_score"]),
+    )
+
+
+def _offline(video: Path, run_dir: Path, candidates: list[Candidate], perf: dict[str, Any], uplink_mbps: float) -> list[tuple[str, int, float]]:
+    """``(strategy, bytes, est_first_ready_ms)`` without calling Gemini."""
+    bytes_per_ms = uplink_mbps * 1e6 / 8 / 1000
+    full_bytes = video.stat().st_size
+    rows = [("full", full_bytes, full_bytes / bytes_per_ms)]
+    sizes: list[int] = []
+    cut_ms: list[float] = []
+    for cand in candidates:
+        start = time.perf_counter()
+        cut = cut_clip(
+            video,
+            max(0.0, cand.start_s - perf["gemini_clip_pad_sec"]),
+            cand.end_s + perf["gemini_clip_pad_sec"],
+            run_dir / "bench_clips" / f"{cand.packet_id}.mp4",
+            CLIP_FPS,
+        )
+        cut_ms.append((time.perf_counter() - start) * 1000.0)
+        sizes.append(cut[0].stat().st_size if cut else 0)
+    if sizes:
+        parallel = min(len(sizes), int(perf["gemini_flash_concurrency"]))
+        rows.append(("clips", sum(sizes), cut_ms[0] + sizes[0] * parallel / bytes_per_ms))
+    return rows
+
+
+def _live(run_dir: Path, video: Path, perf: dict[str, Any]) -> list[tuple[str, int, float]]:
+    settings = load_settings()
+    rows = []
+    for strategy in ("full", "clips"):
+        strategy_dir = run_dir.parent / f"{run_dir.name}_{strategy}"
+        shutil.copytree(run_dir, strategy_dir, ignore=shutil.ignore_patterns("bench_clips", "clips"))
+        client = GeminiClient(
+            settings.gemini_api_key,
+            settings.flash_model,
+            settings.pro_model,
+            RunLogger("bench", strategy_dir / "gemini.log.jsonl"),
+        )
+        try:
+            _flash_ms, _pro_ms, metrics = client.analyze(strategy_dir, video, dict(perf, gemini_upload_strategy=strategy))
+        finally:
+            client.close()
+        rows.append((strategy, int(metrics["gemini_upload_bytes"]), float(metrics.get("gemini_first_flash_ms") or 0)))
+    return rows
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--video", type=Path, action="append", default=[], help="recorded clip; repeat for several")
+    parser.add_argument("--seconds", type=float, default=60.0, help="synthetic clip length when no --video is given")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--uplink-mbps", type=float, default=20.0)
+    parser.add_argument("--gemini", action="store_true", help="run the real Flash/Pro passes (needs GEMINI_API_KEY)")
+    parser.add_argument("--perf-config", type=Path, default=Path("backend/config/perf_config.json"))
+    parser.add_argument("--roi-config", type=Path, default=Path("backend/config/default_roi_config.json"))
+    parser.add_argument("--proposal-config", type=Path, default=Path("backend/config/proposal_config.json"))
+    args = parser.parse_args(argv)
+
+    perf = load_perf_config(args.perf_config)
+    if args.gemini and not load_settings().gemini_api_key:
+        parser.error("--gemini needs GEMINI_API_KEY")
+
+    first_label = "first_flash_ms" if args.gemini else "est_first_ready_ms"
+    print(f"{'clip':>20} {'packets':>7} {'strategy':>8} {'MB_uploaded':>11} {first_label:>18}")
+    with tempfile.TemporaryDirectory() as tmp:
+        clips = [(video.name, video) for video in args.video]
+        if not clips:
+            synthetic = write_synthetic_clip(Path(tmp) / "street.mp4", args.seconds, args.width, args.height, args.fps, 0.0, street_texture=True)
+            clips = [("synthetic", synthetic)]
+        for label, video in clips:
+            run_dir = Path(tmp) / f"run_{label}"
+            logger = RunLogger("bench", Path(tmp) / "bench.log.jsonl")
+            ingest_video(
+                video,
+                run_dir,
+                int(perf["analysis_fps_short"]),
+                int(perf["analysis_fps_long"]),
+                int(perf["long_video_threshold_sec"]),
+                logger,
+            )
+            run_local_proposals("bench", run_dir, args.roi_config, args.proposal_config, perf, logger)
+            candidates = _flash_candidates(run_dir, perf)
+            rows = _live(run_dir, video, perf) if args.gemini else _offline(video, run_dir, candidates, perf, args.uplink_mbps)
+            for strategy, size, first_ms in rows:
+                print(f"{label:>20} {len(candidates):>7} {strategy:>8} {size / 1024 / 1024:>11.2f} {first_ms:>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
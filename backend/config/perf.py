@@ -3,6 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
+from backend.models.types import ViolationType
 from backend.utils.io import read_json
 
 
@@ -22,8 +23,52 @@ DEFAULT_PERF_CONFIG: dict[str, Any] = {
     "analysis_fps_long": 2,
     "long_video_threshold_sec": 90,
     "local_downscale_long_edge": 640,
+    "ingest_mode": "frames",
+    "ingest_sampling_strategy": "auto",
+    "ingest_seek_min_stride": 60,
+    "ingest_workers": 1,
+    "ingest_encode_workers": 2,
+    "ingest_encode_queue": 16,
+    "frame_store_backend": "jpeg",
+    "ingest_working_res_only": True,
+    "ingest_cache_enabled": True,
+    "ingest_cache_max_mb": 4096,
+    "adaptive_sampling": False,
+    "adaptive_max_fps": 8.0,
+    "adaptive_min_fps": 0.5,
+    "adaptive_motion_threshold": 0.15,
+    "adaptive_hold_sec": 1.0,
+    "live_ring_seconds": 30.0,
+    "live_idle_timeout_sec": 10.0,
+    "live_poll_sec": 0.5,
+    "live_realtime_replay": False,
+    "live_flush_sec": 2.0,
+    "cascade_enabled": False,
+    "cascade_long_edge": 160,
+    "cascade_motion_gate": 0.5,
+    "cascade_fg_gate": 0.5,
+    "proposal_workers": 1,
+    "proposal_warmup_frames": 60,
+    "proposal_min_shard_samples": 600,
+    "roi_cache_enabled": True,
+    "gemini_cache_enabled": True,
+    "gemini_cache_ttl_hours": 168.0,
+    "gemini_cache_max_mb": 64,
+    "gemini_upload_reuse": True,
+    "gemini_upload_min_ttl_sec": 900,
+    "gemini_upload_strategy": "auto",
+    "gemini_clip_auto_min_mb": 256,
+    "gemini_clip_pad_sec": 1.0,
+    "flash_image_mode_types": ["NO_HELMET"],
+    "flash_image_long_edge": 768,
+    "flash_image_crop_roi": True,
 }
 
+INGEST_MODES = ("frames", "streaming")
+SAMPLING_STRATEGIES = ("auto", "read", "grab", "seek")
+FRAME_STORE_BACKENDS = ("jpeg", "memmap")
+GEMINI_UPLOAD_STRATEGIES = ("auto", "full", "clips")
+
 
 def load_perf_config(path: Path) -> dict[str, Any]:
     cfg = dict(DEFAULT_PERF_CONFIG)
@@ -55,4 +100,52 @@ def load_perf_config(path: Path) -> dict[str, Any]:
     cfg["analysis_fps_long"] = max(1, int(cfg["analysis_fps_long"]))
     cfg["long_video_threshold_sec"] = max(1, int(cfg["long_video_threshold_sec"]))
     cfg["local_downscale_long_edge"] = max(240, int(cfg["local_downscale_long_edge"]))
+    cfg["ingest_mode"] = str(cfg["ingest_mode"]).lower()
+    if cfg["ingest_mode"] not in INGEST_MODES:
+        cfg["ingest_mode"] = DEFAULT_PERF_CONFIG["ingest_mode"]
+    cfg["ingest_sampling_strategy"] = str(cfg["ingest_sampling_strategy"]).lower()
+    if cfg["ingest_sampling_strategy"] not in SAMPLING_STRATEGIES:
+        cfg["ingest_sampling_strategy"] = DEFAULT_PERF_CONFIG["ingest_sampling_strategy"]
+    cfg["ingest_seek_min_stride"] = max(2, int(cfg["ingest_seek_min_stride"]))
+    cfg["ingest_workers"] = max(1, int(cfg["ingest_workers"]))
+    cfg["ingest_encode_workers"] = max(0, int(cfg["ingest_encode_workers"]))
+    cfg["ingest_encode_queue"] = max(1, int(cfg["ingest_encode_queue"]))
+    cfg["frame_store_backend"] = str(cfg["frame_store_backend"]).lower()
+    if cfg["frame_store_backend"] not in FRAME_STORE_BACKENDS:
+        cfg["frame_store_backend"] = DEFAULT_PERF_CONFIG["frame_store_backend"]
+    cfg["ingest_working_res_only"] = bool(cfg["ingest_working_res_only"])
+    cfg["ingest_cache_enabled"] = bool(cfg["ingest_cache_enabled"])
+    cfg["ingest_cache_max_mb"] = max(0, int(cfg["ingest_cache_max_mb"]))
+    cfg["adaptive_sampling"] = bool(cfg["adaptive_sampling"])
+    cfg["adaptive_max_fps"] = max(0.5, float(cfg["adaptive_max_fps"]))
+    cfg["adaptive_min_fps"] = min(cfg["adaptive_max_fps"], max(0.05, float(cfg["adaptive_min_fps"])))
+    cfg["adaptive_motion_threshold"] = max(0.0, float(cfg["adaptive_motion_threshold"]))
+    cfg["adaptive_hold_sec"] = max(0.0, float(cfg["adaptive_hold_sec"]))
+    cfg["live_ring_seconds"] = max(5.0, float(cfg["live_ring_seconds"]))
+    cfg["live_idle_timeout_sec"] = max(0.5, float(cfg["live_idle_timeout_sec"]))
+    cfg["live_poll_sec"] = min(5.0, max(0.05, float(cfg["live_poll_sec"])))
+    cfg["live_realtime_replay"] = bool(cfg["live_realtime_replay"])
+    cfg["live_flush_sec"] = max(0.0, float(cfg["live_flush_sec"]))
+    cfg["cascade_enabled"] = bool(cfg["cascade_enabled"])
+    cfg["cascade_long_edge"] = max(32, int(cfg["cascade_long_edge"]))
+    cfg["cascade_motion_gate"] = max(0.0, float(cfg["cascade_motion_gate"]))
+    cfg["cascade_fg_gate"] = max(0.0, float(cfg["cascade_fg_gate"]))
+    cfg["proposal_workers"] = max(1, int(cfg["proposal_workers"]))
+    cfg["proposal_warmup_frames"] = max(1, int(cfg["proposal_warmup_frames"]))
+    cfg["proposal_min_shard_samples"] = max(1, int(cfg["proposal_min_shard_samples"]))
+    cfg["roi_cache_enabled"] = bool(cfg["roi_cache_enabled"])
+    cfg["gemini_cache_enabled"] = bool(cfg["gemini_cache_enabled"])
+    cfg["gemini_cache_ttl_hours"] = max(0.0, float(cfg["gemini_cache_ttl_hours"]))
+    cfg["gemini_cache_max_mb"] = max(0, int(cfg["gemini_cache_max_mb"]))
+    cfg["gemini_upload_reuse"] = bool(cfg["gemini_upload_reuse"])
+    cfg["gemini_upload_min_ttl_sec"] = max(0, int(cfg["gemini_upload_min_ttl_sec"]))
+    cfg["gemini_upload_strategy"] = str(cfg["gemini_upload_strategy"]).lower()
+    if cfg["gemini_upload_strategy"] not in GEMINI_UPLOAD_STRATEGIES:
+        cfg["gemini_upload_strategy"] = DEFAULT_PERF_CONFIG["gemini_upload_strategy"]
+    cfg["gemini_clip_auto_min_mb"] = max(0, int(cfg["gemini_clip_auto_min_mb"]))
+    cfg["gemini_clip_pad_sec"] = min(10.0, max(0.0, float(cfg["gemini_clip_pad_sec"])))
+    image_types = cfg["flash_image_mode_types"] if isinstance(cfg["flash_image_mode_types"], list) else []
+    cfg["flash_image_mode_types"] = [t for t in (str(v).upper() for v in image_types) if t in ViolationType.__members__]
+    cfg["flash_image_long_edge"] = max(128, int(cfg["flash_image_long_edge"]))
+    cfg["flash_image_crop_roi"] = bool(cfg["flash_image_crop_roi"])
     return cfg
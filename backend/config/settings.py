@@ -9,6 +9,10 @@ from typing import Optional
 @dataclass(frozen=True)
 class Settings:
     runs_dir: Path
+    cache_dir: Path
+    cameras_dir: Path
+    live_sources_dir: Path
+    live_source_urls: tuple[str, ...]
     gemini_api_key: Optional[str]
     max_gemini_concurrency: int
     default_analysis_fps: int
@@ -20,8 +24,15 @@ class Settings:
 def load_settings() -> Settings:
     runs_dir = Path(os.getenv("RUNS_DIR", "data/runs")).resolve()
     runs_dir.mkdir(parents=True, exist_ok=True)
+    cache_dir = Path(os.getenv("CACHE_DIR", "data/cache")).resolve()
+    cameras_dir = Path(os.getenv("CAMERAS_DIR", "data/cameras")).resolve()
     return Settings(
         runs_dir=runs_dir,
+        cache_dir=cache_dir,
+        cameras_dir=cameras_dir,
+        live_sources_dir=Path(os.getenv("LIVE_SOURCES_DIR", "data/live")).resolve(),
+        # Comma separated stream URLs; an entry ending in "/" allows every URL under it.
+        live_source_urls=tuple(url.strip() for url in os.getenv("LIVE_SOURCE_URLS", "").split(",") if url.strip()),
         gemini_api_key=os.getenv("GEMINI_API_KEY"),
         max_gemini_concurrency=int(os.getenv("MAX_GEMINI_CONCURRENCY", "2")),
         default_analysis_fps=int(os.getenv("DEFAULT_ANALYSIS_FPS", "4")),
@@ -3,6 +3,7 @@ from __future__ import annotations
 import shutil
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 from typing import Optional
 from zipfile import ZIP_DEFLATED, ZipFile
 
@@ -22,10 +23,38 @@ def _resolve_event_path(run_dir: Path, path_value: str) -> Optional[Path]:
     return resolved
 
 
+def _open_frame_store(run_dir: Path) -> Any:
+    # Lazy import keeps export usable without CV deps for JPEG-only runs.
+    from backend.video.frame_store import open_frame_store
+    from backend.video.manifest import load_manifest
+
+    manifest = load_manifest(run_dir)
+    return open_frame_store(manifest) if manifest is not None else None
+
+
+def _full_res_evidence(run_dir: Path, events: list[dict]) -> dict[str, Path]:
+    paths = [p for e in events for p in e.get("evidence_frames", [])[:3]]
+    if not paths:
+        return {}
+    try:
+        from backend.video.frames import materialize_full_res_frames
+        from backend.video.manifest import load_manifest
+
+        manifest = load_manifest(run_dir)
+        if manifest is None:
+            return {}
+        return materialize_full_res_frames(run_dir, manifest, paths)
+    except Exception:
+        # Working-resolution frames remain usable evidence when the source video cannot be decoded.
+        return {}
+
+
 def _prepare_report_images(run_dir: Path, export_dir: Path, events: list[dict]) -> list[dict]:
     out: list[dict] = []
     evidence_root = export_dir / "evidence"
     evidence_root.mkdir(parents=True, exist_ok=True)
+    frame_store = None
+    full_res = _full_res_evidence(run_dir, events)
 
     for event in events:
         event_copy = dict(event)
@@ -36,17 +65,28 @@ def _prepare_report_images(run_dir: Path, export_dir: Path, events: list[dict])
         seen = 0
         for idx, frame_path in enumerate(event_copy.get("evidence_frames", [])[:3]):
             resolved = _resolve_event_path(run_dir, frame_path)
-            if not resolved or not resolved.exists():
+            if not resolved:
                 continue
             ext = resolved.suffix.lower() or ".jpg"
             dst = event_dir / f"img_{idx + 1:02d}{ext}"
-            shutil.copy2(resolved, dst)
+            if frame_path in full_res:
+                shutil.copy2(full_res[frame_path], dst)
+            elif resolved.exists():
+                shutil.copy2(resolved, dst)
+            else:
+                # Frames held in the memory-mapped store have no file of their own.
+                if frame_store is None:
+                    frame_store = _open_frame_store(run_dir)
+                if frame_store is None or not frame_store.materialize(frame_path, dst):
+                    continue
             report_images.append(str(dst.relative_to(export_dir)))
             seen += 1
 
         event_copy["report_images"] = report_images
         out.append(event_copy)
 
+    if frame_store is not None:
+        frame_store.close()
     return out
 
 
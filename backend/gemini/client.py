@@ -1,27 +1,61 @@
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+import asyncio
+import contextlib
+import hashlib
 import json
+import threading
 import time
 from pathlib import Path
 from typing import Any
+from typing import Awaitable
 from typing import Callable
 from typing import Optional
+from typing import TypeVar
 
+from backend.config.perf import GEMINI_UPLOAD_STRATEGIES
+from backend.gemini.response_cache import GeminiResponseCache
 from backend.gemini.schemas import FLASH_SCHEMA, PRO_SCHEMA
+from backend.gemini.upload_registry import UploadEntry, UploadRegistry
 from backend.logging_utils.json_logger import RunLogger
 from backend.models.types import Candidate, FlashEvent, FinalEvent
+from backend.utils.hashing import file_sha256, payload_sha256
 from backend.utils.io import read_json, write_json
+from backend.video.manifest import load_manifest
+
+
+UPLOAD_ACTIVE_TIMEOUT_SEC = 30.0
+# Window clips are sampled at the highest request fps (Pro on RECKLESS_DRIVING).
+CLIP_FPS = 4.0
+# What a Flash request shows the model: a video window or a packet's anchor frames.
+FLASH_MEDIA = ("video", "images")
+# Margin around the evidence ROIs when cropping anchor frames, as a fraction of the frame.
+IMAGE_CROP_PAD = 0.15
+
+T = TypeVar("T")
 
 
 class GeminiClient:
-    def __init__(self, api_key: Optional[str], flash_model: str, pro_model: str, logger: RunLogger) -> None:
+    def __init__(
+        self,
+        api_key: Optional[str],
+        flash_model: str,
+        pro_model: str,
+        logger: RunLogger,
+        response_cache: Optional[GeminiResponseCache] = None,
+        upload_registry: Optional[UploadRegistry] = None,
+    ) -> None:
         self.api_key = api_key
         self.flash_model = flash_model
         self.pro_model = pro_model
         self.logger = logger
+        self.response_cache = response_cache
+        self.upload_registry = upload_registry
         self._client = None
         self._types = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
         if api_key:
             try:
                 from google import genai
@@ -32,25 +66,115 @@ class GeminiClient:
             except Exception as exc:  # pragma: no cover - import path variability
                 self.logger.log("GEMINI_FLASH", "ERROR", "gemini_init_error", "Gemini SDK init failed", error_detail=str(exc))
 
+    def _run(self, coro: Awaitable[T]) -> T:
+        """Run ``coro`` on the client's event loop and wait for its result.
+
+        The SDK's async client keeps its HTTP connection pool on the loop it first
+        ran on, so every call of this client (a run's Flash/Pro passes and
+        concurrent live packets alike) goes through one long-lived loop on a
+        daemon thread, started on first use.
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._loop.run_forever, name="gemini-loop", daemon=True)
+                self._loop_thread.start()
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def close(self) -> None:
+        """Stop the client's event loop; a later call starts a new one."""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
     @staticmethod
     def _add_reason(routing: dict[str, Any], reason: str) -> None:
         reasons = routing.setdefault("routing_reason", [])
         if reason not in reasons:
             reasons.append(reason)
 
-    def _upload_video(self, video_path: Path) -> Any:
-        if not self._client:
-            return None
-        uploaded = self._client.files.upload(file=str(video_path))
-        for _ in range(30):
-            current = self._client.files.get(name=uploaded.name)
-            state = getattr(current, "state", None)
-            if str(state).upper().endswith("ACTIVE"):
+    @staticmethod
+    def _local_proposal(candidate: Candidate) -> str:
+        types = candidate.proposed_types or [candidate.event_type]
+        if len(types) == 1:
+            return f"Local proposal type={candidate.event_type.value}, local_score={candidate.score:.3f}. "
+        # Same-track candidates merged into one packet: one request covers every proposed type.
+        return (
+            f"Local proposal types for one tracked vehicle={', '.join(t.value for t in types)}, local_score={candidate.score:.3f}; "
+            "set event_type to the violation best supported by the evidence. "
+        )
+
+    @staticmethod
+    def _shift_times(payload: dict[str, Any], clip_offset_s: float) -> dict[str, Any]:
+        """Map timestamps the model read off a window clip back onto the full video."""
+        if not clip_offset_s:
+            return payload
+        shifted = dict(payload)
+        for key in ("start_time", "end_time"):
+            if isinstance(shifted.get(key), (int, float)):
+                shifted[key] = round(shifted[key] + clip_offset_s, 3)
+        if isinstance(shifted.get("key_moments"), list):
+            shifted["key_moments"] = [
+                dict(m, t=round(m["t"] + clip_offset_s, 3)) if isinstance(m, dict) and isinstance(m.get("t"), (int, float)) else m
+                for m in shifted["key_moments"]
+            ]
+        return shifted
+
+    def _wait_active(self, name: str) -> Any:
+        # Short clips are usually ACTIVE within a second: poll fast first, then once a second.
+        deadline = time.monotonic() + UPLOAD_ACTIVE_TIMEOUT_SEC
+        delay = 0.25
+        while True:
+            current = self._client.files.get(name=name)
+            state = str(getattr(current, "state", None)).upper()
+            if state.endswith("ACTIVE"):
                 return current
-            time.sleep(1)
-        raise RuntimeError("Gemini file did not become active")
+            if state.endswith("FAILED") or time.monotonic() >= deadline:
+                raise RuntimeError("Gemini file did not become active")
+            time.sleep(delay)
+            delay = min(1.0, delay * 2)
+
+    def _revalidate_upload(self, entry: UploadEntry) -> Optional[Any]:
+        """The registered file if the server still has it ACTIVE (one ``files.get``), else None."""
+        try:
+            current = self._client.files.get(name=entry.name)
+            state = str(getattr(current, "state", None)).upper()
+            if state.endswith("PROCESSING"):
+                current = self._wait_active(entry.name)
+            elif not state.endswith("ACTIVE"):
+                return None
+        except Exception:
+            # Deleted, expired or owned by another project.
+            return None
+        return current
 
-    def _generate(
+    def _upload_video(self, video_path: Path, video_sha256: Optional[str] = None) -> tuple[Any, str]:
+        """Return ``(file_ref, source)``; ``source`` is ``reused`` for a registered upload, else ``uploaded``."""
+        if not self._client:
+            return None, "uploaded"
+        registry = self.upload_registry
+        if registry is None or not video_sha256:
+            uploaded = self._client.files.upload(file=str(video_path))
+            return self._wait_active(uploaded.name), "uploaded"
+        with registry.lock(video_sha256):
+            entry = registry.get(video_sha256)
+            if entry is not None:
+                current = self._revalidate_upload(entry)
+                if current is not None:
+                    return current, "reused"
+                registry.drop(video_sha256)
+            uploaded = self._client.files.upload(file=str(video_path))
+            current = self._wait_active(uploaded.name)
+            registry.put(video_sha256, current)
+            return current, "uploaded"
+
+    async def _generate(
         self,
         *,
         model: str,
@@ -63,15 +187,28 @@ class GeminiClient:
         stage: str,
         packet_id: str,
         timeout_sec: int,
+        images: Optional[list[bytes]] = None,
+        usage: Optional[dict[str, Any]] = None,
     ) -> tuple[dict[str, Any], int]:
-        if not self._client or not self._types or not file_ref:
+        """One ``generate_content`` call; ``images`` (JPEG bytes) replace the video window when given.
+
+        Token counts from the response's ``usage_metadata`` are logged and copied into ``usage``.
+        """
+        if not self._client or not self._types or not (file_ref or images):
             raise RuntimeError("Gemini client unavailable")
 
         t = self._types
-        video_part = t.Part(
-            file_data=t.FileData(file_uri=file_ref.uri, mime_type=file_ref.mime_type),
-            video_metadata=t.VideoMetadata(start_offset=f"{max(start_s, 0.0)}s", end_offset=f"{max(end_s, 0.0)}s", fps=fps),
-        )
+        if images:
+            media_parts = [t.Part(inline_data=t.Blob(mime_type="image/jpeg", data=data)) for data in images]
+        else:
+            media_parts = [
+                t.Part(
+                    file_data=t.FileData(file_uri=file_ref.uri, mime_type=file_ref.mime_type),
+                    video_metadata=t.VideoMetadata(
+                        start_offset=f"{round(max(start_s, 0.0), 3)}s", end_offset=f"{round(max(end_s, 0.0), 3)}s", fps=fps
+                    ),
+                )
+            ]
 
         config = t.GenerateContentConfig(
             response_mime_type="application/json",
@@ -80,13 +217,23 @@ class GeminiClient:
         )
 
         start = time.perf_counter()
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(self._client.models.generate_content, model=model, contents=[prompt, video_part], config=config)
-            try:
-                response = future.result(timeout=timeout_sec)
-            except FuturesTimeoutError as exc:
-                raise TimeoutError(f"{stage} request timed out after {timeout_sec}s") from exc
+        try:
+            # wait_for cancels the request on timeout rather than leaving it running in the background.
+            response = await asyncio.wait_for(
+                self._client.aio.models.generate_content(model=model, contents=[prompt, *media_parts], config=config),
+                timeout=timeout_sec,
+            )
+        except asyncio.TimeoutError as exc:
+            raise TimeoutError(f"{stage} request timed out after {timeout_sec}s") from exc
         latency = int((time.perf_counter() - start) * 1000)
+        usage_metadata = getattr(response, "usage_metadata", None)
+        tokens = {
+            "prompt_tokens": getattr(usage_metadata, "prompt_token_count", None),
+            "output_tokens": getattr(usage_metadata, "candidates_token_count", None),
+            "total_tokens": getattr(usage_metadata, "total_token_count", None),
+        }
+        if usage is not None:
+            usage.update(tokens)
         self.logger.log(
             stage,
             "INFO",
@@ -95,6 +242,8 @@ class GeminiClient:
             packet_id=packet_id,
             model=model,
             duration_ms=latency,
+            media="images" if images else "video",
+            **tokens,
         )
 
         parsed = getattr(response, "parsed", None)
@@ -112,6 +261,60 @@ class GeminiClient:
         raw_text = "\n".join(text_parts).strip() or "{}"
         return json.loads(raw_text), latency
 
+    async def _generate_cached(
+        self,
+        *,
+        candidate: Candidate,
+        video_sha256: Optional[str],
+        metrics: dict[str, Any],
+        validate: Callable[[dict[str, Any]], Any],
+        **request: Any,
+    ) -> tuple[dict[str, Any], int, Optional[str]]:
+        """``_generate`` through the response cache; returns ``(payload, latency_ms, cache_source)``.
+
+        An answer is stored only if it echoes this packet's id and ``validate``
+        accepts it; the id is stored masked and filled back in on reuse.
+        """
+        cache = self.response_cache
+        if request.get("images"):
+            # Anchor frames are keyed on their own bytes (crop and downscale settings included).
+            video_sha256 = payload_sha256({"images": [hashlib.sha256(data).hexdigest() for data in request["images"]]})
+        if cache is None or not video_sha256:
+            payload, latency = await self._generate(**request)
+            return payload, latency, None
+        # Packet ids are per run; mask them so another run's answer for the same window is reused.
+        prompt = request["prompt"].replace(candidate.packet_id, "{packet_id}").replace(candidate.candidate_id, "{candidate_id}")
+        key = cache.key(video_sha256, request["model"], request["start_s"], request["end_s"], request["fps"], request["schema"], prompt)
+
+        def to_entry(payload: dict[str, Any]) -> Optional[dict[str, Any]]:
+            if payload.get("packet_id") != candidate.packet_id:
+                return None
+            try:
+                validate(payload)
+            except Exception:
+                return None
+            return dict(payload, packet_id="{packet_id}")
+
+        payload, latency, source = await cache.get_or_generate(
+            key, request["model"], lambda: self._generate(**request), request["timeout_sec"], to_entry
+        )
+        counter = f"gemini_cache_{'hits' if source == 'hit' else 'misses' if source == 'miss' else 'shared'}"
+        metrics[counter] = metrics.get(counter, 0) + 1
+        if source != "miss":
+            self.logger.log(
+                request["stage"],
+                "INFO",
+                "gemini_cache_hit",
+                "Gemini response reused",
+                packet_id=candidate.packet_id,
+                model=request["model"],
+                cache_source=source,
+            )
+        payload = dict(payload)
+        if source in ("hit", "shared"):
+            payload["packet_id"] = candidate.packet_id
+        return payload, latency, source
+
     def _flash_fallback(self, candidate: Candidate) -> FlashEvent:
         uncertain = candidate.score < 0.82
         reason = "Fallback output due to unavailable/failed Flash inference." if uncertain else None
@@ -133,6 +336,30 @@ class GeminiClient:
             needs_pro=uncertain and candidate.score >= 0.55,
         )
 
+    @staticmethod
+    def _pro_event(candidate: Candidate, payload: dict[str, Any]) -> FinalEvent:
+        return FinalEvent(
+            event_id=payload["event_id"],
+            packet_id=candidate.packet_id,
+            source_stage="PRO_FINAL",
+            event_type=payload["event_type"],
+            start_time=payload["start_time"],
+            end_time=payload["end_time"],
+            confidence=payload["confidence"],
+            risk_score=payload["risk_score_gemini"],
+            violator_description=payload["violator_description"],
+            plate_text=payload.get("plate_text"),
+            plate_candidates=payload.get("plate_candidates", []),
+            plate_confidence=payload.get("plate_confidence"),
+            key_moments=payload.get("key_moments", []),
+            explanation_short=payload["explanation_short"],
+            uncertain=payload.get("uncertain", False),
+            uncertainty_reason=payload.get("uncertainty_reason"),
+            evidence_frames=[],
+            report_images=[],
+            evidence_clip_path=None,
+        )
+
     def _pro_fallback(self, idx: int, candidate: Candidate, flash_event: FlashEvent, reason: str) -> FinalEvent:
         return FinalEvent(
             event_id=f"evt_{idx + 1:03d}_{candidate.packet_id}",
@@ -196,14 +423,373 @@ class GeminiClient:
             selected_ids.add(cand.packet_id)
         return selected
 
+    async def _run_flash(
+        self,
+        candidate: Candidate,
+        file_ref: Any,
+        metrics: dict[str, Any],
+        retry_attempts: int,
+        timeout_sec: int,
+        pro_uncertain_low: float,
+        pro_uncertain_high: float,
+        clip_offset_s: float = 0.0,
+        video_sha256: Optional[str] = None,
+        anchors: Optional[list[tuple[float, bytes]]] = None,
+    ) -> tuple[FlashEvent, dict[str, Any]]:
+        # clip_offset_s maps absolute candidate times onto a clip that starts mid-video.
+        if anchors:
+            stills = ", ".join(f"{ts:.2f}s" for ts, _data in anchors)
+            intro = (
+                "You are validating Indian traffic incidents from still frames of a short video window. Return strict JSON only. "
+                f"The {len(anchors)} images are frames at {stills} of the video, in that order; "
+                "report start_time and end_time in those video seconds. "
+            )
+        else:
+            intro = "You are validating Indian traffic incidents in a short video window. Return strict JSON only. "
+        prompt = (
+            intro + f"Use packet_id exactly as provided: {candidate.packet_id}. "
+            f"Candidate id is {candidate.candidate_id}. "
+            f"{self._local_proposal(candidate)}"
+            "Set is_relevant=true only when direct visual evidence of a traffic violation exists in this window. "
+            "For plate extraction: set plate_visible, plate_text (uppercase, no spaces/hyphens where possible), "
+            "plate_candidates (alternative reads), and plate_confidence (0-1, null if not readable). "
+            "Set uncertain=true only if evidence is ambiguous/partial/occluded; include short uncertainty_reason. "
+            "If weak evidence, set is_relevant=false and uncertain=false."
+        )
+        decision = {
+            "packet_id": candidate.packet_id,
+            "candidate_id": candidate.candidate_id,
+            "model": self.flash_model,
+            "request_window_start_s": candidate.start_s,
+            "request_window_end_s": candidate.end_s,
+            "status": "fallback",
+            "latency_ms": 0,
+            "cache": None,
+            "media": "images" if anchors else "video",
+            "usage": None,
+            "error_detail": None,
+            "response": None,
+        }
+
+        if not file_ref and not anchors:
+            fallback = self._flash_fallback(candidate)
+            decision["response"] = fallback.model_dump()
+            return fallback, decision
+
+        payload = None
+        latency_ms = 0
+        usage: dict[str, Any] = {}
+        for attempt in range(retry_attempts + 1):
+            try:
+                payload, latency_ms, decision["cache"] = await self._generate_cached(
+                    candidate=candidate,
+                    video_sha256=video_sha256,
+                    metrics=metrics,
+                    model=self.flash_model,
+                    file_ref=file_ref,
+                    start_s=candidate.start_s - clip_offset_s,
+                    end_s=candidate.end_s - clip_offset_s,
+                    fps=2,
+                    prompt=prompt,
+                    schema=FLASH_SCHEMA,
+                    validate=lambda p: FlashEvent(**dict(p, candidate_id=candidate.candidate_id)),
+                    stage="GEMINI_FLASH",
+                    packet_id=candidate.packet_id,
+                    timeout_sec=timeout_sec,
+                    images=[data for _ts, data in anchors] if anchors else None,
+                    usage=usage,
+                )
+                break
+            except Exception as exc:
+                self.logger.log(
+                    "GEMINI_FLASH",
+                    "ERROR",
+                    "gemini_retry",
+                    "Flash call failed",
+                    packet_id=candidate.packet_id,
+                    retry_count=attempt + 1,
+                    error_detail=str(exc),
+                )
+                if attempt < retry_attempts:
+                    await asyncio.sleep(2 ** attempt)
+        decision["usage"] = usage or None
+        if not payload:
+            metrics["flash_errors"] += 1
+            fallback = self._flash_fallback(candidate)
+            decision["status"] = "fallback"
+            decision["error_detail"] = "flash_failed_or_timeout"
+            decision["response"] = fallback.model_dump()
+            return fallback, decision
+
+        returned_packet = payload.get("packet_id")
+        if returned_packet != candidate.packet_id:
+            metrics["flash_errors"] += 1
+            fallback = self._flash_fallback(candidate)
+            decision["status"] = "fallback"
+            decision["error_detail"] = "SCHEMA_PACKET_MISMATCH"
+            decision["response"] = fallback.model_dump()
+            return fallback, decision
+
+        payload = self._shift_times(payload, clip_offset_s)
+        payload["candidate_id"] = candidate.candidate_id
+        payload["packet_id"] = candidate.packet_id
+        try:
+            event = FlashEvent(**payload)
+            uncertain_band = pro_uncertain_low <= event.confidence < pro_uncertain_high
+            should_escalate = event.is_relevant and (event.uncertain or uncertain_band)
+            reason = event.uncertainty_reason
+            if should_escalate and not reason:
+                reason = "Flash confidence in uncertain band"
+            event = event.model_copy(update={"uncertain": should_escalate, "uncertainty_reason": reason, "needs_pro": should_escalate})
+            decision["status"] = "ok"
+            decision["latency_ms"] = latency_ms
+            decision["response"] = event.model_dump()
+            return event, decision
+        except Exception:
+            metrics["flash_errors"] += 1
+            fallback = self._flash_fallback(candidate)
+            decision["status"] = "fallback"
+            decision["error_detail"] = "flash_schema_validation_failed"
+            decision["response"] = fallback.model_dump()
+            return fallback, decision
+
+    def _video_sha256(self, video_path: Optional[Path], run_dir: Optional[Path] = None) -> Optional[str]:
+        """Content hash for response-cache and upload-registry keys (the manifest's when ingest recorded one)."""
+        if (self.response_cache is None and self.upload_registry is None) or video_path is None:
+            return None
+        manifest = load_manifest(run_dir) if run_dir is not None else None
+        if manifest is not None and manifest.get("video_sha256"):
+            return str(manifest["video_sha256"])
+        # Stream URLs have no stable content to key on.
+        return file_sha256(video_path) if video_path.is_file() else None
+
+    @staticmethod
+    def _flash_media(candidate: Candidate, image_types: set[str]) -> str:
+        """``images`` when every type proposed for the packet is routed to anchor-frame Flash."""
+        proposed = candidate.proposed_types or [candidate.event_type]
+        if candidate.anchor_frames and all(t.value in image_types for t in proposed):
+            return "images"
+        return "video"
+
+    @staticmethod
+    def _open_frame_store(run_dir: Path) -> Any:
+        from backend.video.frame_store import open_frame_store
+
+        manifest = load_manifest(run_dir)
+        return open_frame_store(manifest) if manifest is not None else None
+
+    @staticmethod
+    def _full_res_anchors(run_dir: Path, candidates: list[Candidate]) -> dict[str, Path]:
+        """Source-resolution copies of the candidates' anchor frames, extracted in one pass."""
+        paths = [str(anchor.get("path", "")) for c in candidates for anchor in c.anchor_frames]
+        if not paths:
+            return {}
+        try:
+            from backend.video.frames import materialize_full_res_frames
+
+            manifest = load_manifest(run_dir)
+            if manifest is None:
+                return {}
+            return materialize_full_res_frames(run_dir, manifest, paths)
+        except Exception:
+            # Working-resolution frames still work when the source video cannot be decoded.
+            return {}
+
+    @staticmethod
+    def _anchor_images(
+        frame_store: Any,
+        full_res: dict[str, Path],
+        candidate: Candidate,
+        roi_config: dict[str, Any],
+        roi_keys: list[str],
+        long_edge: int,
+        crop: bool,
+    ) -> Optional[list[tuple[float, bytes]]]:
+        """``(ts_sec, jpeg)`` per anchor frame, cropped to the ``roi_keys`` polygons and downscaled; None if unreadable.
+
+        Anchors are read from ``full_res`` when a source-resolution copy exists,
+        so the crop keeps detail the working-resolution frame store has lost.
+        """
+        import cv2
+
+        if frame_store is None and not full_res:
+            return None
+        points = [pt for key in roi_keys for pt in roi_config.get(key) or []]
+        images: list[tuple[float, bytes]] = []
+        for anchor in candidate.anchor_frames:
+            path = str(anchor.get("path", ""))
+            if path in full_res:
+                frame = cv2.imread(str(full_res[path]))
+            else:
+                frame = frame_store.read_path(path) if frame_store is not None else None
+            if frame is None:
+                return None
+            h, w = frame.shape[:2]
+            if crop and points:
+                xs = [float(p[0]) for p in points]
+                ys = [float(p[1]) for p in points]
+                x0 = int(max(0.0, min(xs) - IMAGE_CROP_PAD) * w)
+                x1 = int(min(1.0, max(xs) + IMAGE_CROP_PAD) * w)
+                y0 = int(max(0.0, min(ys) - IMAGE_CROP_PAD) * h)
+                y1 = int(min(1.0, max(ys) + IMAGE_CROP_PAD) * h)
+                if x1 - x0 >= 16 and y1 - y0 >= 16:
+                    frame = frame[y0:y1, x0:x1]
+                    h, w = frame.shape[:2]
+            scale = long_edge / max(h, w)
+            if scale < 1.0:
+                frame = cv2.resize(frame, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+            ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
+            if not ok:
+                return None
+            images.append((float(anchor.get("ts_sec", 0.0)), buf.tobytes()))
+        return images or None
+
+    def _upload_strategy(self, video_path: Path, perf_config: dict[str, Any]) -> str:
+        """``full`` uploads the whole video once; ``clips`` uploads a padded clip per Flash window."""
+        strategy = str(perf_config.get("gemini_upload_strategy", "auto"))
+        if strategy not in GEMINI_UPLOAD_STRATEGIES:
+            strategy = "auto"
+        if not video_path.is_file():
+            # Stream URLs cannot be cut locally.
+            return "full"
+        if strategy == "auto":
+            min_bytes = float(perf_config.get("gemini_clip_auto_min_mb", 256)) * 1024 * 1024
+            return "clips" if video_path.stat().st_size >= min_bytes else "full"
+        return strategy
+
+    def _prepare_clip(
+        self, run_dir: Path, video_path: Path, candidate: Candidate, pad_sec: float
+    ) -> tuple[Any, float, Optional[str], int]:
+        """Cut and upload one packet's window; returns ``(file_ref, clip_offset_s, clip_sha256, bytes_uploaded)``."""
+        from backend.video.clips import cut_clip
+
+        started = time.perf_counter()
+        cut = cut_clip(
+            video_path,
+            max(0.0, candidate.start_s - pad_sec),
+            candidate.end_s + pad_sec,
+            run_dir / "clips" / f"{candidate.packet_id}.mp4",
+            CLIP_FPS,
+        )
+        if cut is None:
+            self.logger.log(
+                "GEMINI_FLASH",
+                "ERROR",
+                "clip_upload_failed",
+                "Failed to cut packet window clip",
+                packet_id=candidate.packet_id,
+                error_code="GEMINI_UPLOAD_ERROR",
+            )
+            return None, 0.0, None, 0
+        clip_path, clip_offset_s = cut
+        clip_sha256 = self._video_sha256(clip_path)
+        try:
+            file_ref, source = self._upload_video(clip_path, clip_sha256)
+        except Exception as exc:
+            self.logger.log(
+                "GEMINI_FLASH",
+                "ERROR",
+                "clip_upload_failed",
+                "Failed to upload packet window clip",
+                packet_id=candidate.packet_id,
+                error_code="GEMINI_UPLOAD_ERROR",
+                error_detail=str(exc),
+            )
+            return None, clip_offset_s, clip_sha256, 0
+        size = clip_path.stat().st_size
+        self.logger.log(
+            "GEMINI_FLASH",
+            "INFO",
+            "file_upload_done",
+            "Window clip ready",
+            packet_id=candidate.packet_id,
+            file_uri=getattr(file_ref, "uri", None),
+            upload_source=source,
+            bytes=size,
+            duration_ms=int((time.perf_counter() - started) * 1000),
+        )
+        return file_ref, clip_offset_s, clip_sha256, size if source == "uploaded" else 0
+
+    def analyze_live_packet(
+        self,
+        candidate: Candidate,
+        clip_path: Optional[Path],
+        perf_config: dict[str, Any],
+        metrics: dict[str, Any],
+        clip_offset_s: float = 0.0,
+        metrics_lock: Optional[threading.Lock] = None,
+    ) -> tuple[FlashEvent, dict[str, Any]]:
+        """Flash pass for one packet of a live run, against its buffered window clip.
+
+        Packets run concurrently from the caller's threads. Counters are gathered
+        per packet and added to ``metrics`` under ``metrics_lock``.
+        """
+        file_ref = None
+        video_sha256 = self._video_sha256(clip_path)
+        if self._client and clip_path is not None:
+            try:
+                file_ref, _source = self._upload_video(clip_path, video_sha256)
+            except Exception as exc:
+                self.logger.log(
+                    "GEMINI_FLASH",
+                    "ERROR",
+                    "clip_upload_failed",
+                    "Failed to upload live packet clip",
+                    packet_id=candidate.packet_id,
+                    error_code="GEMINI_UPLOAD_ERROR",
+                    error_detail=str(exc),
+                )
+        counts: dict[str, Any] = {"flash_errors": 0}
+        result = self._run(
+            self._run_flash(
+                candidate,
+                file_ref,
+                counts,
+                int(perf_config.get("gemini_retry_attempts", 1)),
+                int(perf_config.get("gemini_flash_timeout_sec", 30)),
+                float(perf_config.get("pro_uncertain_conf_low", 0.45)),
+                float(perf_config.get("pro_uncertain_conf_high", 0.82)),
+                clip_offset_s,
+                video_sha256,
+            )
+        )
+        with metrics_lock or contextlib.nullcontext():
+            for key, value in counts.items():
+                metrics[key] = metrics.get(key, 0) + value
+        return result
+
     def analyze(
         self,
         run_dir: Path,
         video_path: Path,
         perf_config: dict[str, Any],
         progress_cb: Optional[Callable[[str, int, str, Optional[dict[str, Any]]], None]] = None,
+        flash_precomputed: Optional[dict[str, tuple[FlashEvent, dict[str, Any]]]] = None,
+        roi_config: Optional[dict[str, Any]] = None,
+        evidence_roi_keys: Optional[dict[str, list[str]]] = None,
+    ) -> tuple[int, int, dict[str, Any]]:
+        """Flash then Pro over the run's packets, on the client's event loop (see :meth:`_run`).
+
+        ``roi_config`` (the run's ROI polygons) and ``evidence_roi_keys``
+        (violation type -> polygon keys) let image-mode Flash crop anchor frames
+        to the region a violation type is judged in.
+        """
+        return self._run(
+            self._analyze(run_dir, video_path, perf_config, progress_cb, flash_precomputed, roi_config, evidence_roi_keys or {})
+        )
+
+    async def _analyze(
+        self,
+        run_dir: Path,
+        video_path: Path,
+        perf_config: dict[str, Any],
+        progress_cb: Optional[Callable[[str, int, str, Optional[dict[str, Any]]], None]],
+        flash_precomputed: Optional[dict[str, tuple[FlashEvent, dict[str, Any]]]],
+        roi_config: Optional[dict[str, Any]],
+        evidence_roi_keys: dict[str, list[str]],
     ) -> tuple[int, int, dict[str, Any]]:
         resolved_perf = self._resolve_mode_config(perf_config)
+        precomputed = flash_precomputed or {}
         raw_candidate_payload = read_json(run_dir / "candidates.json").get("candidates", [])
         raw_candidates: list[Candidate] = []
         for idx, c in enumerate(raw_candidate_payload, start=1):
@@ -230,11 +816,15 @@ class GeminiClient:
 
         candidates = self._select_flash_candidates(raw_candidates, flash_limit, flash_min_local_score)
         selected_packet_ids = {c.packet_id for c in candidates}
+        # Packets Flash already saw during a live run stay selected regardless of caps.
+        candidates.extend(c for c in raw_candidates if c.packet_id in precomputed and c.packet_id not in selected_packet_ids)
+        selected_packet_ids = {c.packet_id for c in candidates}
 
         metrics: dict[str, Any] = {
             "pipeline_mode": resolved_perf.get("pipeline_mode", "balanced"),
             "packets_total": len(raw_candidates),
-            "packets_sent_flash": len(candidates),
+            # Live runs add the packets Flash already saw during the stream.
+            "packets_sent_flash": sum(1 for c in candidates if c.packet_id not in precomputed),
             "packets_sent_pro": 0,
             "packets_finalized": 0,
             "packets_dropped": 0,
@@ -277,25 +867,54 @@ class GeminiClient:
                 )
 
         flash_started = time.perf_counter()
-        file_ref = None
+        upload_strategy = self._upload_strategy(video_path, resolved_perf)
+        clip_pad_sec = float(resolved_perf.get("gemini_clip_pad_sec", 1.0))
+        image_types = set(resolved_perf.get("flash_image_mode_types", []))
+        image_long_edge = int(resolved_perf.get("flash_image_long_edge", 768))
+        image_crop = bool(resolved_perf.get("flash_image_crop_roi", True))
+        flash_media = {c.packet_id: self._flash_media(c, image_types) for c in candidates}
+        frame_store = None
+        full_res: dict[str, Path] = {}
+        if self._client and "images" in flash_media.values():
+            frame_store = self._open_frame_store(run_dir)
+            image_candidates = [c for c in candidates if flash_media[c.packet_id] == "images" and c.packet_id not in precomputed]
+            full_res = await asyncio.to_thread(self._full_res_anchors, run_dir, image_candidates)
+        metrics["gemini_upload_strategy"] = upload_strategy
+        metrics["gemini_upload_bytes"] = 0
+        # Clip mode keys caches on each clip's own hash; the full video is never hashed or uploaded.
+        video_sha256 = self._video_sha256(video_path, run_dir) if upload_strategy == "full" else None
 
-        self.logger.log("GEMINI_FLASH", "INFO", "stage_started", "Starting Gemini Flash pass", packet_count=len(candidates))
+        self.logger.log(
+            "GEMINI_FLASH",
+            "INFO",
+            "stage_started",
+            "Starting Gemini Flash pass",
+            packet_count=len(candidates),
+            upload_strategy=upload_strategy,
+        )
         if progress_cb:
             progress_cb("GEMINI_FLASH", 55, f"Preparing Flash pass for {len(candidates)} packets", metrics)
 
-        if self._client:
+        async def upload_full_video() -> Any:
             self.logger.log("GEMINI_FLASH", "INFO", "file_upload_start", "Uploading video to Gemini")
             if progress_cb:
                 progress_cb("GEMINI_FLASH", 56, "Uploading video for Gemini", metrics)
             try:
-                file_ref = self._upload_video(video_path)
+                upload_started = time.perf_counter()
+                uploaded_ref, upload_source = await asyncio.to_thread(self._upload_video, video_path, video_sha256)
+                metrics["gemini_upload"] = upload_source
+                if upload_source == "uploaded":
+                    metrics["gemini_upload_bytes"] = video_path.stat().st_size
                 self.logger.log(
                     "GEMINI_FLASH",
                     "INFO",
                     "file_upload_done",
                     "Video ready",
-                    file_uri=getattr(file_ref, "uri", None),
+                    file_uri=getattr(uploaded_ref, "uri", None),
+                    upload_source=upload_source,
+                    duration_ms=int((time.perf_counter() - upload_started) * 1000),
                 )
+                return uploaded_ref
             except Exception as exc:
                 self.logger.log(
                     "GEMINI_FLASH",
@@ -305,151 +924,130 @@ class GeminiClient:
                     error_code="GEMINI_UPLOAD_ERROR",
                     error_detail=str(exc),
                 )
+                return None
+
+        full_upload: Optional["asyncio.Future[Any]"] = None
+        if self._client and upload_strategy == "full" and any(
+            media == "video" and packet_id not in precomputed for packet_id, media in flash_media.items()
+        ):
+            # Started up front when some Flash packet needs video; otherwise only if Pro asks for it.
+            full_upload = asyncio.ensure_future(upload_full_video())
 
         flash_events: list[FlashEvent] = []
         flash_decisions: list[dict[str, Any]] = []
 
-        def run_flash(candidate: Candidate, order_idx: int) -> tuple[int, Candidate, FlashEvent, dict[str, Any]]:
-            prompt = (
-                "You are validating Indian traffic incidents in a short video window. Return strict JSON only. "
-                f"Use packet_id exactly as provided: {candidate.packet_id}. "
-                f"Candidate id is {candidate.candidate_id}. "
-                f"Local proposal type={candidate.event_type.value}, local_score={candidate.score:.3f}. "
-                "Set is_relevant=true only when direct visual evidence of a traffic violation exists in this window. "
-                "For plate extraction: set plate_visible, plate_text (uppercase, no spaces/hyphens where possible), "
-                "plate_candidates (alternative reads), and plate_confidence (0-1, null if not readable). "
-                "Set uncertain=true only if evidence is ambiguous/partial/occluded; include short uncertainty_reason. "
-                "If weak evidence, set is_relevant=false and uncertain=false."
-            )
-            decision = {
-                "packet_id": candidate.packet_id,
-                "candidate_id": candidate.candidate_id,
-                "model": self.flash_model,
-                "request_window_start_s": candidate.start_s,
-                "request_window_end_s": candidate.end_s,
-                "status": "fallback",
-                "latency_ms": 0,
-                "error_detail": None,
-                "response": None,
-            }
-
-            if not file_ref:
-                fallback = self._flash_fallback(candidate)
-                decision["response"] = fallback.model_dump()
-                return order_idx, candidate, fallback, decision
-
-            payload = None
-            latency_ms = 0
-            for attempt in range(retry_attempts + 1):
-                try:
-                    payload, latency_ms = self._generate(
-                        model=self.flash_model,
-                        file_ref=file_ref,
-                        start_s=candidate.start_s,
-                        end_s=candidate.end_s,
-                        fps=2,
-                        prompt=prompt,
-                        schema=FLASH_SCHEMA,
-                        stage="GEMINI_FLASH",
-                        packet_id=candidate.packet_id,
-                        timeout_sec=flash_timeout,
-                    )
-                    break
-                except Exception as exc:
-                    self.logger.log(
-                        "GEMINI_FLASH",
-                        "ERROR",
-                        "gemini_retry",
-                        "Flash call failed",
-                        packet_id=candidate.packet_id,
-                        retry_count=attempt + 1,
-                        error_detail=str(exc),
-                    )
-                    if attempt < retry_attempts:
-                        time.sleep(2 ** attempt)
-            if not payload:
-                metrics["flash_errors"] += 1
-                fallback = self._flash_fallback(candidate)
-                decision["status"] = "fallback"
-                decision["error_detail"] = "flash_failed_or_timeout"
-                decision["response"] = fallback.model_dump()
-                return order_idx, candidate, fallback, decision
-
-            returned_packet = payload.get("packet_id")
-            if returned_packet != candidate.packet_id:
-                metrics["flash_errors"] += 1
-                fallback = self._flash_fallback(candidate)
-                decision["status"] = "fallback"
-                decision["error_detail"] = "SCHEMA_PACKET_MISMATCH"
-                decision["response"] = fallback.model_dump()
-                return order_idx, candidate, fallback, decision
-
-            payload["candidate_id"] = candidate.candidate_id
-            payload["packet_id"] = candidate.packet_id
-            try:
-                event = FlashEvent(**payload)
-                uncertain_band = pro_uncertain_low <= event.confidence < pro_uncertain_high
-                should_escalate = event.is_relevant and (event.uncertain or uncertain_band)
-                reason = event.uncertainty_reason
-                if should_escalate and not reason:
-                    reason = "Flash confidence in uncertain band"
-                event = event.model_copy(update={"uncertain": should_escalate, "uncertainty_reason": reason, "needs_pro": should_escalate})
-                decision["status"] = "ok"
-                decision["latency_ms"] = latency_ms
-                decision["response"] = event.model_dump()
-                return order_idx, candidate, event, decision
-            except Exception:
-                metrics["flash_errors"] += 1
-                fallback = self._flash_fallback(candidate)
-                decision["status"] = "fallback"
-                decision["error_detail"] = "flash_schema_validation_failed"
-                decision["response"] = fallback.model_dump()
-                return order_idx, candidate, fallback, decision
-
-        with ThreadPoolExecutor(max_workers=max(1, flash_concurrency)) as executor:
-            futures = {}
-            for idx, candidate in enumerate(candidates):
-                self.logger.log(
-                    "GEMINI_FLASH",
-                    "INFO",
-                    "packet_started",
-                    "Running Flash packet",
-                    packet_id=candidate.packet_id,
-                    packet_index=idx + 1,
-                    packet_total=len(candidates),
-                    local_score=candidate.score,
+        flash_slots = asyncio.Semaphore(max(1, flash_concurrency))
+        clip_tasks: dict[str, "asyncio.Future[tuple[Any, float, Optional[str], int]]"] = {}
+
+        async def window_ref(candidate: Candidate) -> tuple[Any, float, Optional[str]]:
+            """File, clip offset and cache hash a packet's requests use; Flash and Pro share one clip."""
+            nonlocal full_upload
+            if not self._client:
+                return None, 0.0, None
+            if upload_strategy == "full":
+                if full_upload is None:
+                    full_upload = asyncio.ensure_future(upload_full_video())
+                return await full_upload, 0.0, video_sha256
+            if candidate.packet_id not in clip_tasks:
+                clip_tasks[candidate.packet_id] = asyncio.ensure_future(
+                    asyncio.to_thread(self._prepare_clip, run_dir, video_path, candidate, clip_pad_sec)
                 )
-                fut = executor.submit(run_flash, candidate, idx)
-                futures[fut] = candidate.packet_id
-
-            flash_results: list[tuple[int, Candidate, FlashEvent, dict[str, Any]]] = []
-            total = max(1, len(futures))
-            for done_idx, future in enumerate(as_completed(futures), start=1):
-                order_idx, candidate, flash_event, decision = future.result()
-                flash_results.append((order_idx, candidate, flash_event, decision))
-                flash_events.append(flash_event)
-                flash_decisions.append(decision)
-                metrics["flash_done"] = done_idx
-                if flash_event.is_relevant:
-                    metrics["flash_relevant"] += 1
-                if flash_event.uncertain:
-                    metrics["flash_uncertain"] += 1
-                self.logger.log(
-                    "GEMINI_FLASH",
-                    "INFO",
-                    "packet_completed",
-                    "Flash packet complete",
-                    packet_id=candidate.packet_id,
-                    confidence=flash_event.confidence,
-                    relevant=flash_event.is_relevant,
-                    uncertain=flash_event.uncertain,
-                    status=decision["status"],
-                )
-                if progress_cb:
-                    pct = 57 + int((done_idx / total) * 13)
-                    progress_cb("GEMINI_FLASH", pct, f"Flash analyzed {done_idx}/{len(candidates)} packets", metrics)
+                ref, offset, sha, uploaded = await clip_tasks[candidate.packet_id]
+                metrics["gemini_upload_bytes"] += uploaded
+                return ref, offset, sha
+            ref, offset, sha, _uploaded = await clip_tasks[candidate.packet_id]
+            return ref, offset, sha
+
+        async def run_flash(candidate: Candidate, order_idx: int) -> tuple[int, Candidate, FlashEvent, dict[str, Any]]:
+            if candidate.packet_id in precomputed:
+                # Already validated while a live stream was still running.
+                event, decision = precomputed[candidate.packet_id]
+            else:
+                async with flash_slots:
+                    anchors = None
+                    if flash_media[candidate.packet_id] == "images" and self._client:
+                        roi_keys = [
+                            key
+                            for t in candidate.proposed_types or [candidate.event_type]
+                            for key in evidence_roi_keys.get(t.value, [])
+                        ]
+                        anchors = await asyncio.to_thread(
+                            self._anchor_images, frame_store, full_res, candidate, roi_config or {}, roi_keys, image_long_edge, image_crop
+                        )
+                    if anchors:
+                        ref, clip_offset_s, ref_sha256 = None, 0.0, None
+                    else:
+                        # Video mode, or anchor frames that could not be read.
+                        ref, clip_offset_s, ref_sha256 = await window_ref(candidate)
+                    event, decision = await self._run_flash(
+                        candidate,
+                        ref,
+                        metrics,
+                        retry_attempts,
+                        flash_timeout,
+                        pro_uncertain_low,
+                        pro_uncertain_high,
+                        clip_offset_s,
+                        ref_sha256,
+                        anchors,
+                    )
+            return order_idx, candidate, event, decision
+
+        flash_tasks = []
+        for idx, candidate in enumerate(candidates):
+            self.logger.log(
+                "GEMINI_FLASH",
+                "INFO",
+                "packet_started",
+                "Running Flash packet",
+                packet_id=candidate.packet_id,
+                packet_index=idx + 1,
+                packet_total=len(candidates),
+                local_score=candidate.score,
+            )
+            flash_tasks.append(asyncio.ensure_future(run_flash(candidate, idx)))
+
+        flash_results: list[tuple[int, Candidate, FlashEvent, dict[str, Any]]] = []
+        total = max(1, len(flash_tasks))
+        for done_idx, next_done in enumerate(asyncio.as_completed(flash_tasks), start=1):
+            order_idx, candidate, flash_event, decision = await next_done
+            flash_results.append((order_idx, candidate, flash_event, decision))
+            flash_events.append(flash_event)
+            flash_decisions.append(decision)
+            metrics["flash_done"] = done_idx
+            if done_idx == 1:
+                metrics["gemini_first_flash_ms"] = int((time.perf_counter() - flash_started) * 1000)
+            if candidate.packet_id not in precomputed:
+                media = decision.get("media", "video")
+                usage = decision.get("usage") or {}
+                metrics[f"flash_{media}_packets"] = metrics.get(f"flash_{media}_packets", 0) + 1
+                metrics[f"flash_{media}_tokens"] = metrics.get(f"flash_{media}_tokens", 0) + int(usage.get("total_tokens") or 0)
+                metrics[f"flash_{media}_latency_ms"] = metrics.get(f"flash_{media}_latency_ms", 0) + int(decision.get("latency_ms") or 0)
+            if flash_event.is_relevant:
+                metrics["flash_relevant"] += 1
+            if flash_event.uncertain:
+                metrics["flash_uncertain"] += 1
+            self.logger.log(
+                "GEMINI_FLASH",
+                "INFO",
+                "packet_completed",
+                "Flash packet complete",
+                packet_id=candidate.packet_id,
+                confidence=flash_event.confidence,
+                relevant=flash_event.is_relevant,
+                uncertain=flash_event.uncertain,
+                status=decision["status"],
+                media=decision.get("media", "video"),
+                latency_ms=decision.get("latency_ms"),
+                total_tokens=(decision.get("usage") or {}).get("total_tokens"),
+            )
+            if progress_cb:
+                pct = 57 + int((done_idx / total) * 13)
+                progress_cb("GEMINI_FLASH", pct, f"Flash analyzed {done_idx}/{len(candidates)} packets", metrics)
 
         flash_elapsed = int((time.perf_counter() - flash_started) * 1000)
+        if frame_store is not None:
+            frame_store.close()
 
         flash_results.sort(key=lambda x: x[0])
 
@@ -542,6 +1140,18 @@ class GeminiClient:
             duration_ms=flash_elapsed,
             event_count=len(flash_events),
             pro_packet_count=len(queued),
+            upload_strategy=upload_strategy,
+            upload_bytes=metrics["gemini_upload_bytes"],
+            first_flash_ms=metrics.get("gemini_first_flash_ms"),
+            media={
+                media: {
+                    "packets": metrics[f"flash_{media}_packets"],
+                    "tokens": metrics[f"flash_{media}_tokens"],
+                    "mean_latency_ms": int(metrics[f"flash_{media}_latency_ms"] / metrics[f"flash_{media}_packets"]),
+                }
+                for media in FLASH_MEDIA
+                if metrics.get(f"flash_{media}_packets")
+            },
         )
 
         pro_started = time.perf_counter()
@@ -552,7 +1162,13 @@ class GeminiClient:
         pro_events: list[FinalEvent] = []
         pro_decisions: list[dict[str, Any]] = []
 
-        def run_pro(queue_idx: int, order_idx: int, candidate: Candidate, flash_event: FlashEvent) -> tuple[int, FinalEvent, dict[str, Any]]:
+        pro_slots = asyncio.Semaphore(max(1, pro_concurrency))
+
+        async def run_pro(queue_idx: int, order_idx: int, candidate: Candidate, flash_event: FlashEvent) -> tuple[int, FinalEvent, dict[str, Any]]:
+            async with pro_slots:
+                return await run_pro_call(queue_idx, order_idx, candidate, flash_event)
+
+        async def run_pro_call(queue_idx: int, order_idx: int, candidate: Candidate, flash_event: FlashEvent) -> tuple[int, FinalEvent, dict[str, Any]]:
             decision = {
                 "packet_id": candidate.packet_id,
                 "candidate_id": candidate.candidate_id,
@@ -561,10 +1177,14 @@ class GeminiClient:
                 "request_window_end_s": candidate.end_s,
                 "status": "fallback",
                 "latency_ms": 0,
+                "cache": None,
+                "media": "video",
+                "usage": None,
                 "error_detail": None,
                 "response": None,
             }
-            if not file_ref:
+            ref, clip_offset_s, ref_sha256 = await window_ref(candidate)
+            if not ref:
                 event = self._pro_fallback(order_idx, candidate, flash_event, "Fallback path used due to missing Gemini file upload.")
                 decision["response"] = event.model_dump()
                 return queue_idx, event, decision
@@ -572,7 +1192,7 @@ class GeminiClient:
             prompt = (
                 "You are the second-pass validator for uncertain Indian traffic incidents. Return strict JSON only. "
                 f"Use packet_id exactly as provided: {candidate.packet_id}. "
-                f"Local proposal type={candidate.event_type.value}, local_score={candidate.score:.3f}. "
+                f"{self._local_proposal(candidate)}"
                 f"Flash summary: relevant={flash_event.is_relevant}, event_type={flash_event.event_type.value}, "
                 f"confidence={flash_event.confidence:.3f}, uncertain={flash_event.uncertain}. "
                 "If plate is unreadable, return plate_text=null and plate_confidence=null. "
@@ -583,19 +1203,25 @@ class GeminiClient:
             fps = 4 if candidate.event_type.value == "RECKLESS_DRIVING" else 2
             payload = None
             latency_ms = 0
+            usage: dict[str, Any] = {}
             for attempt in range(retry_attempts + 1):
                 try:
-                    payload, latency_ms = self._generate(
+                    payload, latency_ms, decision["cache"] = await self._generate_cached(
+                        candidate=candidate,
+                        video_sha256=ref_sha256,
+                        metrics=metrics,
                         model=self.pro_model,
-                        file_ref=file_ref,
-                        start_s=candidate.start_s,
-                        end_s=candidate.end_s,
+                        file_ref=ref,
+                        start_s=candidate.start_s - clip_offset_s,
+                        end_s=candidate.end_s - clip_offset_s,
                         fps=fps,
                         prompt=prompt,
                         schema=PRO_SCHEMA,
+                        validate=lambda p: self._pro_event(candidate, p),
                         stage="GEMINI_PRO",
                         packet_id=candidate.packet_id,
                         timeout_sec=pro_timeout,
+                        usage=usage,
                     )
                     break
                 except Exception as exc:
@@ -609,7 +1235,8 @@ class GeminiClient:
                         error_detail=str(exc),
                     )
                     if attempt < retry_attempts:
-                        time.sleep(2 ** attempt)
+                        await asyncio.sleep(2 ** attempt)
+            decision["usage"] = usage or None
 
             if not payload:
                 metrics["pro_errors"] += 1
@@ -628,28 +1255,9 @@ class GeminiClient:
                 decision["response"] = event.model_dump()
                 return queue_idx, event, decision
 
+            payload = self._shift_times(payload, clip_offset_s)
             try:
-                event = FinalEvent(
-                    event_id=payload["event_id"],
-                    packet_id=candidate.packet_id,
-                    source_stage="PRO_FINAL",
-                    event_type=payload["event_type"],
-                    start_time=payload["start_time"],
-                    end_time=payload["end_time"],
-                    confidence=payload["confidence"],
-                    risk_score=payload["risk_score_gemini"],
-                    violator_description=payload["violator_description"],
-                    plate_text=payload.get("plate_text"),
-                    plate_candidates=payload.get("plate_candidates", []),
-                    plate_confidence=payload.get("plate_confidence"),
-                    key_moments=payload.get("key_moments", []),
-                    explanation_short=payload["explanation_short"],
-                    uncertain=payload.get("uncertain", False),
-                    uncertainty_reason=payload.get("uncertainty_reason"),
-                    evidence_frames=[],
-                    report_images=[],
-                    evidence_clip_path=None,
-                )
+                event = self._pro_event(candidate, payload)
                 decision["status"] = "ok"
                 decision["latency_ms"] = latency_ms
                 decision["response"] = event.model_dump()
@@ -663,43 +1271,41 @@ class GeminiClient:
                 return queue_idx, event, decision
 
         if queued:
-            with ThreadPoolExecutor(max_workers=max(1, pro_concurrency)) as executor:
-                futures = {}
-                for queue_idx, (_priority, order_idx, candidate, flash_event, _reasons) in enumerate(queued):
-                    self.logger.log(
-                        "GEMINI_PRO",
-                        "INFO",
-                        "packet_started",
-                        "Running Pro packet",
-                        packet_id=candidate.packet_id,
-                        packet_index=queue_idx + 1,
-                        packet_total=len(queued),
-                    )
-                    fut = executor.submit(run_pro, queue_idx, order_idx, candidate, flash_event)
-                    futures[fut] = candidate.packet_id
-
-                total = max(1, len(futures))
-                ordered: list[tuple[int, FinalEvent, dict[str, Any]]] = []
-                for done_idx, future in enumerate(as_completed(futures), start=1):
-                    queue_idx, event, decision = future.result()
-                    ordered.append((queue_idx, event, decision))
-                    pro_decisions.append(decision)
-                    metrics["pro_done"] = done_idx
-                    self.logger.log(
-                        "GEMINI_PRO",
-                        "INFO",
-                        "packet_completed",
-                        "Pro packet complete",
-                        packet_id=event.packet_id,
-                        event_id=event.event_id,
-                        status=decision["status"],
-                    )
-                    if progress_cb:
-                        pct = 70 + int((done_idx / total) * 9)
-                        progress_cb("GEMINI_PRO", pct, f"Pro analyzed {done_idx}/{len(queued)} packets", metrics)
+            pro_tasks = []
+            for queue_idx, (_priority, order_idx, candidate, flash_event, _reasons) in enumerate(queued):
+                self.logger.log(
+                    "GEMINI_PRO",
+                    "INFO",
+                    "packet_started",
+                    "Running Pro packet",
+                    packet_id=candidate.packet_id,
+                    packet_index=queue_idx + 1,
+                    packet_total=len(queued),
+                )
+                pro_tasks.append(asyncio.ensure_future(run_pro(queue_idx, order_idx, candidate, flash_event)))
+
+            total = max(1, len(pro_tasks))
+            ordered: list[tuple[int, FinalEvent, dict[str, Any]]] = []
+            for done_idx, next_done in enumerate(asyncio.as_completed(pro_tasks), start=1):
+                queue_idx, event, decision = await next_done
+                ordered.append((queue_idx, event, decision))
+                pro_decisions.append(decision)
+                metrics["pro_done"] = done_idx
+                self.logger.log(
+                    "GEMINI_PRO",
+                    "INFO",
+                    "packet_completed",
+                    "Pro packet complete",
+                    packet_id=event.packet_id,
+                    event_id=event.event_id,
+                    status=decision["status"],
+                )
+                if progress_cb:
+                    pct = 70 + int((done_idx / total) * 9)
+                    progress_cb("GEMINI_PRO", pct, f"Pro analyzed {done_idx}/{len(queued)} packets", metrics)
 
-                ordered.sort(key=lambda x: x[0])
-                pro_events = [row[1] for row in ordered]
+            ordered.sort(key=lambda x: x[0])
+            pro_events = [row[1] for row in ordered]
 
         flash_by_packet = {f.packet_id: f for f in flash_events}
         pro_by_packet = {p.packet_id: p for p in pro_events}
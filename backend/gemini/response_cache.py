@@ -0,0 +1,193 @@
+"""Disk cache of Gemini ``generate_content`` responses.
+
+A response is keyed by the video's content hash, the request window and fps,
+the model, :data:`PROMPT_VERSION`, the response schema and the prompt text
+with the packet/candidate ids masked, so re-running a clip (or a second run on
+the same clip) reuses earlier answers. Entries live under
+``CACHE_DIR/gemini/<key[:2]>/<key>.json``. They expire after ``ttl_sec`` and
+the least recently used ones are evicted once the cache grows past
+``max_bytes``. Only answers the caller accepts are stored (see
+:meth:`GeminiResponseCache.get_or_generate`). Concurrent identical requests
+from any run in this process are collapsed into one call (single flight),
+across event loops and threads.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from concurrent.futures import Future
+from pathlib import Path
+from threading import Lock
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+
+from backend.utils.hashing import payload_sha256
+
+
+# Bump when the Flash/Pro prompt templates change meaning, so stale answers are not reused.
+PROMPT_VERSION = "2"
+# get_or_generate() sources, as counted in run metrics.
+CACHE_SOURCES = ("hit", "miss", "shared")
+
+# Full directory scans (LRU + TTL eviction) run when the tracked size passes
+# max_bytes or every this many puts, whichever comes first.
+EVICT_EVERY_PUTS = 256
+
+_LOCK = Lock()
+_INFLIGHT: dict[str, "Future[Optional[dict[str, Any]]]"] = {}
+# Per cache root: {"bytes": tracked size or None before the first scan, "puts": puts since the last scan,
+# "evicting": a scan is running}. Entries dropped by get() are not subtracted; the next scan corrects it.
+_USAGE_LOCK = Lock()
+_USAGE: dict[Path, dict[str, Any]] = {}
+
+
+class GeminiResponseCache:
+    def __init__(self, root: Path, ttl_sec: float, max_bytes: int) -> None:
+        self.root = root
+        self.ttl_sec = ttl_sec
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(video_sha256: str, model: str, start_s: float, end_s: float, fps: int, schema: dict[str, Any], prompt: str) -> str:
+        return payload_sha256(
+            {
+                "video_sha256": video_sha256,
+                "window": [round(start_s, 3), round(end_s, 3)],
+                "fps": fps,
+                "model": model,
+                "prompt_version": PROMPT_VERSION,
+                "schema": payload_sha256(schema),
+                "prompt": prompt,
+            }
+        )
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if time.time() - float(entry.get("created_at", 0.0)) > self.ttl_sec:
+            path.unlink(missing_ok=True)
+            return None
+        # mtime doubles as last-use time for eviction.
+        os.utime(path)
+        return entry.get("payload")
+
+    def put(self, key: str, payload: dict[str, Any], model: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+        tmp = path.with_name(f".tmp_{key}_{uuid.uuid4().hex[:8]}")
+        data = json.dumps({"key": key, "model": model, "created_at": time.time(), "payload": payload}).encode("utf-8")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        with _USAGE_LOCK:
+            usage = _USAGE.setdefault(self.root, {"bytes": None, "puts": 0, "evicting": False})
+            if usage["bytes"] is not None:
+                usage["bytes"] += len(data) - replaced
+            usage["puts"] += 1
+            due = usage["bytes"] is None or usage["bytes"] > self.max_bytes or usage["puts"] >= EVICT_EVERY_PUTS
+            scan = due and not usage["evicting"]
+            if scan:
+                usage["evicting"] = True
+                usage["puts"] = 0
+        if scan:
+            try:
+                self._evict(usage)
+            finally:
+                with _USAGE_LOCK:
+                    usage["evicting"] = False
+
+    def _evict(self, usage: dict[str, Any]) -> None:
+        """Drop expired entries, then least recently used ones until the cache fits ``max_bytes``.
+
+        Runs outside the single-flight lock; only one scan per cache root runs at a time.
+        """
+        now = time.time()
+        entries: list[tuple[float, int, Path]] = []
+        for path in self.root.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _used, size, _path in entries)
+        for used, size, path in sorted(entries, key=lambda e: e[0]):
+            # Last use is never earlier than creation, so entries idle for longer than the TTL are expired.
+            if total <= self.max_bytes and now - used <= self.ttl_sec:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        with _USAGE_LOCK:
+            usage["bytes"] = total
+
+    async def get_or_generate(
+        self,
+        key: str,
+        model: str,
+        generate: Callable[[], Awaitable[tuple[dict[str, Any], int]]],
+        timeout_sec: float,
+        to_entry: Optional[Callable[[dict[str, Any]], Optional[dict[str, Any]]]] = None,
+    ) -> tuple[dict[str, Any], int, str]:
+        """Return ``(payload, latency_ms, source)``; ``source`` is one of :data:`CACHE_SOURCES`.
+
+        Only the first caller for a key runs ``generate``; concurrent callers wait
+        for its result (or its exception). ``to_entry`` maps a fresh payload to
+        the entry that is stored and shared; returning None marks the answer
+        uncacheable, and waiting callers then generate their own. Hits and shared
+        answers are entries, misses the raw payload. Latency is 0 for answers not
+        fetched by this caller.
+        """
+        entry = self.get(key)
+        if entry is not None:
+            return entry, 0, "hit"
+        with _LOCK:
+            future = _INFLIGHT.get(key)
+            leader = future is None
+            if leader:
+                future = _INFLIGHT[key] = Future()
+        if not leader:
+            # shield() keeps a follower's timeout from cancelling the leader's future.
+            entry = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout=timeout_sec)
+            if entry is not None:
+                return entry, 0, "shared"
+            payload, latency = await generate()
+            self._store(key, model, payload, to_entry)
+            return payload, latency, "miss"
+        try:
+            # The previous leader may have stored the answer between get() and taking the slot.
+            entry = self.get(key)
+            if entry is not None:
+                future.set_result(entry)
+                return entry, 0, "hit"
+            payload, latency = await generate()
+            future.set_result(self._store(key, model, payload, to_entry))
+            return payload, latency, "miss"
+        except BaseException as exc:
+            if not future.done():
+                future.set_exception(exc)
+            raise
+        finally:
+            with _LOCK:
+                _INFLIGHT.pop(key, None)
+
+    def _store(
+        self, key: str, model: str, payload: dict[str, Any], to_entry: Optional[Callable[[dict[str, Any]], Optional[dict[str, Any]]]]
+    ) -> Optional[dict[str, Any]]:
+        entry = payload if to_entry is None else to_entry(payload)
+        if entry is not None:
+            self.put(key, entry, model)
+        return entry
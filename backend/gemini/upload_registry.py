@@ -0,0 +1,103 @@
+"""Gemini Files API uploads shared across runs.
+
+Uploaded files stay on the server until they expire (48 h by default), so a
+clip is uploaded once per content hash and API key. One ``<sha256>.json`` per
+video under ``CACHE_DIR/gemini_uploads/`` records the file name, URI, MIME
+type and server-side expiry. Before reuse, :class:`GeminiClient` checks the
+file with a single ``files.get``; entries that are near expiry, belong to
+another API key or are no longer ACTIVE are dropped and the clip is uploaded
+again.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Any
+from typing import Optional
+
+from backend.utils.hashing import payload_sha256
+from backend.utils.io import read_json, write_json
+
+
+# Files API retention when the upload response carries no expiration_time.
+DEFAULT_FILE_TTL_SEC = 48 * 3600.0
+
+# Striped per-video locks: a fixed pool, so memory does not grow with the number of
+# clips a long-lived server has seen. Two clips sharing a stripe only serialise uploads.
+_LOCK_STRIPES = 64
+_KEY_LOCKS = tuple(Lock() for _ in range(_LOCK_STRIPES))
+
+
+def api_key_fingerprint(api_key: str) -> str:
+    return payload_sha256({"api_key": api_key})[:16]
+
+
+def _expiry_epoch(file_ref: Any, uploaded_at: float) -> float:
+    expiry = getattr(file_ref, "expiration_time", None)
+    if isinstance(expiry, str):
+        try:
+            expiry = datetime.fromisoformat(expiry.replace("Z", "+00:00"))
+        except ValueError:
+            expiry = None
+    if isinstance(expiry, datetime):
+        return expiry.timestamp()
+    return uploaded_at + DEFAULT_FILE_TTL_SEC
+
+
+@dataclass(frozen=True)
+class UploadEntry:
+    video_sha256: str
+    account: str
+    name: str
+    uri: str
+    mime_type: str
+    uploaded_at: float
+    expires_at: float
+
+
+class UploadRegistry:
+    def __init__(self, root: Path, api_key: str, min_ttl_sec: float) -> None:
+        self.root = root
+        self.account = api_key_fingerprint(api_key)
+        self.min_ttl_sec = min_ttl_sec
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, video_sha256: str) -> Path:
+        return self.root / f"{video_sha256}.json"
+
+    def lock(self, video_sha256: str) -> Lock:
+        """Per-video lock so concurrent runs of one clip upload it once."""
+        return _KEY_LOCKS[int(video_sha256[:8], 16) % _LOCK_STRIPES]
+
+    def get(self, video_sha256: str) -> Optional[UploadEntry]:
+        """Recorded upload that stays valid for at least ``min_ttl_sec``; None otherwise."""
+        path = self._path(video_sha256)
+        if not path.exists():
+            return None
+        try:
+            entry = UploadEntry(**read_json(path))
+        except Exception:
+            return None
+        if entry.account != self.account or entry.expires_at - time.time() < self.min_ttl_sec:
+            return None
+        return entry
+
+    def put(self, video_sha256: str, file_ref: Any) -> UploadEntry:
+        uploaded_at = time.time()
+        entry = UploadEntry(
+            video_sha256=video_sha256,
+            account=self.account,
+            name=str(file_ref.name),
+            uri=str(file_ref.uri),
+            mime_type=str(getattr(file_ref, "mime_type", None) or "video/mp4"),
+            uploaded_at=uploaded_at,
+            expires_at=_expiry_epoch(file_ref, uploaded_at),
+        )
+        write_json(self._path(video_sha256), asdict(entry))
+        return entry
+
+    def drop(self, video_sha256: str) -> None:
+        self._path(video_sha256).unlink(missing_ok=True)
@@ -0,0 +1,150 @@
+"""Detector registry for the local proposal engine.
+
+Each detector declares the per-frame features it needs and a hit predicate over
+them; the feature extractor computes only the dependency closure of the enabled
+detectors' features. The predicate is written with element-wise operators so the
+same rule tests one frame's feature row during extraction and whole
+``features.npz`` columns when a run is re-thresholded. A
+camera's ROI config can narrow the set with ``enabled_detectors`` /
+``disabled_detectors`` (violation type names), and detectors whose ROI
+polygon is empty are dropped automatically.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from typing import Mapping
+from typing import Optional
+
+from backend.models.types import ViolationType
+
+
+# Feature -> features it is computed from. Extractor keys: red_score (signal ROI
+# colour), motion_score (frame diff), flow_cos (wrong-side flow), fg_ratio (MOG2),
+# central_ratio (MOG2 mask centre box), reckless_score (blend of the first three).
+FEATURE_DEPS: dict[str, tuple[str, ...]] = {
+    "red_score": (),
+    "motion_score": (),
+    "flow_cos": (),
+    "fg_ratio": (),
+    "central_ratio": ("fg_ratio",),
+    "reckless_score": ("motion_score", "fg_ratio", "flow_cos"),
+}
+
+
+@dataclass(frozen=True)
+class Detector:
+    event_type: ViolationType
+    features: tuple[str, ...]
+    # (feature row or columns, proposal_config) -> hit flag(s). NaN features never hit.
+    hit: Callable[[Mapping[str, Any], dict[str, Any]], Any]
+    # proposal_config keys the predicate reads.
+    config_keys: tuple[str, ...]
+    # proposal_config key with the consecutive-hit run length (None: 4 samples).
+    k_key: Optional[str]
+    reason_codes: tuple[str, ...]
+    score_hint: float
+    # ROI polygons that must be non-empty for the detector to run.
+    roi_keys: tuple[str, ...] = ()
+    # Attribute candidates only to tracks whose boxes touch the wrong-side lane.
+    lane_tracks: bool = False
+    # ROI polygons that frame the evidence; image-mode Flash crops anchor frames to them.
+    evidence_roi_keys: tuple[str, ...] = ()
+
+    def k_required(self, cfg: dict[str, Any]) -> int:
+        return int(cfg[self.k_key]) if self.k_key else 4
+
+
+_REGISTRY: dict[ViolationType, Detector] = {}
+
+
+def register_detector(detector: Detector) -> Detector:
+    unknown = [f for f in detector.features if f not in FEATURE_DEPS]
+    if unknown:
+        raise ValueError(f"Unknown features for {detector.event_type.value}: {', '.join(unknown)}")
+    _REGISTRY[detector.event_type] = detector
+    return detector
+
+
+def registered_detectors() -> list[Detector]:
+    return list(_REGISTRY.values())
+
+
+def enabled_detectors(roi_cfg: dict[str, Any]) -> list[Detector]:
+    enabled = roi_cfg.get("enabled_detectors")
+    disabled = set(roi_cfg.get("disabled_detectors") or [])
+    selected = []
+    for detector in _REGISTRY.values():
+        name = detector.event_type.value
+        if enabled is not None and name not in enabled:
+            continue
+        if name in disabled:
+            continue
+        if any(not roi_cfg.get(key) for key in detector.roi_keys):
+            continue
+        selected.append(detector)
+    return selected
+
+
+def required_features(detectors: list[Detector]) -> frozenset[str]:
+    needed: set[str] = set()
+    pending = [f for detector in detectors for f in detector.features]
+    while pending:
+        feature = pending.pop()
+        if feature not in needed:
+            needed.add(feature)
+            pending.extend(FEATURE_DEPS[feature])
+    return frozenset(needed)
+
+
+register_detector(
+    Detector(
+        ViolationType.RED_LIGHT_JUMP,
+        ("red_score", "motion_score"),
+        lambda f, cfg: (f["red_score"] >= cfg["red_threshold"]) & (f["motion_score"] >= cfg["motion_threshold"]),
+        ("red_threshold", "motion_threshold"),
+        "k_red",
+        ("RED_STATE_CONFIRMED", "STOP_LINE_ACTIVITY"),
+        0.58,
+        ("signal_roi_polygon",),
+        evidence_roi_keys=("signal_roi_polygon", "stop_line_polygon"),
+    )
+)
+register_detector(
+    Detector(
+        ViolationType.WRONG_SIDE_DRIVING,
+        ("flow_cos",),
+        lambda f, cfg: f["flow_cos"] <= cfg["wrong_flow_threshold"],
+        ("wrong_flow_threshold",),
+        "k_wrong",
+        ("DIRECTION_OPPOSITE", "LANE_ROI_MATCH"),
+        0.62,
+        ("wrong_side_lane_polygon",),
+        lane_tracks=True,
+        evidence_roi_keys=("wrong_side_lane_polygon",),
+    )
+)
+register_detector(
+    Detector(
+        ViolationType.NO_HELMET,
+        ("central_ratio", "motion_score"),
+        # A busy central foreground box with some motion: a rider-sized object in frame.
+        lambda f, cfg: (f["central_ratio"] > cfg["helmet_central_ratio"]) & (f["motion_score"] > cfg["motion_threshold"] * 0.6),
+        ("helmet_central_ratio", "motion_threshold"),
+        "k_helmet",
+        ("BIKE_RIDER_PROXY", "HELMET_MISSING_PROXY"),
+        0.52,
+    )
+)
+register_detector(
+    Detector(
+        ViolationType.RECKLESS_DRIVING,
+        ("reckless_score",),
+        lambda f, cfg: f["reckless_score"] >= cfg["risk_threshold"],
+        ("risk_threshold",),
+        None,
+        ("MOTION_SPIKE", "CONFLICT_RISK"),
+        0.64,
+    )
+)
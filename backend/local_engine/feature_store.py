@@ -0,0 +1,110 @@
+"""Per-frame proposal features persisted as ``features.npz``.
+
+One float32 column per feature, indexed by ``sample_idx``. ``flow_cos`` is NaN
+where no flow direction was measured and ``central_ratio`` is NaN where the
+working-resolution foreground mask was not computed, so hits can be rebuilt
+for any thresholds without touching frames (see ``backend.local_engine.rethreshold``).
+Foreground track boxes are stored alongside as ``tracks`` (one row per sample and
+track, see ``backend.local_engine.tracker``) so rebuilt candidates keep their
+``track_ids``.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+import numpy as np
+
+from backend.local_engine.detectors import Detector
+
+
+FEATURES_FILE = "features.npz"
+FEATURE_COLUMNS = ("red_score", "motion_score", "flow_cos", "fg_ratio", "reckless_score", "central_ratio", "skipped")
+_SNAPSHOT_COLUMNS = ("red_score", "motion_score", "flow_cos", "fg_ratio", "reckless_score")
+# Per-sample track row: (track_id, x0, y0, x1, y1, in_lane).
+TrackRow = tuple[int, int, int, int, int, int]
+
+
+def save_features(
+    run_dir: Path,
+    rows: dict[int, tuple[float, ...]],
+    sample_count: int,
+    cascade: bool,
+    track_rows: Optional[dict[int, list[TrackRow]]] = None,
+) -> Path:
+    """Write ``rows`` (``sample_idx -> values in FEATURE_COLUMNS order``); missing samples stay NaN."""
+    table = np.full((sample_count, len(FEATURE_COLUMNS)), np.nan, dtype=np.float32)
+    for i, values in rows.items():
+        if 0 <= i < sample_count:
+            table[i] = values
+    path = run_dir / FEATURES_FILE
+    with path.open("wb") as fh:
+        np.savez(
+            fh,
+            cascade=np.array(cascade),
+            tracks=track_rows_array(track_rows or {}),
+            **{name: table[:, k] for k, name in enumerate(FEATURE_COLUMNS)},
+        )
+    return path
+
+
+def track_rows_array(track_rows: dict[int, list[TrackRow]]) -> np.ndarray:
+    """Flatten to an ``(n, 7)`` int32 array of ``sample_idx`` + :data:`TrackRow` for ``features.npz``."""
+    flat = [(i, *row) for i in sorted(track_rows) for row in track_rows[i]]
+    return np.array(flat, dtype=np.int32).reshape(-1, 7)
+
+
+def track_rows_from_array(array: Optional[np.ndarray]) -> dict[int, list[TrackRow]]:
+    rows: dict[int, list[TrackRow]] = {}
+    if array is None:
+        return rows
+    for values in array.tolist():
+        rows.setdefault(int(values[0]), []).append(tuple(values[1:]))
+    return rows
+
+
+def load_features(run_dir: Path) -> Optional[dict[str, np.ndarray]]:
+    path = run_dir / FEATURES_FILE
+    if not path.exists():
+        return None
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+class _SnapshotView:
+    """``feature_snapshots``-compatible lookup that builds a snapshot on demand."""
+
+    def __init__(self, features: dict[str, np.ndarray]) -> None:
+        self._features = features
+        self._cascade = bool(features.get("cascade", False))
+
+    def get(self, i: int, default: Any = None) -> Any:
+        # ``skipped`` is written for every processed sample, even when other columns are NaN.
+        if not 0 <= i < len(self._features["skipped"]) or np.isnan(self._features["skipped"][i]):
+            return default
+        snapshot = {}
+        for name in _SNAPSHOT_COLUMNS:
+            value = float(self._features[name][i])
+            snapshot[name] = round(0.0 if np.isnan(value) else value, 4)
+        if self._cascade:
+            skipped = float(self._features["skipped"][i])
+            snapshot.update({"diff_skipped": skipped, "fg_skipped": skipped, "flow_skipped": skipped})
+        return snapshot
+
+
+class StoredFeatures:
+    """Hit lists and snapshots rebuilt from a run's stored features.
+
+    Exposes the same attributes ``_build_proposals`` reads from the live
+    feature extractor. Hits come from each detector's ``hit`` predicate applied
+    to whole columns, the rule ``_FrameFeatureExtractor.process`` applies per frame.
+    """
+
+    def __init__(self, features: dict[str, np.ndarray], cfg: dict[str, Any], detectors: list[Detector]) -> None:
+        columns = {name: features[name] for name in FEATURE_COLUMNS}
+        with np.errstate(invalid="ignore"):
+            self.hits = {detector.event_type: np.flatnonzero(detector.hit(columns, cfg)).tolist() for detector in detectors}
+        self.feature_snapshots = _SnapshotView(features)
+        # Runs stored before tracking have no ``tracks`` array and get no track ids.
+        self.track_rows = track_rows_from_array(features.get("tracks"))
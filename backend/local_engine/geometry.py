@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from typing import Iterable
+from typing import Optional
 
 import numpy as np
 
@@ -13,6 +14,14 @@ def denormalize_polygon(norm_poly: Iterable[Iterable[float]], width: int, height
     return np.array(points, dtype=np.int32)
 
 
+def working_size(width: int, height: int, long_edge: int) -> tuple[int, int, float]:
+    max_side = max(height, width)
+    scale = 1.0 if max_side <= long_edge else (long_edge / float(max_side))
+    work_w = max(1, int(round(width * scale)))
+    work_h = max(1, int(round(height * scale)))
+    return work_w, work_h, scale
+
+
 def polygon_mask(shape: tuple[int, int], polygon: np.ndarray) -> np.ndarray:
     mask = np.zeros(shape, dtype=np.uint8)
     if polygon.size == 0:
@@ -23,6 +32,74 @@ def polygon_mask(shape: tuple[int, int], polygon: np.ndarray) -> np.ndarray:
     return mask
 
 
+def mask_bbox(mask: np.ndarray, pad: int = 0) -> Optional[tuple[int, int, int, int]]:
+    """``(x0, y0, x1, y1)`` of the non-zero pixels of ``mask`` grown by ``pad`` and clipped to the frame."""
+    import cv2
+
+    x, y, w, h = cv2.boundingRect(mask)
+    if w == 0 or h == 0:
+        return None
+    mh, mw = mask.shape[:2]
+    return max(0, x - pad), max(0, y - pad), min(mw, x + w + pad), min(mh, y + h + pad)
+
+
+class RoiStats:
+    """Masked statistics over one ROI without per-frame allocations.
+
+    The ROI's bounding box (grown by ``pad``) and the mask cropped to it are
+    computed once; per frame the image is cropped to a view and reduced with
+    ``cv2.mean``/``cv2.meanStdDev`` under the cropped mask, instead of building
+    a boolean index array and copying the ROI pixels.
+    """
+
+    def __init__(self, mask: np.ndarray, pad: int = 0) -> None:
+        import cv2
+
+        self.rect = mask_bbox(mask, pad)
+        self.crop_mask: Optional[np.ndarray] = None
+        self.area = 0
+        if self.rect is not None:
+            x0, y0, x1, y1 = self.rect
+            self.crop_mask = np.ascontiguousarray((mask[y0:y1, x0:x1] > 0).astype(np.uint8) * 255)
+            self.area = int(cv2.countNonZero(self.crop_mask))
+
+    @classmethod
+    def from_polygon(cls, norm_poly: Iterable[Iterable[float]], width: int, height: int, pad: int = 0) -> "RoiStats":
+        return cls(polygon_mask((height, width), denormalize_polygon(norm_poly, width, height)), pad)
+
+    @classmethod
+    def from_crop(cls, rect: Optional[tuple[int, int, int, int]], crop_mask: Optional[np.ndarray]) -> "RoiStats":
+        """Rebuild from a stored ``rect``/``crop_mask`` pair without rasterising the polygon again."""
+        import cv2
+
+        stats = cls.__new__(cls)
+        stats.rect = rect
+        stats.crop_mask = None if rect is None or crop_mask is None else np.ascontiguousarray(crop_mask, dtype=np.uint8)
+        stats.area = 0 if stats.crop_mask is None else int(cv2.countNonZero(stats.crop_mask))
+        return stats
+
+    @property
+    def empty(self) -> bool:
+        return self.area == 0
+
+    def crop(self, image: np.ndarray) -> np.ndarray:
+        x0, y0, x1, y1 = self.rect
+        return image[y0:y1, x0:x1]
+
+    def mean(self, image: np.ndarray) -> tuple[float, ...]:
+        """Per-channel mean of ``image`` (H x W or H x W x C, any cv2 depth) inside the ROI."""
+        import cv2
+
+        channels = 1 if image.ndim == 2 else image.shape[2]
+        return tuple(cv2.mean(self.crop(image), mask=self.crop_mask)[:channels])
+
+    def mean_std(self, image: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        import cv2
+
+        mean, std = cv2.meanStdDev(self.crop(image), mask=self.crop_mask)
+        return mean.reshape(-1), std.reshape(-1)
+
+
 def polygon_centroid(polygon: np.ndarray) -> tuple[float, float]:
     if polygon.size == 0:
         return 0.0, 0.0
@@ -1,17 +1,31 @@
 from __future__ import annotations
 
+import multiprocessing
+import threading
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any
+from typing import Callable
+from typing import Optional
 
 import cv2
 import numpy as np
 
-from backend.local_engine.geometry import denormalize_polygon, polygon_mask
+from backend.local_engine.detectors import Detector, enabled_detectors, required_features
+from backend.local_engine.feature_store import FEATURE_COLUMNS, StoredFeatures, save_features
+from backend.local_engine.geometry import working_size
+from backend.local_engine.roi_cache import CompiledRois, RoiMaskCache, compile_rois, resolve_rois
+from backend.local_engine.tracker import BlobTracker, TrackRow, stitch_track_ids, window_tracks
 from backend.logging_utils.json_logger import RunLogger
 from backend.models.types import Candidate, ViolationType
 from backend.utils.io import read_json, write_json
+from backend.video.frame_store import frame_name, open_frame_store
+from backend.video.frames import build_manifest, frame_record, materialize_samples, open_video, sampling_plan
+from backend.video.live import FrameRing, iter_live_frames, write_clip
+from backend.video.manifest import FrameManifest, load_manifest, write_manifest
+from backend.video.sampling import adaptive_grid, adaptive_settings, iter_adaptive_frames, iter_sampled_frames, resolve_strategy, sample_rates
 
 
 def _load_config(config_path: Path) -> dict[str, Any]:
@@ -27,6 +41,20 @@ def _load_config(config_path: Path) -> dict[str, Any]:
         "red_threshold": 1.4,
         "motion_threshold": 25.0,
         "wrong_flow_threshold": -0.25,
+        "helmet_central_ratio": 0.2,
+        "flow_roi_pad_px": 64,
+        "flow_backend": "farneback",
+        "lk_max_corners": 100,
+        "lk_min_motion_px": 0.5,
+        "ego_motion_compensation": False,
+        "ego_motion_model": "affine",
+        "ego_max_corners": 200,
+        "ego_reset_frac": 0.25,
+        "tracking_enabled": True,
+        "track_min_area_px": 150,
+        "track_iou_threshold": 0.3,
+        "track_max_missed": 3,
+        "merge_same_track": True,
     }
     if config_path.exists():
         payload = read_json(config_path)
@@ -34,31 +62,42 @@ def _load_config(config_path: Path) -> dict[str, Any]:
     return default
 
 
-def _group_runs(indices: list[int], k_required: int) -> list[tuple[int, int]]:
+def _group_runs(indices: list[int], k_required: int, weights: Optional[list[float]] = None) -> list[tuple[int, int]]:
+    # With adaptive sampling each sample stands for a variable stretch of time, so
+    # run length is the sum of per-sample weights (1.0 == one fixed-rate sample, see
+    # _sample_weights).
     if not indices:
         return []
     runs: list[tuple[int, int]] = []
     start = indices[0]
     prev = indices[0]
+    length = weights[prev] if weights else 1.0
     for idx in indices[1:]:
         if idx == prev + 1:
             prev = idx
+            length += weights[idx] if weights else 1.0
         else:
-            if prev - start + 1 >= k_required:
+            if length >= k_required:
                 runs.append((start, prev))
             start = idx
             prev = idx
-    if prev - start + 1 >= k_required:
+            length = weights[idx] if weights else 1.0
+    if length >= k_required:
         runs.append((start, prev))
     return runs
 
 
-def _to_run_relative_frame_path(frame_path: str) -> str:
-    return str(Path("frames") / Path(frame_path).name)
+def _sample_weights(manifest: FrameManifest) -> Optional[list[float]]:
+    # Samples denser than analysis_fps count for less than one; sparse floor-rate samples are
+    # capped at one, since a single hit seconds away from the next says nothing about the gap.
+    if manifest.sample_fps is None:
+        return None
+    weights = float(manifest["analysis_fps"]) / np.maximum(manifest.sample_fps.astype(np.float64), 1e-6)
+    return np.minimum(weights, 1.0).tolist()
 
 
-def _select_anchor_frames(frames: list[dict[str, Any]], start_i: int, end_i: int) -> list[dict[str, Any]]:
-    window = frames[start_i : end_i + 1]
+def _select_anchor_frames(manifest: FrameManifest, start_i: int, end_i: int) -> list[dict[str, Any]]:
+    window = list(range(start_i, min(end_i, len(manifest) - 1) + 1))
     if not window:
         return []
     if len(window) <= 3:
@@ -68,206 +107,719 @@ def _select_anchor_frames(frames: list[dict[str, Any]], start_i: int, end_i: int
         picks = [window[0], window[mid], window[-1]]
     return [
         {
-            "frame_idx": int(p["frame_idx"]),
-            "ts_sec": float(p["ts_sec"]),
-            "path": _to_run_relative_frame_path(str(p["path"])),
+            "frame_idx": int(manifest.frame_idx[i]),
+            "ts_sec": float(manifest.ts_sec[i]),
+            "path": manifest.rel_path(i),
         }
-        for p in picks
+        for i in picks
     ]
 
 
-def run_local_proposals(
-    run_id: str,
-    run_dir: Path,
-    roi_config_path: Path,
-    proposal_config_path: Path,
-    perf_config: dict[str, Any],
-    logger: RunLogger,
-) -> dict[str, Any]:
-    stage = "LOCAL_PROPOSALS"
-    started = time.perf_counter()
-    logger.log(stage, "INFO", "stage_started", "Starting local proposal engine")
+def _working_size(width: int, height: int, perf_config: dict[str, Any]) -> tuple[int, int, float]:
+    return working_size(width, height, int(perf_config.get("local_downscale_long_edge", 640)))
 
-    manifest = read_json(run_dir / "frames_manifest.json")
-    frames = manifest["frames"]
-    if not frames:
-        logger.log(stage, "WARNING", "stage_completed", "No frames in manifest", duration_ms=0)
-        payload = {"run_id": run_id, "candidates": []}
-        write_json(run_dir / "candidates.json", payload)
-        return payload
 
-    roi_cfg = read_json(roi_config_path)
-    cfg = _load_config(proposal_config_path)
+def mean_flow_cos(
+    prev_gray: np.ndarray, gray: np.ndarray, mask: np.ndarray, expected_dir: np.ndarray, min_mag_px: float = 1e-4
+) -> Optional[float]:
+    """Cosine between the mean Farneback flow inside ``mask`` and ``expected_dir``.
+
+    ``mask`` is uint8 (non-zero inside). Returns None when the mask is empty or
+    the mean flow is too small to have a direction.
+    """
+    if cv2.countNonZero(mask) == 0:
+        return None
+    flow = cv2.calcOpticalFlowFarneback(prev_gray, gray, None, 0.5, 2, 15, 3, 5, 1.2, 0)
+    avg_vec = np.array(cv2.mean(flow, mask=mask)[:2], dtype=np.float32)
+    mag = np.linalg.norm(avg_vec)
+    if mag <= min_mag_px:
+        return None
+    return float(np.dot(avg_vec / mag, expected_dir))
+
+
+def sparse_flow_cos(
+    prev_gray: np.ndarray,
+    gray: np.ndarray,
+    mask: np.ndarray,
+    expected_dir: np.ndarray,
+    max_corners: int = 100,
+    min_motion_px: float = 0.5,
+) -> Optional[float]:
+    """Like :func:`mean_flow_cos`, from corners inside ``mask`` tracked with pyramidal Lucas-Kanade.
+
+    Tracks must survive a forward-backward check (1px) and move at least
+    ``min_motion_px``; the direction is the per-axis median of those
+    displacements, so static background corners and a few bad tracks do not
+    swing it. Returns None when nothing in the lane moved.
+    """
+    corners = cv2.goodFeaturesToTrack(prev_gray, max_corners, 0.01, 5, mask=mask)
+    if corners is None:
+        return None
+    lk_params = {"winSize": (15, 15), "maxLevel": 2}
+    moved, status, _err = cv2.calcOpticalFlowPyrLK(prev_gray, gray, corners, None, **lk_params)
+    back, back_status, _err = cv2.calcOpticalFlowPyrLK(gray, prev_gray, moved, None, **lk_params)
+    fb_error = np.linalg.norm((back - corners).reshape(-1, 2), axis=1)
+    delta = (moved - corners).reshape(-1, 2)
+    ok = (status.reshape(-1) == 1) & (back_status.reshape(-1) == 1) & (fb_error < 1.0)
+    ok &= np.linalg.norm(delta, axis=1) >= min_motion_px
+    if not np.any(ok):
+        return None
+    med_vec = np.median(delta[ok], axis=0).astype(np.float32)
+    mag = np.linalg.norm(med_vec)
+    if mag <= 1e-4:
+        return None
+    return float(np.dot(med_vec / mag, expected_dir))
+
+
+FLOW_BACKENDS = ("farneback", "lk")
+# Frames MOG2 learns from at 1/frames_seen before settling on its history rate.
+MOG2_HISTORY = 60
+EGO_MOTION_MODELS = ("affine", "homography")
+# Tracked corners (and RANSAC inliers) needed before a camera-motion estimate is trusted.
+EGO_MIN_TRACKS = 12
+EGO_RANSAC_PX = 3.0
+# Low corner quality keeps background texture in the sample: with the default 0.01 a single
+# high-contrast vehicle can suppress every other corner and the fit follows the vehicle.
+EGO_CORNER_QUALITY = 0.001
+# Mean residual lane flow (px) below which a compensated frame has no direction; warp
+# residue stays under ~0.1px while a vehicle crossing the lane moves the mean 0.2-1px.
+EGO_MIN_FLOW_PX = 0.1
+
+
+def estimate_ego_motion(prev_gray: np.ndarray, gray: np.ndarray, model: str = "affine", max_corners: int = 200) -> Optional[np.ndarray]:
+    """3x3 transform taking ``prev_gray`` pixel coordinates to ``gray``, fitted with RANSAC to tracked corners.
+
+    ``affine`` fits a similarity (shift, rotation, zoom); ``homography`` a full
+    perspective transform. Independently moving objects end up as RANSAC
+    outliers. Returns None when too few corners track for a reliable estimate.
+    """
+    corners = cv2.goodFeaturesToTrack(prev_gray, max_corners, EGO_CORNER_QUALITY, 8)
+    if corners is None or len(corners) < EGO_MIN_TRACKS:
+        return None
+    moved, status, _err = cv2.calcOpticalFlowPyrLK(prev_gray, gray, corners, None, winSize=(21, 21), maxLevel=3)
+    ok = status.reshape(-1) == 1
+    if int(np.count_nonzero(ok)) < EGO_MIN_TRACKS:
+        return None
+    src, dst = corners[ok], moved[ok]
+    if model == "homography":
+        transform, inliers = cv2.findHomography(src, dst, cv2.RANSAC, EGO_RANSAC_PX)
+    else:
+        affine, inliers = cv2.estimateAffinePartial2D(src, dst, method=cv2.RANSAC, ransacReprojThreshold=EGO_RANSAC_PX)
+        transform = None if affine is None else np.vstack([affine, [0.0, 0.0, 1.0]])
+    if transform is None or inliers is None or int(np.count_nonzero(inliers)) < EGO_MIN_TRACKS:
+        return None
+    return transform
+
+
+def _warp(image: np.ndarray, transform: np.ndarray, inverse: bool = False) -> np.ndarray:
+    h, w = image.shape[:2]
+    flags = cv2.INTER_LINEAR | (cv2.WARP_INVERSE_MAP if inverse else 0)
+    if transform[2, 0] == 0.0 and transform[2, 1] == 0.0:
+        return cv2.warpAffine(image, transform[:2], (w, h), flags=flags, borderMode=cv2.BORDER_REPLICATE)
+    return cv2.warpPerspective(image, transform, (w, h), flags=flags, borderMode=cv2.BORDER_REPLICATE)
+
+
+# Gray-level change that counts a tiny-resolution pixel as moving (cascade motion gate).
+CASCADE_PIXEL_DELTA = 12
+
+
+def cascade_settings(perf_config: dict[str, Any]) -> Optional[dict[str, Any]]:
+    if not perf_config.get("cascade_enabled"):
+        return None
+    return {
+        "long_edge": int(perf_config["cascade_long_edge"]),
+        "motion_gate": float(perf_config["cascade_motion_gate"]),
+        "fg_gate": float(perf_config["cascade_fg_gate"]),
+    }
+
+
+class _FrameFeatureExtractor:
+    """Stateful per-frame feature pass shared by the file-backed and streaming paths.
+
+    Frames must already be at working resolution. Only the features needed by
+    the detectors enabled for this ROI config are computed (see
+    ``backend.local_engine.detectors``). With ``cascade`` settings a
+    tiny-resolution frame diff and MOG2 gate run first; frames that pass
+    neither gate skip the working-resolution diff, MOG2 and flow, take
+    ``motion_score``/``fg_ratio`` from the tiny stage and record
+    ``*_skipped`` flags in their snapshot.
+    """
+
+    def __init__(
+        self,
+        roi_cfg: dict[str, Any],
+        cfg: dict[str, Any],
+        work_w: int,
+        work_h: int,
+        cascade: Optional[dict[str, Any]] = None,
+        rois: Optional[CompiledRois] = None,
+    ) -> None:
+        self.cfg = cfg
+        self.detectors = enabled_detectors(roi_cfg)
+        self.features = required_features(self.detectors)
+        expected_dir = np.array(roi_cfg.get("expected_direction_vector", [1.0, 0.0]), dtype=np.float32)
+        if np.linalg.norm(expected_dir) == 0:
+            expected_dir = np.array([1.0, 0.0], dtype=np.float32)
+        self.expected_dir = expected_dir / np.linalg.norm(expected_dir)
+
+        # Bounding boxes and cropped masks are built once (or come from the camera's
+        # cached masks); per frame the ROIs are views. Flow is only needed inside the
+        # wrong-side lane: it runs on the lane's bounding box padded by flow_roi_pad_px
+        # (the pad keeps Farneback's window support away from the crop edge).
+        if rois is None:
+            rois = compile_rois(roi_cfg, work_w, work_h, int(cfg["flow_roi_pad_px"]))
+        self.rois = rois
+        self.signal_roi = rois.signal
+        self.wrong_roi = rois.wrong
+        self.stop_roi = rois.stop
+        if cfg["flow_backend"] not in FLOW_BACKENDS:
+            raise ValueError(f"Unknown flow_backend {cfg['flow_backend']!r}; expected one of {', '.join(FLOW_BACKENDS)}")
+        self.flow_backend = cfg["flow_backend"]
+        self.ego_model: Optional[str] = None
+        if cfg["ego_motion_compensation"] and self.features & {"motion_score", "fg_ratio", "flow_cos"}:
+            if cfg["ego_motion_model"] not in EGO_MOTION_MODELS:
+                raise ValueError(
+                    f"Unknown ego_motion_model {cfg['ego_motion_model']!r}; expected one of {', '.join(EGO_MOTION_MODELS)}"
+                )
+            self.ego_model = cfg["ego_motion_model"]
+        # Background-model reference frame -> current frame; reset when the camera has drifted too far.
+        self.ego_acc = np.eye(3)
+        self.ego_reset_pending = False
+        # Last frame the estimate ran on; cascade-gated frames are skipped, so it can be older than prev_gray.
+        self.ego_prev_gray: Optional[np.ndarray] = None
+        self.ego_reset_px = float(cfg["ego_reset_frac"]) * max(work_w, work_h)
+        self.frame_corners = np.array([[0, 0], [work_w, 0], [0, work_h], [work_w, work_h]], dtype=np.float64)
+
+        self.prev_gray: Optional[np.ndarray] = None
+        # Sorted sample indices where each enabled detector's predicate holds.
+        self.hits: dict[ViolationType, list[int]] = {detector.event_type: [] for detector in self.detectors}
+        self.feature_snapshots: dict[int, dict[str, float]] = defaultdict(dict)
+        # Raw per-frame values in feature_store.FEATURE_COLUMNS order (persisted as features.npz).
+        self.feature_rows: dict[int, tuple[float, ...]] = {}
+        self.bg_sub = cv2.createBackgroundSubtractorMOG2(history=MOG2_HISTORY, varThreshold=32, detectShadows=False)
+        # Foreground blobs tracked across samples; rows per sample_idx (persisted with the features).
+        self.tracker: Optional[BlobTracker] = None
+        if cfg["tracking_enabled"] and "fg_ratio" in self.features:
+            self.tracker = BlobTracker(
+                int(cfg["track_min_area_px"]), float(cfg["track_iou_threshold"]), int(cfg["track_max_missed"]), rois.wrong
+            )
+        self.track_rows: dict[int, list[TrackRow]] = {}
+
+        # The cascade only gates the diff/MOG2/flow features.
+        self.cascade = cascade if self.features & {"motion_score", "fg_ratio", "flow_cos"} else None
+        self.tiny_size: Optional[tuple[int, int]] = None
+        self.tiny_bg_sub = None
+        self.prev_tiny: Optional[np.ndarray] = None
+        self.gate_counts = {"frames": 0, "motion_pass": 0, "fg_pass": 0, "full": 0, "ego_pairs": 0, "ego_failed": 0, "ego_resets": 0}
+        if self.cascade:
+            tiny_w, tiny_h, _ = working_size(work_w, work_h, cascade["long_edge"])
+            self.tiny_size = (tiny_w, tiny_h)
+            self.tiny_bg_sub = cv2.createBackgroundSubtractorMOG2(history=MOG2_HISTORY, varThreshold=32, detectShadows=False)
+
+    def _cascade_gate(self, gray: np.ndarray) -> tuple[bool, float, float]:
+        """Run the tiny-resolution stage; returns ``(run_full, tiny_motion, tiny_fg_ratio)``."""
+        cascade = self.cascade
+        tiny = cv2.resize(gray, self.tiny_size, interpolation=cv2.INTER_AREA)
+        tiny_fg = self.tiny_bg_sub.apply(tiny)
+        tiny_fg_ratio = float(cv2.countNonZero(tiny_fg) / tiny_fg.size)
+        tiny_motion = 0.0
+        changed_pct = 100.0
+        if self.prev_tiny is not None:
+            diff = cv2.absdiff(tiny, self.prev_tiny)
+            tiny_motion = float(cv2.mean(diff)[0])
+            changed = cv2.countNonZero(cv2.threshold(diff, CASCADE_PIXEL_DELTA, 255, cv2.THRESH_BINARY)[1])
+            changed_pct = changed * 100.0 / diff.size
+        self.prev_tiny = tiny
+
+        counts = self.gate_counts
+        counts["frames"] += 1
+        run_full = False
+        if changed_pct >= cascade["motion_gate"]:
+            counts["motion_pass"] += 1
+            run_full = True
+        elif tiny_fg_ratio * 100.0 >= cascade["fg_gate"]:
+            counts["fg_pass"] += 1
+            run_full = True
+        if run_full:
+            counts["full"] += 1
+        return run_full, tiny_motion, tiny_fg_ratio
+
+    def cascade_stats(self) -> dict[str, Any]:
+        """Gate hit rates for the LOCAL_PROPOSALS log (empty when the cascade is off)."""
+        if not self.cascade:
+            return {}
+        counts = self.gate_counts
+        frames = max(1, counts["frames"])
+        return {
+            "cascade_frames": counts["frames"],
+            "cascade_motion_gate_rate": round(counts["motion_pass"] / frames, 4),
+            "cascade_fg_gate_rate": round(counts["fg_pass"] / frames, 4),
+            "cascade_full_rate": round(counts["full"] / frames, 4),
+        }
+
+    def tracking_stats(self) -> dict[str, Any]:
+        """Track count for the LOCAL_PROPOSALS log (empty when tracking is off)."""
+        if self.tracker is None:
+            return {}
+        return {"tracks": len({row[0] for rows in self.track_rows.values() for row in rows})}
+
+    def ego_motion_stats(self) -> dict[str, Any]:
+        """Camera-motion estimate counters for the LOCAL_PROPOSALS log (empty when compensation is off)."""
+        if not self.ego_model:
+            return {}
+        counts = self.gate_counts
+        return {
+            "ego_motion_model": self.ego_model,
+            "ego_motion_pairs": counts["ego_pairs"],
+            "ego_motion_failed": counts["ego_failed"],
+            "ego_motion_resets": counts["ego_resets"],
+        }
+
+    def _compensate_ego(
+        self, prev_gray: np.ndarray, gray: np.ndarray, frame: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, bool]:
+        """Returns ``(prev_gray aligned to gray, frame in the background model's reference coordinates, warped)``.
+
+        Frame-to-frame transforms are chained so MOG2 keeps seeing one fixed
+        viewpoint. When the estimate fails or the frame corners have drifted
+        more than ``ego_reset_frac`` of the long edge, the reference restarts at
+        the current frame and MOG2 is re-initialised from it.
+        """
+        counts = self.gate_counts
+        counts["ego_pairs"] += 1
+        transform = estimate_ego_motion(prev_gray, gray, self.ego_model, int(self.cfg["ego_max_corners"]))
+        if transform is None:
+            counts["ego_failed"] += 1
+            self._reset_ego()
+            return prev_gray, frame, False
+        self.ego_acc = transform @ self.ego_acc
+        moved = cv2.perspectiveTransform(self.frame_corners.reshape(-1, 1, 2), self.ego_acc).reshape(-1, 2)
+        if float(np.max(np.linalg.norm(moved - self.frame_corners, axis=1))) > self.ego_reset_px:
+            self._reset_ego()
+            return _warp(prev_gray, transform), frame, True
+        return _warp(prev_gray, transform), _warp(frame, self.ego_acc, inverse=True), True
+
+    def _reset_ego(self) -> None:
+        self.gate_counts["ego_resets"] += 1
+        self.ego_acc = np.eye(3)
+        self.ego_reset_pending = True
+
+    def process(self, i: int, frame: np.ndarray) -> None:
+        cfg = self.cfg
+        need = self.features
+        prev_gray = self.prev_gray
+        nan = float("nan")
 
-    h = frames[0]["height"]
-    w = frames[0]["width"]
-    max_side = max(h, w)
-    target_long = int(perf_config.get("local_downscale_long_edge", 640))
-    scale = 1.0 if max_side <= target_long else (target_long / float(max_side))
-    work_w = max(1, int(round(w * scale)))
-    work_h = max(1, int(round(h * scale)))
-
-    signal_poly = denormalize_polygon(roi_cfg.get("signal_roi_polygon", []), work_w, work_h)
-    wrong_poly = denormalize_polygon(roi_cfg.get("wrong_side_lane_polygon", []), work_w, work_h)
-    stop_poly = denormalize_polygon(roi_cfg.get("stop_line_polygon", []), work_w, work_h)
-    expected_dir = np.array(roi_cfg.get("expected_direction_vector", [1.0, 0.0]), dtype=np.float32)
-    if np.linalg.norm(expected_dir) == 0:
-        expected_dir = np.array([1.0, 0.0], dtype=np.float32)
-    expected_dir = expected_dir / np.linalg.norm(expected_dir)
-
-    signal_mask = polygon_mask((work_h, work_w), signal_poly)
-    wrong_mask = polygon_mask((work_h, work_w), wrong_poly)
-    stop_mask = polygon_mask((work_h, work_w), stop_poly)
-
-    prev_gray = None
-    red_hits: list[int] = []
-    motion_hits: list[int] = []
-    wrong_hits: list[int] = []
-    reckless_hits: list[int] = []
-    helmet_hits: list[int] = []
-
-    feature_snapshots: dict[int, dict[str, float]] = defaultdict(dict)
-
-    bg_sub = cv2.createBackgroundSubtractorMOG2(history=60, varThreshold=32, detectShadows=False)
-
-    for i, meta in enumerate(frames):
-        frame = cv2.imread(meta["path"])
-        if frame is None:
-            continue
-        if scale != 1.0:
-            frame = cv2.resize(frame, (work_w, work_h), interpolation=cv2.INTER_AREA)
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        fg = bg_sub.apply(frame)
+        run_full, tiny_motion, tiny_fg_ratio = True, 0.0, 0.0
+        if self.cascade:
+            run_full, tiny_motion, tiny_fg_ratio = self._cascade_gate(gray)
+        # With ego-motion compensation, diff and flow compare against the last full frame
+        # warped onto this one (so flow is motion relative to the scene) and MOG2 sees the
+        # frame warped into its reference viewpoint. Cascade-gated frames skip the estimate.
+        ref_gray, bg_frame, ref_warped = prev_gray, frame, False
+        if self.ego_model and run_full:
+            if self.ego_prev_gray is not None:
+                ref_gray, bg_frame, ref_warped = self._compensate_ego(self.ego_prev_gray, gray, frame)
+            self.ego_prev_gray = gray
+        fg = None
+        if run_full and "fg_ratio" in need:
+            if self.ego_reset_pending:
+                # Re-initialise MOG2 at the new viewpoint; its mask for this frame is meaningless.
+                fg = np.zeros_like(self.bg_sub.apply(bg_frame, learningRate=1.0))
+                self.ego_reset_pending = False
+            else:
+                fg = self.bg_sub.apply(bg_frame)
 
         red_score = 0.0
-        if signal_mask.any():
-            signal_pixels = frame[signal_mask > 0]
-            if len(signal_pixels) > 0:
-                b_mean, g_mean, r_mean = np.mean(signal_pixels, axis=0)
+        if "red_score" in need:
+            if not self.signal_roi.empty:
+                b_mean, g_mean, r_mean = self.signal_roi.mean(frame)
                 red_score = float((r_mean + 1.0) / (g_mean + b_mean + 1.0))
-                if red_score >= cfg["red_threshold"]:
-                    red_hits.append(i)
 
         motion_score = 0.0
-        if prev_gray is not None:
-            diff = cv2.absdiff(gray, prev_gray)
-            motion_score = float(np.mean(diff))
-            if motion_score >= cfg["motion_threshold"]:
-                motion_hits.append(i)
+        if "motion_score" in need:
+            motion_score = tiny_motion
+            if ref_gray is not None and run_full:
+                diff = cv2.absdiff(gray, ref_gray)
+                motion_score = float(np.mean(diff))
 
         flow_cos = 0.0
-        if prev_gray is not None and wrong_mask.any():
-            flow = cv2.calcOpticalFlowFarneback(prev_gray, gray, None, 0.5, 2, 15, 3, 5, 1.2, 0)
-            vx = flow[:, :, 0]
-            vy = flow[:, :, 1]
-            m = wrong_mask > 0
-            if np.any(m):
-                avg_vec = np.array([float(np.mean(vx[m])), float(np.mean(vy[m]))], dtype=np.float32)
-                mag = np.linalg.norm(avg_vec)
-                if mag > 1e-4:
-                    avg_vec = avg_vec / mag
-                    flow_cos = float(np.dot(avg_vec, expected_dir))
-                    if flow_cos <= cfg["wrong_flow_threshold"]:
-                        wrong_hits.append(i)
-
-        fg_ratio = float(np.count_nonzero(fg) / fg.size)
-        reckless_score = min(1.0, (motion_score / 80.0) * 0.5 + fg_ratio * 1.2 + max(0.0, -flow_cos) * 0.3)
-        if reckless_score >= cfg["risk_threshold"]:
-            reckless_hits.append(i)
-
-        fh, fw = fg.shape[:2]
-        central = fg[int(fh * 0.3) : int(fh * 0.8), int(fw * 0.3) : int(fw * 0.7)]
-        central_ratio = float(np.count_nonzero(central) / central.size) if central.size else 0.0
-        if central_ratio > 0.2 and motion_score > (cfg["motion_threshold"] * 0.6):
-            helmet_hits.append(i)
-
-        feature_snapshots[i] = {
+        cos = None
+        if "flow_cos" in need and ref_gray is not None and run_full and not self.wrong_roi.empty:
+            prev_crop, crop = self.wrong_roi.crop(ref_gray), self.wrong_roi.crop(gray)
+            if self.flow_backend == "lk":
+                cos = sparse_flow_cos(
+                    prev_crop, crop, self.wrong_roi.crop_mask, self.expected_dir, int(cfg["lk_max_corners"]), float(cfg["lk_min_motion_px"])
+                )
+            else:
+                # A warped reference leaves sub-pixel residue that must not count as lane flow.
+                min_mag = EGO_MIN_FLOW_PX if ref_warped else 1e-4
+                cos = mean_flow_cos(prev_crop, crop, self.wrong_roi.crop_mask, self.expected_dir, min_mag)
+            if cos is not None:
+                flow_cos = cos
+
+        fg_ratio = 0.0
+        if "fg_ratio" in need:
+            fg_ratio = float(cv2.countNonZero(fg) / fg.size) if fg is not None else tiny_fg_ratio
+        if self.tracker is not None and fg is not None:
+            rows = self.tracker.update(fg)
+            if rows:
+                self.track_rows[i] = rows
+
+        reckless_score = 0.0
+        if "reckless_score" in need:
+            reckless_score = min(1.0, (motion_score / 80.0) * 0.5 + fg_ratio * 1.2 + max(0.0, -flow_cos) * 0.3)
+
+        central_ratio = nan
+        if "central_ratio" in need and fg is not None:
+            fh, fw = fg.shape[:2]
+            central = fg[int(fh * 0.3) : int(fh * 0.8), int(fw * 0.3) : int(fw * 0.7)]
+            central_ratio = float(cv2.countNonZero(central) / central.size) if central.size else 0.0
+
+        snapshot = {
             "red_score": round(red_score, 4),
             "motion_score": round(motion_score, 4),
             "flow_cos": round(flow_cos, 4),
             "fg_ratio": round(fg_ratio, 4),
             "reckless_score": round(reckless_score, 4),
         }
-        prev_gray = gray
+        if self.cascade:
+            skipped = 0.0 if run_full else 1.0
+            snapshot.update({"diff_skipped": skipped, "fg_skipped": skipped, "flow_skipped": skipped})
+        self.feature_snapshots[i] = snapshot
+        # Features no enabled detector needs are stored as NaN. Detectors test this
+        # same row, as rethreshold does with the stored columns.
+        row = {
+            "red_score": red_score if "red_score" in need else nan,
+            "motion_score": motion_score if "motion_score" in need else nan,
+            "flow_cos": nan if cos is None else flow_cos,
+            "fg_ratio": fg_ratio if "fg_ratio" in need else nan,
+            "reckless_score": reckless_score if "reckless_score" in need else nan,
+            "central_ratio": central_ratio,
+            "skipped": 0.0 if run_full else 1.0,
+        }
+        self.feature_rows[i] = tuple(row[name] for name in FEATURE_COLUMNS)
+        for detector in self.detectors:
+            if detector.hit(row, cfg):
+                self.hits[detector.event_type].append(i)
+        self.prev_gray = gray
+
+
+def _clear_hits(extractor: _FrameFeatureExtractor) -> None:
+    for hits in extractor.hits.values():
+        hits.clear()
+
+
+def _extract_range(
+    extractor: _FrameFeatureExtractor,
+    frame_store: Any,
+    start: int,
+    end: int,
+    work_w: int,
+    work_h: int,
+) -> None:
+    for i in range(start, end):
+        frame = frame_store.read(i)
+        if frame is None:
+            continue
+        if frame.shape[:2] != (work_h, work_w):
+            frame = cv2.resize(frame, (work_w, work_h), interpolation=cv2.INTER_AREA)
+        extractor.process(i, frame)
+
+
+def _extract_shard(
+    run_dir: str,
+    roi_cfg: dict[str, Any],
+    cfg: dict[str, Any],
+    work_w: int,
+    work_h: int,
+    cascade: Optional[dict[str, Any]],
+    rois: CompiledRois,
+    start: int,
+    end: int,
+    warmup: int,
+) -> dict[str, Any]:
+    """Worker entry point: features for samples ``[start, end)``.
+
+    The ``warmup`` samples before ``start`` are processed first to prime
+    ``prev_gray``, the MOG2 models and the tracker; their hits and snapshots
+    are dropped. Their track rows are returned separately so the merge can
+    carry tracks over from the previous shard.
+    """
+    manifest = load_manifest(Path(run_dir))
+    extractor = _FrameFeatureExtractor(roi_cfg, cfg, work_w, work_h, cascade, rois)
+    frame_store = open_frame_store(manifest)
+    try:
+        _extract_range(extractor, frame_store, max(0, start - warmup), start, work_w, work_h)
+        _clear_hits(extractor)
+        extractor.feature_snapshots.clear()
+        extractor.feature_rows.clear()
+        warmup_tracks = dict(extractor.track_rows)
+        extractor.track_rows.clear()
+        extractor.gate_counts = dict.fromkeys(extractor.gate_counts, 0)
+        _extract_range(extractor, frame_store, start, end, work_w, work_h)
+    finally:
+        frame_store.close()
+    return {
+        "hits": extractor.hits,
+        "snapshots": dict(extractor.feature_snapshots),
+        "rows": extractor.feature_rows,
+        "tracks": extractor.track_rows,
+        "warmup_tracks": warmup_tracks,
+        "gate_counts": extractor.gate_counts,
+    }
+
+
+def _extract_sharded(
+    run_dir: Path,
+    extractor: _FrameFeatureExtractor,
+    roi_cfg: dict[str, Any],
+    cfg: dict[str, Any],
+    work_w: int,
+    work_h: int,
+    sample_count: int,
+    workers: int,
+    warmup: int,
+) -> None:
+    """Split the samples into contiguous shards, one per worker process, and merge the results into ``extractor``."""
+    bounds = [(sample_count * k // workers, sample_count * (k + 1) // workers) for k in range(workers)]
+    # spawn, not fork: the pipeline runs on an API worker thread.
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        futures = [
+            pool.submit(
+                _extract_shard, str(run_dir), roi_cfg, cfg, work_w, work_h, extractor.cascade, extractor.rois, start, end, warmup
+            )
+            for start, end in bounds
+        ]
+        shards = [f.result() for f in futures]
+    # Shards are contiguous and in order, so concatenated hit lists stay sorted.
+    next_track_id = 1
+    for shard in shards:
+        for event_type, hits in shard["hits"].items():
+            extractor.hits[event_type].extend(hits)
+        extractor.feature_snapshots.update(shard["snapshots"])
+        extractor.feature_rows.update(shard["rows"])
+        # Track ids are per worker. A track alive through the warm-up keeps the id of the
+        # previous shard's track on the same blobs; the rest are renumbered to stay unique.
+        # Only ids that carry into the shard vote, so a fragment that died in the warm-up
+        # cannot claim the previous shard's id ahead of the track that continues it.
+        live = {row[0] for rows in shard["tracks"].values() for row in rows}
+        warmup_tracks = {i: [row for row in rows if row[0] in live] for i, rows in shard["warmup_tracks"].items()}
+        remap = stitch_track_ids(extractor.track_rows, warmup_tracks, float(cfg["track_iou_threshold"]))
+        for i in sorted(shard["tracks"]):
+            rows = []
+            for track_id, *box in shard["tracks"][i]:
+                if track_id not in remap:
+                    remap[track_id] = next_track_id
+                    next_track_id += 1
+                rows.append((remap[track_id], *box))
+            extractor.track_rows[i] = rows
+        for key, value in shard["gate_counts"].items():
+            extractor.gate_counts[key] += value
+
+
+def extract_features(
+    run_dir: Path,
+    manifest: FrameManifest,
+    roi_cfg: dict[str, Any],
+    cfg: dict[str, Any],
+    work_w: int,
+    work_h: int,
+    perf_config: dict[str, Any],
+    rois: Optional[CompiledRois] = None,
+) -> tuple[_FrameFeatureExtractor, int]:
+    """Per-frame features for every sample of a stored run; returns ``(extractor, workers_used)``.
+
+    Runs are sharded only when every shard gets ``proposal_min_shard_samples``;
+    below that, process start-up and the warm-up replay cost more than they save.
+    """
+    extractor = _FrameFeatureExtractor(roi_cfg, cfg, work_w, work_h, cascade_settings(perf_config), rois)
+    warmup = int(perf_config["proposal_warmup_frames"])
+    if extractor.tracker is not None:
+        # A shard's MOG2 that has not converged yet sees clutter blobs the sequential pass
+        # does not, and they become extra tracks no overlap can stitch.
+        warmup = max(warmup, MOG2_HISTORY)
+    min_shard = max(warmup, int(perf_config["proposal_min_shard_samples"]))
+    workers = max(1, min(int(perf_config["proposal_workers"]), len(manifest) // min_shard))
+    if workers > 1:
+        _extract_sharded(run_dir, extractor, roi_cfg, cfg, work_w, work_h, len(manifest), workers, warmup)
+        return extractor, workers
+    frame_store = open_frame_store(manifest)
+    try:
+        _extract_range(extractor, frame_store, 0, len(manifest), work_w, work_h)
+    finally:
+        frame_store.close()
+    return extractor, 1
+
+
+def _window_overlap(a: Candidate, b: Candidate) -> bool:
+    overlap = max(0.0, min(a.end_s, b.end_s) - max(a.start_s, b.start_s))
+    shorter = min(a.end_s - a.start_s, b.end_s - b.start_s)
+    return shorter > 0 and overlap / shorter > 0.4
+
+
+def _proposed_types(candidate: Candidate) -> list[ViolationType]:
+    return candidate.proposed_types or [candidate.event_type]
+
 
+def _overlaps(existing: Candidate, cand: Candidate) -> bool:
+    if not set(_proposed_types(existing)).intersection(_proposed_types(cand)):
+        return False
+    return _window_overlap(existing, cand)
+
+
+def _make_packet(
+    run_id: str,
+    cid: int,
+    event_type: ViolationType,
+    start_ts: float,
+    end_ts: float,
+    anchors: list[dict[str, Any]],
+    snap: dict[str, float],
+    reason_codes: list[str],
+    score_hint: float,
+    track_ids: Optional[list[int]] = None,
+) -> tuple[Candidate, dict[str, Any]]:
+    score = min(1.0, max(0.0, score_hint + float(snap.get("reckless_score", 0.0)) * 0.25))
+    packet_id = f"pkt_{cid:03d}"
+    candidate = Candidate(
+        candidate_id=f"cand_{cid:03d}",
+        packet_id=packet_id,
+        event_type=event_type,
+        start_s=round(start_ts, 3),
+        end_s=round(end_ts, 3),
+        score=round(score, 3),
+        anchor_frames=anchors,
+        track_ids=track_ids or [],
+        proposed_types=[event_type],
+        reason_codes=reason_codes,
+        feature_snapshot=snap,
+    )
+    packet = {
+        "packet_id": packet_id,
+        "candidate_id": f"cand_{cid:03d}",
+        "run_id": run_id,
+        "candidate_rank": 0,
+        "window_start_s": round(start_ts, 3),
+        "window_end_s": round(end_ts, 3),
+        "anchor_frames": anchors,
+        "local": {
+            "proposed_event_type": event_type.value,
+            "proposed_event_types": [event_type.value],
+            "track_ids": track_ids or [],
+            "local_score": round(score, 3),
+            "reason_codes": reason_codes,
+            "feature_snapshot": snap,
+        },
+        "routing": {
+            "sent_to_flash": False,
+            "sent_to_pro": False,
+            "routing_reason": [],
+        },
+    }
+    return candidate, packet
+
+
+def _merge_same_track(
+    candidates: list[Candidate],
+    packet_map: dict[str, dict[str, Any]],
+    spans: dict[str, tuple[int, int]],
+    manifest: FrameManifest,
+) -> list[Candidate]:
+    """Fold candidates of other types that share a track and overlap in time into the best-scoring one.
+
+    ``candidates`` are score-ordered. The kept packet keeps its type, score and
+    snapshot, covers the union of the windows and lists every type in
+    ``proposed_types``, so Flash checks the vehicle once instead of once per detector.
+    """
+    kept: list[Candidate] = []
+    for cand in candidates:
+        target = None
+        if cand.track_ids:
+            target = next(
+                (
+                    k
+                    for k in kept
+                    if cand.event_type not in k.proposed_types
+                    and set(k.track_ids).intersection(cand.track_ids)
+                    and _window_overlap(k, cand)
+                ),
+                None,
+            )
+        if target is None:
+            kept.append(cand)
+            continue
+        start_i = min(spans[target.candidate_id][0], spans[cand.candidate_id][0])
+        end_i = max(spans[target.candidate_id][1], spans[cand.candidate_id][1])
+        spans[target.candidate_id] = (start_i, end_i)
+        target.start_s = min(target.start_s, cand.start_s)
+        target.end_s = max(target.end_s, cand.end_s)
+        target.anchor_frames = _select_anchor_frames(manifest, start_i, end_i)
+        target.proposed_types.append(cand.event_type)
+        target.track_ids = target.track_ids + [t for t in cand.track_ids if t not in target.track_ids]
+        target.reason_codes = target.reason_codes + [r for r in cand.reason_codes if r not in target.reason_codes]
+
+        packet = packet_map[target.packet_id]
+        packet["window_start_s"] = target.start_s
+        packet["window_end_s"] = target.end_s
+        packet["anchor_frames"] = target.anchor_frames
+        local = packet["local"]
+        local["proposed_event_types"] = [t.value for t in target.proposed_types]
+        local["track_ids"] = target.track_ids
+        local["reason_codes"] = target.reason_codes
+        local.setdefault("merged_candidate_ids", []).append(cand.candidate_id)
+    return kept
+
+
+def _build_proposals(
+    run_id: str,
+    run_dir: Path,
+    manifest: FrameManifest,
+    extractor: _FrameFeatureExtractor | StoredFeatures,
+    cfg: dict[str, Any],
+    detectors: list[Detector],
+) -> tuple[list[Candidate], list[dict[str, Any]]]:
+    feature_snapshots = extractor.feature_snapshots
+    duration_sec = float(manifest["duration_sec"])
+    weights = _sample_weights(manifest)
+    track_rows = extractor.track_rows
     candidates: list[Candidate] = []
     packets: list[dict[str, Any]] = []
+    spans: dict[str, tuple[int, int]] = {}
     cid = 1
 
-    def add_candidates(event_type: ViolationType, runs: list[tuple[int, int]], reason_codes: list[str], score_hint: float) -> None:
+    def add_candidates(detector: Detector, runs: list[tuple[int, int]]) -> None:
         nonlocal cid
         for start_i, end_i in runs:
-            start_ts = max(0.0, float(frames[start_i]["ts_sec"] - 1.0))
-            end_ts = min(float(manifest["duration_sec"]), float(frames[end_i]["ts_sec"] + 1.0))
-            peak_i = min(max((start_i + end_i) // 2, 0), len(frames) - 1)
-            snap = feature_snapshots.get(peak_i, {})
-            score = min(1.0, max(0.0, score_hint + float(snap.get("reckless_score", 0.0)) * 0.25))
-            packet_id = f"pkt_{cid:03d}"
-            anchors = _select_anchor_frames(frames, start_i, end_i)
-            candidates.append(
-                Candidate(
-                    candidate_id=f"cand_{cid:03d}",
-                    packet_id=packet_id,
-                    event_type=event_type,
-                    start_s=round(start_ts, 3),
-                    end_s=round(end_ts, 3),
-                    score=round(score, 3),
-                    anchor_frames=anchors,
-                    track_ids=[],
-                    reason_codes=reason_codes,
-                    feature_snapshot=snap,
-                )
-            )
-            packets.append(
-                {
-                    "packet_id": packet_id,
-                    "candidate_id": f"cand_{cid:03d}",
-                    "run_id": run_id,
-                    "candidate_rank": 0,
-                    "window_start_s": round(start_ts, 3),
-                    "window_end_s": round(end_ts, 3),
-                    "anchor_frames": anchors,
-                    "local": {
-                        "proposed_event_type": event_type.value,
-                        "local_score": round(score, 3),
-                        "reason_codes": reason_codes,
-                        "feature_snapshot": snap,
-                    },
-                    "routing": {
-                        "sent_to_flash": False,
-                        "sent_to_pro": False,
-                        "routing_reason": [],
-                    },
-                }
+            start_ts = max(0.0, float(manifest.ts_sec[start_i] - 1.0))
+            end_ts = min(duration_sec, float(manifest.ts_sec[end_i] + 1.0))
+            peak_i = min(max((start_i + end_i) // 2, 0), len(manifest) - 1)
+            candidate, packet = _make_packet(
+                run_id,
+                cid,
+                detector.event_type,
+                start_ts,
+                end_ts,
+                _select_anchor_frames(manifest, start_i, end_i),
+                feature_snapshots.get(peak_i, {}),
+                list(detector.reason_codes),
+                detector.score_hint,
+                window_tracks(track_rows, start_i, end_i, detector.lane_tracks),
             )
+            candidates.append(candidate)
+            packets.append(packet)
+            spans[candidate.candidate_id] = (start_i, end_i)
             cid += 1
 
-    add_candidates(
-        ViolationType.RED_LIGHT_JUMP,
-        _group_runs(sorted(set(red_hits).intersection(set(motion_hits))), cfg["k_red"]),
-        ["RED_STATE_CONFIRMED", "STOP_LINE_ACTIVITY"],
-        0.58,
-    )
-    add_candidates(
-        ViolationType.WRONG_SIDE_DRIVING,
-        _group_runs(wrong_hits, cfg["k_wrong"]),
-        ["DIRECTION_OPPOSITE", "LANE_ROI_MATCH"],
-        0.62,
-    )
-    add_candidates(
-        ViolationType.NO_HELMET,
-        _group_runs(helmet_hits, cfg["k_helmet"]),
-        ["BIKE_RIDER_PROXY", "HELMET_MISSING_PROXY"],
-        0.52,
-    )
-    add_candidates(
-        ViolationType.RECKLESS_DRIVING,
-        _group_runs(reckless_hits, 4),
-        ["MOTION_SPIKE", "CONFLICT_RISK"],
-        0.64,
-    )
+    for detector in detectors:
+        add_candidates(detector, _group_runs(extractor.hits[detector.event_type], detector.k_required(cfg), weights))
 
     candidates.sort(key=lambda x: x.score, reverse=True)
+    packet_map = {p["packet_id"]: p for p in packets}
+    if cfg["merge_same_track"]:
+        candidates = _merge_same_track(candidates, packet_map, spans, manifest)
 
     per_type_counts: dict[ViolationType, int] = defaultdict(int)
     pruned: list[Candidate] = []
@@ -278,30 +830,63 @@ def run_local_proposals(
         if per_type_counts[cand.event_type] >= int(cfg["max_candidates_per_type"]):
             continue
 
-        keep = True
-        for existing in pruned:
-            if existing.event_type != cand.event_type:
-                continue
-            overlap = max(0.0, min(existing.end_s, cand.end_s) - max(existing.start_s, cand.start_s))
-            shorter = min(existing.end_s - existing.start_s, cand.end_s - cand.start_s)
-            if shorter > 0 and overlap / shorter > 0.4:
-                keep = False
-                break
-        if keep:
+        if not any(_overlaps(existing, cand) for existing in pruned):
             pruned.append(cand)
             per_type_counts[cand.event_type] += 1
             pruned_packet_ids.append(cand.packet_id)
 
-    payload = {"run_id": run_id, "candidates": [c.model_dump() for c in pruned]}
-    packet_map = {p["packet_id"]: p for p in packets}
     pruned_packets: list[dict[str, Any]] = []
     for rank, packet_id in enumerate(pruned_packet_ids, start=1):
         packet = packet_map[packet_id]
         packet["candidate_rank"] = rank
         pruned_packets.append(packet)
 
-    write_json(run_dir / "candidates.json", payload)
+    write_json(run_dir / "candidates.json", {"run_id": run_id, "candidates": [c.model_dump() for c in pruned]})
     write_json(run_dir / "packets.json", {"run_id": run_id, "packets": pruned_packets})
+    return pruned, pruned_packets
+
+
+def _anchor_samples(manifest: FrameManifest, packets: list[dict[str, Any]]) -> list[int]:
+    samples = (manifest.index_for_path(anchor["path"]) for packet in packets for anchor in packet["anchor_frames"])
+    return [idx for idx in samples if idx is not None]
+
+
+def _write_empty_proposals(run_id: str, run_dir: Path) -> dict[str, Any]:
+    payload = {"run_id": run_id, "candidates": []}
+    write_json(run_dir / "candidates.json", payload)
+    return payload
+
+
+def run_local_proposals(
+    run_id: str,
+    run_dir: Path,
+    roi_config_path: Path,
+    proposal_config_path: Path,
+    perf_config: dict[str, Any],
+    logger: RunLogger,
+    roi_cache: Optional[RoiMaskCache] = None,
+) -> dict[str, Any]:
+    stage = "LOCAL_PROPOSALS"
+    started = time.perf_counter()
+    logger.log(stage, "INFO", "stage_started", "Starting local proposal engine")
+
+    manifest = load_manifest(run_dir)
+    if manifest is None or not len(manifest):
+        logger.log(stage, "WARNING", "stage_completed", "No frames in manifest", duration_ms=0)
+        return _write_empty_proposals(run_id, run_dir)
+
+    roi_cfg = read_json(roi_config_path)
+    cfg = _load_config(proposal_config_path)
+
+    # Size against the source so frames already stored at working resolution are used as-is.
+    source_w = int(manifest.get("source_width") or manifest.frame_width)
+    source_h = int(manifest.get("source_height") or manifest.frame_height)
+    work_w, work_h, scale = _working_size(source_w, source_h, perf_config)
+    rois, roi_masks = resolve_rois(roi_cfg, work_w, work_h, int(cfg["flow_roi_pad_px"]), roi_cache)
+    extractor, workers = extract_features(run_dir, manifest, roi_cfg, cfg, work_w, work_h, perf_config, rois)
+    save_features(run_dir, extractor.feature_rows, len(manifest), bool(extractor.cascade), extractor.track_rows)
+
+    pruned, _packets = _build_proposals(run_id, run_dir, manifest, extractor, cfg, extractor.detectors)
 
     elapsed = int((time.perf_counter() - started) * 1000)
     logger.log(
@@ -313,7 +898,400 @@ def run_local_proposals(
         candidate_count=len(pruned),
         resized=scale != 1.0,
         frame_scale=round(scale, 3),
+        proposal_workers=workers,
+        roi_masks=roi_masks,
+        detectors=[d.event_type.value for d in extractor.detectors],
+        merged_candidates=sum(len(c.proposed_types) - 1 for c in pruned),
+        **extractor.cascade_stats(),
+        **extractor.tracking_stats(),
+        **extractor.ego_motion_stats(),
     )
     if not pruned:
         logger.log(stage, "WARNING", "candidate_empty_warning", "No candidates generated", error_code="CANDIDATE_EMPTY_WARNING")
-    return payload
+    return {"run_id": run_id, "candidates": [c.model_dump() for c in pruned]}
+
+
+def run_streaming_proposals(
+    run_id: str,
+    run_dir: Path,
+    video_path: Path,
+    roi_config_path: Path,
+    proposal_config_path: Path,
+    perf_config: dict[str, Any],
+    logger: RunLogger,
+    roi_cache: Optional[RoiMaskCache] = None,
+) -> tuple[FrameManifest, dict[str, Any], dict[str, int]]:
+    """Fused INGEST + LOCAL_PROPOSALS pass.
+
+    Decoded frames go straight from the capture into the feature extractor at
+    working resolution; only the anchor frames of the surviving packets are
+    written to ``frames/``. Returns ``(manifest, payload, timings_ms)``.
+    """
+    stage = "LOCAL_PROPOSALS"
+    started = time.perf_counter()
+    logger.log("INGEST", "INFO", "stage_started", "Starting streaming ingest", ingest_mode="streaming")
+
+    try:
+        cap = open_video(video_path)
+    except RuntimeError:
+        logger.log("INGEST", "ERROR", "stage_failed", "Unable to open video", error_code="INGEST_DECODE_ERROR")
+        raise
+
+    plan = sampling_plan(
+        cap,
+        int(perf_config["analysis_fps_short"]),
+        int(perf_config["analysis_fps_long"]),
+        int(perf_config["long_video_threshold_sec"]),
+    )
+    adaptive = adaptive_settings(perf_config)
+    grid = adaptive_grid(plan["source_fps"], adaptive) if adaptive else None
+    grid_every = grid["fine_every"] if grid else plan["sample_every"]
+    strategy = resolve_strategy(perf_config["ingest_sampling_strategy"], grid_every, perf_config["ingest_seek_min_stride"])
+    roi_cfg = read_json(roi_config_path)
+    cfg = _load_config(proposal_config_path)
+    frames_dir = run_dir / "frames"
+
+    frames: list[dict[str, Any]] = []
+    extractor: Optional[_FrameFeatureExtractor] = None
+    work_w, work_h, scale = 0, 0, 1.0
+    decode_s = 0.0
+    feature_s = 0.0
+    try:
+        sampled = iter_sampled_frames(cap, grid_every, strategy)
+        if grid:
+            sampled = iter_adaptive_frames(sampled, grid["floor_every"], grid["motion_threshold"], grid["hold_frames"])
+        while True:
+            t_decode = time.perf_counter()
+            item = next(sampled, None)
+            if item is None:
+                decode_s += time.perf_counter() - t_decode
+                break
+            frame_idx, frame = item
+            sample_idx = len(frames)
+            frames.append(frame_record(frame_idx, sample_idx, plan["source_fps"], frames_dir / f"f_{sample_idx:05d}.jpg", frame.shape, materialized=False))
+            if extractor is None:
+                work_w, work_h, scale = _working_size(frame.shape[1], frame.shape[0], perf_config)
+                rois, roi_masks = resolve_rois(roi_cfg, work_w, work_h, int(cfg["flow_roi_pad_px"]), roi_cache)
+                extractor = _FrameFeatureExtractor(roi_cfg, cfg, work_w, work_h, cascade_settings(perf_config), rois)
+            if scale != 1.0:
+                frame = cv2.resize(frame, (work_w, work_h), interpolation=cv2.INTER_AREA)
+            t_feature = time.perf_counter()
+            decode_s += t_feature - t_decode
+            extractor.process(sample_idx, frame)
+            feature_s += time.perf_counter() - t_feature
+    finally:
+        cap.release()
+
+    extra: dict[str, Any] = {}
+    if grid:
+        rates = sample_rates([f["frame_idx"] for f in frames], plan["source_fps"], plan["analysis_fps"])
+        for record, rate in zip(frames, rates):
+            record["sample_fps"] = rate
+        extra["sampling"] = {"mode": "adaptive", **adaptive, **grid}
+    manifest = write_manifest(run_dir, build_manifest(video_path, plan, frames, frame_storage="anchors_only", **extra))
+    ingest_ms = int(decode_s * 1000)
+    logger.log(
+        "INGEST",
+        "INFO",
+        "stage_completed",
+        "Streaming ingest complete",
+        duration_ms=ingest_ms,
+        frame_count=plan["frame_count"],
+        sample_count=len(frames),
+        sampling_strategy=strategy,
+        sampling_mode="adaptive" if grid else "fixed",
+        ingest_mode="streaming",
+    )
+
+    logger.log(stage, "INFO", "stage_started", "Starting local proposal engine", ingest_mode="streaming")
+    if extractor is None:
+        logger.log(stage, "WARNING", "stage_completed", "No frames in manifest", duration_ms=0)
+        payload = _write_empty_proposals(run_id, run_dir)
+        return manifest, payload, {"INGEST": ingest_ms, "LOCAL_PROPOSALS": 0}
+
+    save_features(run_dir, extractor.feature_rows, len(manifest), bool(extractor.cascade), extractor.track_rows)
+    pruned, pruned_packets = _build_proposals(run_id, run_dir, manifest, extractor, cfg, extractor.detectors)
+
+    anchors_written = materialize_samples(manifest, _anchor_samples(manifest, pruned_packets))
+
+    total_ms = int((time.perf_counter() - started) * 1000)
+    proposals_ms = max(0, total_ms - ingest_ms)
+    logger.log(
+        stage,
+        "INFO",
+        "stage_completed",
+        "Local proposals completed",
+        duration_ms=proposals_ms,
+        candidate_count=len(pruned),
+        resized=scale != 1.0,
+        frame_scale=round(scale, 3),
+        feature_ms=int(feature_s * 1000),
+        anchors_written=anchors_written,
+        ingest_mode="streaming",
+        roi_masks=roi_masks,
+        merged_candidates=sum(len(c.proposed_types) - 1 for c in pruned),
+        **extractor.cascade_stats(),
+        **extractor.tracking_stats(),
+        **extractor.ego_motion_stats(),
+    )
+    if not pruned:
+        logger.log(stage, "WARNING", "candidate_empty_warning", "No candidates generated", error_code="CANDIDATE_EMPTY_WARNING")
+    payload = {"run_id": run_id, "candidates": [c.model_dump() for c in pruned]}
+    return manifest, payload, {"INGEST": ingest_ms, "LOCAL_PROPOSALS": proposals_ms}
+
+
+class _RunCloser:
+    """Incremental ``_group_runs`` for one event type: reports a run as soon as it ends."""
+
+    def __init__(self, k_required: int) -> None:
+        self.k_required = k_required
+        self.start: Optional[int] = None
+        self.prev = 0
+        self.start_ts = 0.0
+        self.prev_ts = 0.0
+
+    def update(self, i: int, hit: bool, ts_sec: float) -> Optional[tuple[int, int, float, float]]:
+        if hit:
+            if self.start is None:
+                self.start, self.start_ts = i, ts_sec
+            self.prev, self.prev_ts = i, ts_sec
+            return None
+        return self.flush()
+
+    def flush(self) -> Optional[tuple[int, int, float, float]]:
+        if self.start is None:
+            return None
+        run = (self.start, self.prev, self.start_ts, self.prev_ts) if self.prev - self.start + 1 >= self.k_required else None
+        self.start = None
+        return run
+
+
+def run_live_proposals(
+    run_id: str,
+    run_dir: Path,
+    source: str,
+    roi_config_path: Path,
+    proposal_config_path: Path,
+    perf_config: dict[str, Any],
+    logger: RunLogger,
+    on_packet: Optional[Callable[[Candidate, dict[str, Any], Optional[Path], float], None]] = None,
+    stop_event: Optional[threading.Event] = None,
+    roi_cache: Optional[RoiMaskCache] = None,
+) -> tuple[FrameManifest, dict[str, Any], dict[str, int]]:
+    """Continuous INGEST + LOCAL_PROPOSALS over a live source (growing file or stream URL).
+
+    Working-resolution samples pass through a bounded ring buffer
+    (``live_ring_seconds``). A packet is emitted once its run has closed and
+    the ring holds its 1 s tail: anchors and a short window clip are written
+    from the ring and ``on_packet(candidate, packet, clip_path, clip_offset_s)``
+    is called, so Gemini can start before the stream ends. ``candidates.json``
+    and ``packets.json`` are rewritten at most every ``live_flush_sec``.
+    Memory does not grow with stream length; only anchor frames are listed in
+    the manifest.
+    """
+    stage = "LOCAL_PROPOSALS"
+    started = time.perf_counter()
+    logger.log("INGEST", "INFO", "stage_started", "Starting live ingest", ingest_mode="live", source=source)
+
+    probe = cv2.VideoCapture(source)
+    source_fps = float(probe.get(cv2.CAP_PROP_FPS) or 0.0) or 30.0
+    probe.release()
+    analysis_fps = int(perf_config["analysis_fps_short"])
+    sample_every = max(int(round(source_fps / max(analysis_fps, 1))), 1)
+    ring_capacity = max(1, int(float(perf_config["live_ring_seconds"]) * analysis_fps))
+    flush_sec = float(perf_config["live_flush_sec"])
+
+    roi_cfg = read_json(roi_config_path)
+    cfg = _load_config(proposal_config_path)
+    ring = FrameRing(ring_capacity)
+    detectors = {detector.event_type: detector for detector in enabled_detectors(roi_cfg)}
+    closers = {event_type: _RunCloser(detector.k_required(cfg)) for event_type, detector in detectors.items()}
+
+    extractor: Optional[_FrameFeatureExtractor] = None
+    work_w, work_h, scale = 0, 0, 1.0
+    roi_masks: Optional[str] = None
+    source_w, source_h = 0, 0
+    candidates: list[Candidate] = []
+    packets: list[dict[str, Any]] = []
+    anchor_rows: dict[int, dict[str, Any]] = {}
+    last_by_type: dict[ViolationType, Candidate] = {}
+    # Closed runs waiting for the ring to cover their end_s padding, in closing order.
+    pending: deque[tuple[ViolationType, int, int, float, float]] = deque()
+    last_flush = time.perf_counter()
+    flushed_count = 0
+    cid = 1
+    suppressed = 0
+    sample_idx = 0
+    last_frame_idx = -1
+    decode_s = 0.0
+
+    def flush() -> None:
+        nonlocal last_flush, flushed_count
+        write_json(run_dir / "candidates.json", {"run_id": run_id, "candidates": [c.model_dump() for c in candidates]})
+        write_json(run_dir / "packets.json", {"run_id": run_id, "packets": packets})
+        last_flush = time.perf_counter()
+        flushed_count = len(packets)
+
+    def emit(event_type: ViolationType, start_i: int, end_i: int, start_ts: float, end_ts: float) -> None:
+        nonlocal cid, suppressed
+        assert extractor is not None
+        detector = detectors[event_type]
+        snap = extractor.feature_snapshots.get((start_i + end_i) // 2, {})
+        candidate, packet = _make_packet(
+            run_id,
+            cid,
+            event_type,
+            max(0.0, start_ts - 1.0),
+            end_ts + 1.0,
+            [],
+            snap,
+            list(detector.reason_codes),
+            detector.score_hint,
+            window_tracks(extractor.track_rows, start_i, end_i, detector.lane_tracks),
+        )
+        previous = last_by_type.get(event_type)
+        if previous is not None and _overlaps(previous, candidate):
+            suppressed += 1
+            return
+        cid += 1
+
+        # Anchors come from the ring; a run longer than the ring keeps only its buffered tail.
+        window = ring.window(start_i, end_i)
+        picks = window if len(window) <= 3 else [window[0], window[len(window) // 2], window[-1]]
+        anchors: list[dict[str, Any]] = []
+        for s_idx, f_idx, ts, frame in picks:
+            frame_path = run_dir / "frames" / frame_name(s_idx)
+            if s_idx not in anchor_rows:
+                frame_path.parent.mkdir(parents=True, exist_ok=True)
+                cv2.imwrite(str(frame_path), frame)
+                anchor_rows[s_idx] = frame_record(f_idx, s_idx, source_fps, frame_path, frame.shape)
+            anchors.append({"frame_idx": f_idx, "ts_sec": ts, "path": f"frames/{frame_name(s_idx)}"})
+        candidate.anchor_frames = anchors
+        packet["anchor_frames"] = anchors
+        packet["candidate_rank"] = len(packets) + 1
+        candidates.append(candidate)
+        packets.append(packet)
+        last_by_type[event_type] = candidate
+
+        clip_items = [item for item in ring.window(0, sample_idx) if candidate.start_s <= item[2] <= candidate.end_s]
+        clip_offset = clip_items[0][2] if clip_items else 0.0
+        # The clip plays at the real sampling rate so clip time + offset maps back to source time.
+        clip_path = write_clip([item[3] for item in clip_items], run_dir / "clips" / f"{candidate.packet_id}.mp4", source_fps / sample_every)
+        if on_packet:
+            on_packet(candidate, packet, clip_path, clip_offset)
+        logger.log(
+            stage,
+            "INFO",
+            "packet_emitted",
+            "Live packet emitted",
+            packet_id=candidate.packet_id,
+            event_type=event_type.value,
+            start_s=candidate.start_s,
+            end_s=candidate.end_s,
+            stream_ts_sec=round(last_frame_idx / source_fps, 3),
+        )
+
+    frames = iter_live_frames(
+        source,
+        sample_every,
+        float(perf_config["live_idle_timeout_sec"]),
+        float(perf_config["live_poll_sec"]),
+        bool(perf_config["live_realtime_replay"]),
+        stop_event,
+    )
+    while True:
+        t_decode = time.perf_counter()
+        item = next(frames, None)
+        decode_s += time.perf_counter() - t_decode
+        if item is None:
+            break
+        frame_idx, frame = item
+        last_frame_idx = frame_idx
+        ts_sec = round(frame_idx / source_fps, 3)
+        if extractor is None:
+            source_h, source_w = frame.shape[:2]
+            work_w, work_h, scale = _working_size(source_w, source_h, perf_config)
+            rois, roi_masks = resolve_rois(roi_cfg, work_w, work_h, int(cfg["flow_roi_pad_px"]), roi_cache)
+            extractor = _FrameFeatureExtractor(roi_cfg, cfg, work_w, work_h, cascade_settings(perf_config), rois)
+        if scale != 1.0:
+            frame = cv2.resize(frame, (work_w, work_h), interpolation=cv2.INTER_AREA)
+        extractor.process(sample_idx, frame)
+        ring.push(sample_idx, frame_idx, ts_sec, frame)
+
+        for event_type, hits in extractor.hits.items():
+            closed = closers[event_type].update(sample_idx, bool(hits) and hits[-1] == sample_idx, ts_sec)
+            if closed:
+                pending.append((event_type, *closed))
+        # Candidates end 1 s after their run; emit once that tail is in the ring so the clip includes it.
+        while pending and pending[0][4] + 1.0 <= ts_sec:
+            emit(*pending.popleft())
+        if len(packets) > flushed_count and time.perf_counter() - last_flush >= flush_sec:
+            flush()
+
+        # Hits are consumed frame by frame; keep only snapshots still inside the ring.
+        _clear_hits(extractor)
+        extractor.feature_snapshots.pop(sample_idx - ring_capacity, None)
+        extractor.feature_rows.pop(sample_idx - ring_capacity, None)
+        extractor.track_rows.pop(sample_idx - ring_capacity, None)
+        sample_idx += 1
+
+    if extractor is not None:
+        for event_type, closer in closers.items():
+            closed = closer.flush()
+            if closed:
+                pending.append((event_type, *closed))
+    # The stream has ended: the remaining tails are as long as they will get.
+    while pending:
+        emit(*pending.popleft())
+    if packets:
+        flush()
+
+    frame_count = last_frame_idx + 1
+    plan = {
+        "source_width": source_w,
+        "source_height": source_h,
+        "source_fps": source_fps,
+        "frame_count": frame_count,
+        "duration_sec": frame_count / source_fps,
+        "analysis_fps": analysis_fps,
+        "sample_every": sample_every,
+    }
+    rows = [anchor_rows[k] for k in sorted(anchor_rows)]
+    manifest = write_manifest(run_dir, build_manifest(source, plan, rows, frame_storage="anchors_only", ingest_mode="live"))
+    if not packets:
+        _write_empty_proposals(run_id, run_dir)
+        write_json(run_dir / "packets.json", {"run_id": run_id, "packets": []})
+
+    ingest_ms = int(decode_s * 1000)
+    total_ms = int((time.perf_counter() - started) * 1000)
+    proposals_ms = max(0, total_ms - ingest_ms)
+    logger.log(
+        "INGEST",
+        "INFO",
+        "stage_completed",
+        "Live ingest complete",
+        duration_ms=ingest_ms,
+        frame_count=frame_count,
+        sample_count=sample_idx,
+        ring_capacity=ring_capacity,
+        ingest_mode="live",
+    )
+    logger.log(
+        stage,
+        "INFO",
+        "stage_completed",
+        "Live local proposals completed",
+        duration_ms=proposals_ms,
+        candidate_count=len(candidates),
+        suppressed_overlaps=suppressed,
+        frame_scale=round(scale, 3),
+        ingest_mode="live",
+        roi_masks=roi_masks,
+        **(extractor.cascade_stats() if extractor is not None else {}),
+        **(extractor.tracking_stats() if extractor is not None else {}),
+        **(extractor.ego_motion_stats() if extractor is not None else {}),
+    )
+    if not candidates:
+        logger.log(stage, "WARNING", "candidate_empty_warning", "No candidates generated", error_code="CANDIDATE_EMPTY_WARNING")
+    payload = {"run_id": run_id, "candidates": [c.model_dump() for c in candidates]}
+    return manifest, payload, {"INGEST": ingest_ms, "LOCAL_PROPOSALS": proposals_ms}
@@ -0,0 +1,126 @@
+"""Rebuild ``candidates.json``/``packets.json`` from stored features under new thresholds.
+
+Only ``features.npz`` and the frames manifest are read; no frame is decoded.
+Runs whose manifest has ``frame_storage: "anchors_only"`` (streaming ingest) get
+the few newly referenced anchor frames extracted from the source video. Only
+the settings in :func:`tunable_settings` can be overridden: detector thresholds,
+``k_*`` run lengths and candidate limits. Anything else (sampling, flow,
+tracking) changed how the stored features were computed.
+
+Usage: python -m backend.local_engine.rethreshold RUN_DIR [--set red_threshold=1.2 --set k_wrong=4]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+from backend.local_engine.detectors import enabled_detectors, registered_detectors
+from backend.local_engine.feature_store import StoredFeatures, load_features
+from backend.local_engine.proposal_engine import _anchor_samples, _build_proposals, _load_config
+from backend.logging_utils.json_logger import RunLogger
+from backend.utils.io import read_json
+from backend.video.frames import materialize_samples
+from backend.video.manifest import load_manifest
+
+
+# Candidate limits applied after run grouping.
+_LIMIT_SETTINGS: dict[str, type] = {
+    "max_candidates_total": int,
+    "max_candidates_per_type": int,
+    "min_same_type_gap_seconds": float,
+}
+
+
+def tunable_settings() -> dict[str, type]:
+    """``proposal_config`` keys an override may set, with their value types."""
+    keys = dict(_LIMIT_SETTINGS)
+    for detector in registered_detectors():
+        keys.update(dict.fromkeys(detector.config_keys, float))
+        if detector.k_key:
+            keys[detector.k_key] = int
+    return keys
+
+
+def _validate_overrides(overrides: dict[str, Any]) -> dict[str, Any]:
+    tunable = tunable_settings()
+    unknown = sorted(set(overrides) - set(tunable))
+    if unknown:
+        raise ValueError(
+            f"Cannot rethreshold {', '.join(unknown)}; allowed settings: {', '.join(sorted(tunable))}"
+        )
+    return {key: tunable[key](value) for key, value in overrides.items()}
+
+
+def rethreshold_proposals(
+    run_id: str,
+    run_dir: Path,
+    proposal_config_path: Path,
+    overrides: dict[str, Any],
+    logger: Optional[RunLogger] = None,
+) -> dict[str, Any]:
+    started = time.perf_counter()
+    manifest = load_manifest(run_dir)
+    features = load_features(run_dir)
+    if manifest is None or features is None:
+        raise FileNotFoundError(f"No stored features in {run_dir}")
+
+    overrides = _validate_overrides(overrides)
+    cfg = _load_config(proposal_config_path)
+    cfg.update(overrides)
+
+    # Same detector selection as the original pass; disabled features are NaN and never hit anyway.
+    roi_path = run_dir / "config" / "roi_config.json"
+    detectors = enabled_detectors(read_json(roi_path)) if roi_path.exists() else registered_detectors()
+    pruned, packets = _build_proposals(run_id, run_dir, manifest, StoredFeatures(features, cfg, detectors), cfg, detectors)
+    anchors_written = 0
+    if manifest.get("frame_storage") == "anchors_only":
+        anchors_written = materialize_samples(manifest, _anchor_samples(manifest, packets))
+
+    elapsed = int((time.perf_counter() - started) * 1000)
+    if logger is not None:
+        logger.log(
+            "LOCAL_PROPOSALS",
+            "INFO",
+            "rethreshold_completed",
+            "Proposals rebuilt from stored features",
+            duration_ms=elapsed,
+            candidate_count=len(pruned),
+            overrides=overrides,
+            anchors_written=anchors_written,
+        )
+    return {"run_id": run_id, "candidates": [c.model_dump(mode="json") for c in pruned], "duration_ms": elapsed}
+
+
+def _parse_override(item: str) -> tuple[str, Any]:
+    key, sep, value = item.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got {item!r}")
+    key = key.strip()
+    try:
+        return key, _validate_overrides({key: float(value)})[key]
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("run_dir", type=Path)
+    parser.add_argument("--set", dest="overrides", action="append", type=_parse_override, default=[], metavar="KEY=VALUE")
+    parser.add_argument("--proposal-config", type=Path, default=Path("backend/config/proposal_config.json"))
+    args = parser.parse_args(argv)
+
+    logger = RunLogger(args.run_dir.name, args.run_dir / "pipeline.log.jsonl")
+    try:
+        payload = rethreshold_proposals(args.run_dir.name, args.run_dir, args.proposal_config, dict(args.overrides), logger)
+    except (FileNotFoundError, ValueError) as exc:
+        parser.error(str(exc))
+    print(f"{len(payload['candidates'])} candidates in {payload['duration_ms']} ms")
+    for cand in payload["candidates"]:
+        print(f"  {cand['candidate_id']} {cand['event_type']} {cand['start_s']:.3f}-{cand['end_s']:.3f} score={cand['score']}")
+
+
+if __name__ == "__main__":
+    main()
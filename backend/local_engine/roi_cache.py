@@ -0,0 +1,118 @@
+"""Compiled ROI masks shared by runs from the same camera.
+
+Rasterising the ROI polygons into cropped masks depends only on the polygons,
+the wrong-side flow pad and the working resolution. Compiled masks are kept in
+a small in-process LRU and on disk under ``CACHE_DIR/roi_masks/<key>.npz``, so
+a fixed camera's masks are built once per working resolution.
+"""
+from __future__ import annotations
+
+import os
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any
+from typing import Optional
+
+import numpy as np
+
+from backend.local_engine.geometry import RoiStats
+from backend.utils.hashing import payload_sha256
+
+
+ROI_POLYGON_KEYS = ("signal_roi_polygon", "wrong_side_lane_polygon", "stop_line_polygon")
+_MEMORY_ENTRIES = 64
+_MEMORY: "OrderedDict[str, CompiledRois]" = OrderedDict()
+_LOCK = Lock()
+
+
+@dataclass(frozen=True)
+class CompiledRois:
+    signal: RoiStats
+    wrong: RoiStats  # padded by flow_roi_pad_px
+    stop: RoiStats
+
+
+def roi_key(roi_cfg: dict[str, Any], work_w: int, work_h: int, flow_pad: int) -> str:
+    polygons = {key: roi_cfg.get(key, []) for key in ROI_POLYGON_KEYS}
+    return payload_sha256({"polygons": polygons, "work_size": [work_w, work_h], "flow_pad": flow_pad})
+
+
+def compile_rois(roi_cfg: dict[str, Any], work_w: int, work_h: int, flow_pad: int) -> CompiledRois:
+    return CompiledRois(
+        signal=RoiStats.from_polygon(roi_cfg.get("signal_roi_polygon", []), work_w, work_h),
+        wrong=RoiStats.from_polygon(roi_cfg.get("wrong_side_lane_polygon", []), work_w, work_h, flow_pad),
+        stop=RoiStats.from_polygon(roi_cfg.get("stop_line_polygon", []), work_w, work_h),
+    )
+
+
+def _save(path: Path, rois: CompiledRois) -> None:
+    arrays: dict[str, np.ndarray] = {}
+    for name in ("signal", "wrong", "stop"):
+        roi = getattr(rois, name)
+        if roi.rect is not None:
+            arrays[f"{name}_rect"] = np.array(roi.rect, dtype=np.int32)
+            arrays[f"{name}_mask"] = roi.crop_mask
+    # Write next to the target and rename so concurrent runs never read a partial file.
+    tmp = path.with_name(f".tmp_{path.stem}_{uuid.uuid4().hex[:8]}.npz")
+    with tmp.open("wb") as fh:
+        np.savez(fh, **arrays)
+    os.replace(tmp, path)
+
+
+def _load(path: Path) -> Optional[CompiledRois]:
+    if not path.exists():
+        return None
+    try:
+        with np.load(path) as data:
+            rois = {}
+            for name in ("signal", "wrong", "stop"):
+                if f"{name}_rect" in data.files:
+                    rect = tuple(int(v) for v in data[f"{name}_rect"])
+                    rois[name] = RoiStats.from_crop(rect, data[f"{name}_mask"])
+                else:
+                    rois[name] = RoiStats.from_crop(None, None)
+    except Exception:
+        # Corrupt entry: recompile and overwrite it.
+        return None
+    return CompiledRois(**rois)
+
+
+class RoiMaskCache:
+    """Memory + disk cache of :class:`CompiledRois` keyed by :func:`roi_key`."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def get(self, roi_cfg: dict[str, Any], work_w: int, work_h: int, flow_pad: int) -> tuple[CompiledRois, str]:
+        """Return ``(rois, source)`` where source is ``memory``, ``disk`` or ``compiled``."""
+        key = roi_key(roi_cfg, work_w, work_h, flow_pad)
+        with _LOCK:
+            rois = _MEMORY.get(key)
+            if rois is not None:
+                _MEMORY.move_to_end(key)
+                return rois, "memory"
+
+        path = self.root / f"{key}.npz"
+        source = "disk"
+        rois = _load(path)
+        if rois is None:
+            rois = compile_rois(roi_cfg, work_w, work_h, flow_pad)
+            _save(path, rois)
+            source = "compiled"
+        with _LOCK:
+            _MEMORY[key] = rois
+            while len(_MEMORY) > _MEMORY_ENTRIES:
+                _MEMORY.popitem(last=False)
+        return rois, source
+
+
+def resolve_rois(
+    roi_cfg: dict[str, Any], work_w: int, work_h: int, flow_pad: int, cache: Optional[RoiMaskCache]
+) -> tuple[CompiledRois, str]:
+    if cache is None:
+        return compile_rois(roi_cfg, work_w, work_h, flow_pad), "compiled"
+    return cache.get(roi_cfg, work_w, work_h, flow_pad)
@@ -0,0 +1,156 @@
+"""Lightweight CPU tracker over MOG2 foreground blobs.
+
+Blobs are the connected components of the opened foreground mask. Each frame
+they are matched greedily to live tracks by IoU, then by centroid distance for
+blobs that moved further than their own size; unmatched blobs start new tracks
+and tracks unseen for ``track_max_missed`` frames end. The proposal engine
+uses the track ids to tell whether candidates of different types are the same
+vehicle (see ``_merge_same_track``).
+"""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from backend.local_engine.feature_store import TrackRow
+from backend.local_engine.geometry import RoiStats
+
+
+# Largest blobs kept per frame; the rest are clutter for proposal purposes.
+TRACK_MAX_BLOBS = 32
+_OPEN_KERNEL = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+
+
+def _iou(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    x0 = np.maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+    y0 = np.maximum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+    x1 = np.minimum(boxes_a[:, None, 2], boxes_b[None, :, 2])
+    y1 = np.minimum(boxes_a[:, None, 3], boxes_b[None, :, 3])
+    inter = np.clip(x1 - x0, 0, None) * np.clip(y1 - y0, 0, None)
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1.0)
+
+
+class BlobTracker:
+    def __init__(self, min_area_px: int, iou_threshold: float, max_missed: int, lane: Optional[RoiStats] = None) -> None:
+        self.min_area_px = min_area_px
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.lane = lane if lane is not None and not lane.empty else None
+        self.next_id = 1
+        self.ids: list[int] = []
+        self.boxes = np.zeros((0, 4), dtype=np.float64)
+        self.missed: list[int] = []
+
+    def blobs(self, fg: np.ndarray) -> np.ndarray:
+        """``(n, 4)`` x0, y0, x1, y1 boxes of the largest foreground components."""
+        mask = cv2.morphologyEx(fg, cv2.MORPH_OPEN, _OPEN_KERNEL)
+        count, _labels, stats, _centroids = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        stats = stats[1:count]
+        stats = stats[stats[:, cv2.CC_STAT_AREA] >= self.min_area_px]
+        if len(stats) > TRACK_MAX_BLOBS:
+            stats = stats[np.argsort(-stats[:, cv2.CC_STAT_AREA])[:TRACK_MAX_BLOBS]]
+        x, y = stats[:, cv2.CC_STAT_LEFT], stats[:, cv2.CC_STAT_TOP]
+        return np.stack([x, y, x + stats[:, cv2.CC_STAT_WIDTH], y + stats[:, cv2.CC_STAT_HEIGHT]], axis=1).astype(np.float64)
+
+    def _in_lane(self, box: np.ndarray) -> int:
+        if self.lane is None:
+            return 0
+        rx0, ry0, rx1, ry1 = self.lane.rect
+        x0, y0 = max(int(box[0]), rx0) - rx0, max(int(box[1]), ry0) - ry0
+        x1, y1 = min(int(box[2]), rx1) - rx0, min(int(box[3]), ry1) - ry0
+        if x1 <= x0 or y1 <= y0:
+            return 0
+        return int(cv2.countNonZero(self.lane.crop_mask[y0:y1, x0:x1]) > 0)
+
+    def _match(self, blobs: np.ndarray) -> dict[int, int]:
+        """Blob index -> track index."""
+        matches: dict[int, int] = {}
+        if not len(self.ids) or not len(blobs):
+            return matches
+        iou = _iou(self.boxes, blobs)
+        for t, b in sorted(zip(*np.nonzero(iou >= self.iou_threshold)), key=lambda tb: -iou[tb]):
+            if b not in matches and t not in matches.values():
+                matches[int(b)] = int(t)
+        # Fast movers no longer overlap their last box: fall back to centroid distance within the track's size.
+        track_c = (self.boxes[:, :2] + self.boxes[:, 2:]) / 2.0
+        blob_c = (blobs[:, :2] + blobs[:, 2:]) / 2.0
+        dist = np.linalg.norm(track_c[:, None, :] - blob_c[None, :, :], axis=2)
+        reach = np.max(self.boxes[:, 2:] - self.boxes[:, :2], axis=1)
+        for t, b in sorted(zip(*np.nonzero(dist <= reach[:, None])), key=lambda tb: dist[tb]):
+            if b not in matches and t not in matches.values():
+                matches[int(b)] = int(t)
+        return matches
+
+    def update(self, fg: Optional[np.ndarray]) -> list[TrackRow]:
+        """Advance one sample. ``fg=None`` (no foreground mask this frame) only ages the tracks."""
+        blobs = self.blobs(fg) if fg is not None else np.zeros((0, 4), dtype=np.float64)
+        matches = self._match(blobs)
+        matched_tracks = set(matches.values())
+        ids, boxes, missed = [], [], []
+        for t, track_id in enumerate(self.ids):
+            if t not in matched_tracks and self.missed[t] + 1 <= self.max_missed:
+                ids.append(track_id)
+                boxes.append(self.boxes[t])
+                missed.append(self.missed[t] + 1)
+        rows: list[TrackRow] = []
+        for b, box in enumerate(blobs):
+            t = matches.get(b)
+            if t is None:
+                track_id = self.next_id
+                self.next_id += 1
+            else:
+                track_id = self.ids[t]
+            ids.append(track_id)
+            boxes.append(box)
+            missed.append(0)
+            rows.append((track_id, int(box[0]), int(box[1]), int(box[2]), int(box[3]), self._in_lane(box)))
+        self.ids, self.missed = ids, missed
+        self.boxes = np.array(boxes, dtype=np.float64).reshape(-1, 4)
+        return rows
+
+
+def window_tracks(
+    track_rows: dict[int, list[TrackRow]], start_i: int, end_i: int, lane_only: bool = False, limit: int = 3
+) -> list[int]:
+    """Tracks seen in at least half of the samples ``[start_i, end_i]``, most frequent first."""
+    counts: Counter[int] = Counter()
+    for i in range(start_i, end_i + 1):
+        seen = {row[0] for row in track_rows.get(i, ()) if row[5] or not lane_only}
+        counts.update(seen)
+    needed = max(1, (end_i - start_i + 1) // 2)
+    return [track_id for track_id, n in counts.most_common() if n >= needed][:limit]
+
+
+def stitch_track_ids(
+    ref_rows: dict[int, list[TrackRow]], rows: dict[int, list[TrackRow]], iou_threshold: float
+) -> dict[int, int]:
+    """Map track ids of ``rows`` to the ids of the same blobs in ``ref_rows``.
+
+    Both hold rows for the same samples from two tracker instances (a shard's
+    warm-up and the previous shard's tail). Boxes are paired greedily by IoU
+    per sample; each id takes the partner it was paired with most often, one to
+    one. Ids never paired are left out.
+    """
+    votes: Counter[tuple[int, int]] = Counter()
+    for i, own in rows.items():
+        ref = ref_rows.get(i)
+        if not own or not ref:
+            continue
+        iou = _iou(np.array([row[1:5] for row in own], dtype=np.float64), np.array([row[1:5] for row in ref], dtype=np.float64))
+        paired_own: set[int] = set()
+        paired_ref: set[int] = set()
+        for a, b in sorted(zip(*np.nonzero(iou >= iou_threshold)), key=lambda ab: -iou[ab]):
+            if a not in paired_own and b not in paired_ref:
+                paired_own.add(a)
+                paired_ref.add(b)
+                votes[(own[a][0], ref[b][0])] += 1
+    mapping: dict[int, int] = {}
+    for (own_id, ref_id), _n in votes.most_common():
+        if own_id not in mapping and ref_id not in mapping.values():
+            mapping[own_id] = ref_id
+    return mapping
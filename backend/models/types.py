@@ -41,6 +41,8 @@ class Candidate(BaseModel):
     score: float = Field(ge=0, le=1)
     anchor_frames: list[dict[str, Any]] = Field(default_factory=list)
     track_ids: list[int] = Field(default_factory=list)
+    # event_type first, then the types of same-track candidates merged into this packet.
+    proposed_types: list[ViolationType] = Field(default_factory=list)
     reason_codes: list[str] = Field(default_factory=list)
     feature_snapshot: dict[str, float] = Field(default_factory=dict)
 
@@ -91,6 +93,23 @@ class ReviewDecision(BaseModel):
     include_plate: bool = False
 
 
+class RethresholdRequest(BaseModel):
+    # proposal_config.json keys to override, e.g. {"red_threshold": 1.2, "k_wrong": 4}
+    overrides: dict[str, float] = Field(default_factory=dict)
+
+
+class CameraProfile(BaseModel):
+    # ROI config of a fixed camera; runs can reference it by camera_id instead of sending roi_config_json.
+    camera_id: str
+    name: Optional[str] = None
+    signal_roi_polygon: list[list[float]] = Field(default_factory=list)
+    wrong_side_lane_polygon: list[list[float]] = Field(default_factory=list)
+    stop_line_polygon: list[list[float]] = Field(default_factory=list)
+    expected_direction_vector: list[float] = Field(default_factory=lambda: [1.0, 0.0])
+    enabled_detectors: Optional[list[ViolationType]] = None
+    disabled_detectors: list[ViolationType] = Field(default_factory=list)
+
+
 class RunStatus(BaseModel):
     run_id: str
     state: RunState
@@ -108,3 +127,6 @@ class RunRecord(BaseModel):
     video_path: str
     roi_config_path: str
     status: RunStatus
+    # "upload" for finished clips; "live" follows a growing file or stream URL in video_path.
+    source_type: str = "upload"
+    camera_id: Optional[str] = None
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from threading import Lock
+from typing import Any
+from typing import Optional
+
+from backend.models.types import CameraProfile
+from backend.utils.io import write_json
+
+
+_CAMERA_ID = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$")
+
+
+def camera_roi_config(profile: CameraProfile) -> dict[str, Any]:
+    """ROI config (as written to a run's ``config/roi_config.json``) for a camera profile."""
+    return profile.model_dump(mode="json", exclude={"camera_id", "name"}, exclude_none=True)
+
+
+class CameraProfileStore:
+    """Named camera profiles, one ``<camera_id>.json`` per camera under ``root``."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = Lock()
+
+    def _path(self, camera_id: str) -> Path:
+        if not _CAMERA_ID.match(camera_id):
+            raise ValueError(f"Invalid camera_id {camera_id!r}")
+        return self.root / f"{camera_id}.json"
+
+    def get(self, camera_id: str) -> Optional[CameraProfile]:
+        path = self._path(camera_id)
+        with self._lock:
+            if not path.exists():
+                return None
+            return CameraProfile.model_validate_json(path.read_text(encoding="utf-8"))
+
+    def put(self, profile: CameraProfile) -> CameraProfile:
+        path = self._path(profile.camera_id)
+        with self._lock:
+            write_json(path, profile.model_dump(mode="json"))
+        return profile
+
+    def all(self) -> list[CameraProfile]:
+        profiles: list[CameraProfile] = []
+        with self._lock:
+            for path in sorted(self.root.glob("*.json")):
+                try:
+                    profiles.append(CameraProfile.model_validate_json(path.read_text(encoding="utf-8")))
+                except Exception:
+                    # Skip hand-edited profiles that no longer validate.
+                    continue
+        return profiles
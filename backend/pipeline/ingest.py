@@ -1,12 +1,121 @@
 from __future__ import annotations
 
+import multiprocessing
+import shutil
 import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Any
+from typing import Optional
 
 import cv2
+import numpy as np
 
+from backend.local_engine.geometry import working_size
 from backend.logging_utils.json_logger import RunLogger
-from backend.utils.io import write_json
+from backend.pipeline.ingest_cache import IngestCache
+from backend.utils.hashing import file_sha256
+from backend.video.frame_store import RAW_FRAMES_FILE, merge_writer_stats, open_frame_writer, raw_store_spec
+from backend.video.frames import build_manifest, frame_record, open_video, sampling_plan
+from backend.video.manifest import MANIFEST_VERSION, FrameManifest, write_manifest
+from backend.video.sampling import adaptive_grid, adaptive_lead_frames, iter_adaptive_frames, iter_sampled_frames, resolve_strategy, sample_rates
+
+
+def _frames_bytes(run_dir: Path, manifest: FrameManifest, frame_store_backend: str) -> int:
+    if frame_store_backend == "memmap":
+        raw_path = run_dir / RAW_FRAMES_FILE
+        return raw_path.stat().st_size if raw_path.exists() else 0
+    paths = [Path(manifest.path(i)) for i in range(len(manifest))]
+    return sum(p.stat().st_size for p in paths if p.exists())
+
+
+def segment_bounds(frame_count: int, sample_every: int, workers: int) -> list[tuple[int, Optional[int]]]:
+    """Split ``[0, frame_count)`` into sample-grid aligned segments, one per worker.
+
+    The last segment is open ended because container frame counts are estimates.
+    """
+    samples = max(1, (frame_count + sample_every - 1) // sample_every)
+    count = max(1, min(workers, samples))
+    per_segment = (samples + count - 1) // count
+    starts = [k * per_segment * sample_every for k in range(count) if k * per_segment < samples]
+    ends: list[Optional[int]] = [*starts[1:], None]
+    return list(zip(starts, ends))
+
+
+def _decode_segment(
+    video_path: str,
+    run_dir: str,
+    start_frame: int,
+    end_frame: Optional[int],
+    sample_every: int,
+    strategy: str,
+    store_backend: str,
+    frame_shape: Optional[tuple[int, int, int]],
+    adaptive: Optional[dict[str, Any]] = None,
+    encode_workers: int = 0,
+    encode_queue: int = 16,
+) -> tuple[list[tuple[int, int, str, int, int]], dict[str, Any]]:
+    cap = open_video(Path(video_path))
+    writer = open_frame_writer(store_backend, Path(run_dir), frame_shape, encode_workers, encode_queue)
+    out: list[tuple[int, int, str, int, int]] = []
+    try:
+        lead = adaptive_lead_frames(adaptive, sample_every, start_frame) if adaptive else 0
+        sampled = iter_sampled_frames(cap, sample_every, strategy, start_frame - lead, end_frame)
+        if adaptive:
+            # sample_every is the fine grid here; keep motion bursts plus a static floor.
+            sampled = iter_adaptive_frames(sampled, adaptive["floor_every"], adaptive["motion_threshold"], adaptive["hold_frames"])
+        for frame_idx, frame in sampled:
+            if frame_idx < start_frame:
+                # Lead-in frames only restore the adaptive state; the previous segment owns them.
+                continue
+            # Slot by global grid position so segments never collide.
+            slot = frame_idx // sample_every
+            frame_path = writer.write(slot, frame)
+            height, width = frame_shape[:2] if frame_shape else frame.shape[:2]
+            out.append((frame_idx, slot, frame_path, int(height), int(width)))
+    finally:
+        # Drains the encoder queue, so every returned path exists once this returns.
+        writer.close()
+        cap.release()
+    return out, writer.stats()
+
+
+def _decode_parallel(
+    video_path: Path,
+    run_dir: Path,
+    bounds: list[tuple[int, Optional[int]]],
+    sample_every: int,
+    strategy: str,
+    store_backend: str,
+    frame_shape: Optional[tuple[int, int, int]],
+    adaptive: Optional[dict[str, Any]],
+    encode_workers: int,
+    encode_queue: int,
+) -> tuple[list[tuple[int, int, str, int, int]], dict[str, Any]]:
+    # spawn, not fork: the pipeline runs on an API worker thread.
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(bounds), mp_context=ctx) as pool:
+        futures = [
+            pool.submit(
+                _decode_segment,
+                str(video_path),
+                str(run_dir),
+                start,
+                end,
+                sample_every,
+                strategy,
+                store_backend,
+                frame_shape,
+                adaptive,
+                encode_workers,
+                encode_queue,
+            )
+            for start, end in bounds
+        ]
+        segments = [f.result() for f in futures]
+    merged = [row for rows, _stats in segments for row in rows]
+    merged.sort(key=lambda row: row[0])
+    return merged, merge_writer_stats([stats for _rows, stats in segments])
 
 
 def ingest_video(
@@ -16,62 +125,120 @@ def ingest_video(
     long_fps: int,
     long_video_threshold_sec: int,
     logger: RunLogger,
-) -> dict:
+    sampling_strategy: str = "auto",
+    seek_min_stride: int = 60,
+    workers: int = 1,
+    frame_store_backend: str = "jpeg",
+    working_long_edge: int = 640,
+    working_res_only: bool = True,
+    cache: Optional[IngestCache] = None,
+    adaptive: Optional[dict[str, float]] = None,
+    encode_workers: int = 0,
+    encode_queue: int = 16,
+) -> FrameManifest:
     stage = "INGEST"
     start = time.perf_counter()
     logger.log(stage, "INFO", "stage_started", "Starting ingest stage")
 
-    cap = cv2.VideoCapture(str(video_path))
-    if not cap.isOpened():
+    try:
+        cap = open_video(video_path)
+    except RuntimeError:
         logger.log(stage, "ERROR", "stage_failed", "Unable to open video", error_code="INGEST_DECODE_ERROR")
-        raise RuntimeError("Failed to open video")
-
-    source_fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
-    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
-    duration = frame_count / source_fps if source_fps > 0 else 0
-    analysis_fps = long_fps if duration > long_video_threshold_sec else short_fps
-    sample_every = max(int(round(source_fps / max(analysis_fps, 1))), 1)
-
-    frames_dir = run_dir / "frames"
-    frames_dir.mkdir(parents=True, exist_ok=True)
-
-    frames = []
-    frame_idx = 0
-    sample_idx = 0
-
-    while True:
-        ok, frame = cap.read()
-        if not ok:
-            break
-        if frame_idx % sample_every == 0:
-            ts_sec = frame_idx / source_fps
-            frame_path = frames_dir / f"f_{sample_idx:05d}.jpg"
-            cv2.imwrite(str(frame_path), frame)
-            frames.append(
-                {
-                    "frame_idx": frame_idx,
-                    "sample_idx": sample_idx,
-                    "ts_sec": round(ts_sec, 3),
-                    "path": str(frame_path),
-                    "height": int(frame.shape[0]),
-                    "width": int(frame.shape[1]),
-                }
-            )
-            sample_idx += 1
-        frame_idx += 1
+        raise
 
+    plan = sampling_plan(cap, short_fps, long_fps, long_video_threshold_sec)
     cap.release()
+    grid = adaptive_grid(plan["source_fps"], adaptive) if adaptive else None
+    grid_every = grid["fine_every"] if grid else plan["sample_every"]
+    strategy = resolve_strategy(sampling_strategy, grid_every, seek_min_stride)
+
+    # Hashing reads the whole file; only the ingest cache needs it here (Gemini hashes lazily otherwise).
+    video_sha256 = None
+    hash_ms = 0
+    cache_key = None
+    if cache is not None:
+        t_hash = time.perf_counter()
+        video_sha256 = file_sha256(video_path)
+        hash_ms = int((time.perf_counter() - t_hash) * 1000)
+        cache_key = IngestCache.key(
+            video_sha256,
+            {
+                "analysis_fps": plan["analysis_fps"],
+                "short_fps": short_fps,
+                "long_fps": long_fps,
+                "long_video_threshold_sec": long_video_threshold_sec,
+                "frame_store_backend": frame_store_backend,
+                "working_long_edge": working_long_edge,
+                "working_res_only": working_res_only,
+                "adaptive": adaptive,
+                "manifest_version": MANIFEST_VERSION,
+            },
+        )
+        cached = cache.restore(cache_key, run_dir, video_path)
+        if cached is not None:
+            elapsed = int((time.perf_counter() - start) * 1000)
+            logger.log(
+                stage,
+                "INFO",
+                "stage_completed",
+                "Ingest restored from cache",
+                duration_ms=elapsed,
+                frame_count=cached["frame_count"],
+                sample_count=cached["sample_count"],
+                ingest_cache="hit",
+                cache_key=cache_key,
+                hash_ms=hash_ms,
+            )
+            return cached
+
+    # Frames may be hardlinks into the ingest cache; never overwrite them in place.
+    shutil.rmtree(run_dir / "frames", ignore_errors=True)
+    (run_dir / RAW_FRAMES_FILE).unlink(missing_ok=True)
+
+    # Analysis only needs working resolution; full-res evidence is extracted later from the source video.
+    frame_shape: Optional[tuple[int, int, int]] = None
+    if frame_store_backend == "memmap" or working_res_only:
+        if plan["source_width"] > 0 and plan["source_height"] > 0:
+            work_w, work_h, _scale = working_size(plan["source_width"], plan["source_height"], working_long_edge)
+            frame_shape = (work_h, work_w, 3)
+        elif frame_store_backend == "memmap":
+            logger.log(stage, "WARNING", "frame_store_fallback", "Unknown frame size; using JPEG frame store")
+            frame_store_backend = "jpeg"
+
+    bounds = segment_bounds(plan["frame_count"], grid_every, workers) if plan["frame_count"] > 0 else [(0, None)]
+    if len(bounds) > 1:
+        decoded, encode_stats = _decode_parallel(
+            video_path, run_dir, bounds, grid_every, strategy, frame_store_backend, frame_shape, grid, encode_workers, encode_queue
+        )
+    else:
+        decoded, writer_stats = _decode_segment(
+            str(video_path), str(run_dir), 0, None, grid_every, strategy, frame_store_backend, frame_shape, grid, encode_workers, encode_queue
+        )
+        encode_stats = merge_writer_stats([writer_stats])
+
+    frames = [
+        frame_record(
+            frame_idx,
+            sample_idx,
+            plan["source_fps"],
+            Path(frame_path),
+            (height, width),
+            slot=slot if frame_store_backend == "memmap" else None,
+        )
+        for sample_idx, (frame_idx, slot, frame_path, height, width) in enumerate(decoded)
+    ]
 
-    manifest = {
-        "video_path": str(video_path),
-        "source_fps": source_fps,
-        "analysis_fps": analysis_fps,
-        "duration_sec": round(duration, 3),
-        "frame_count": frame_count,
-        "sample_count": len(frames),
-        "frames": frames,
-    }
-    write_json(run_dir / "frames_manifest.json", manifest)
+    extra: dict[str, Any] = {}
+    if grid:
+        # Density is derived after the merge so segment boundaries do not matter.
+        rates = sample_rates([f["frame_idx"] for f in frames], plan["source_fps"], plan["analysis_fps"])
+        for frame, rate in zip(frames, rates):
+            frame["sample_fps"] = rate
+        extra["sampling"] = {"mode": "adaptive", **adaptive, **grid}
+    if frame_store_backend == "memmap":
+        extra["frame_store"] = raw_store_spec(frame_shape, max((f["slot"] for f in frames), default=-1) + 1)
+    manifest = write_manifest(run_dir, build_manifest(video_path, plan, frames, video_sha256=video_sha256, **extra))
+    cached_bytes = cache.store(cache_key, run_dir, manifest) if cache is not None and cache_key and frames else 0
 
     elapsed = int((time.perf_counter() - start) * 1000)
     logger.log(
@@ -80,7 +247,20 @@ def ingest_video(
         "stage_completed",
         "Ingest complete",
         duration_ms=elapsed,
-        frame_count=frame_count,
+        frame_count=plan["frame_count"],
         sample_count=len(frames),
+        sampling_strategy=strategy,
+        sample_every=plan["sample_every"],
+        sampling_mode="adaptive" if grid else "fixed",
+        segments=len(bounds),
+        frame_store=frame_store_backend,
+        frame_width=frame_shape[1] if frame_shape else plan["source_width"],
+        frame_height=frame_shape[0] if frame_shape else plan["source_height"],
+        frames_bytes=_frames_bytes(run_dir, manifest, frame_store_backend),
+        ingest_cache="miss" if cache is not None else "disabled",
+        cache_bytes=cached_bytes,
+        hash_ms=hash_ms,
+        encode_workers=encode_workers if frame_store_backend == "jpeg" else 0,
+        **encode_stats,
     )
     return manifest
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from threading import Lock
+from typing import Any
+from typing import Optional
+
+from backend.utils.hashing import payload_sha256
+from backend.utils.io import read_json, write_json
+from backend.video.manifest import MANIFEST_FILE, FrameManifest, load_manifest
+
+
+_LOCK = Lock()
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if dst.exists():
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Different filesystem (or no hardlink support): fall back to a real copy.
+        shutil.copy2(src, dst)
+
+
+def _tree_bytes(root: Path) -> int:
+    return sum(p.stat().st_size for p in root.rglob("*") if p.is_file())
+
+
+class IngestCache:
+    """Content-addressed store of ingest artifacts (manifest, frame index and frames).
+
+    Entries live under ``root/<key>/`` and are shared with runs through
+    hardlinks. ``entry.json`` tracks size and last use for LRU eviction once
+    the cache grows past ``max_bytes``.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(video_sha256: str, params: dict[str, Any]) -> str:
+        return payload_sha256({"video_sha256": video_sha256, "params": params})
+
+    def restore(self, key: str, run_dir: Path, video_path: Path) -> Optional[FrameManifest]:
+        entry_dir = self.root / key
+        with _LOCK:
+            if not (entry_dir / "entry.json").exists() or not (entry_dir / MANIFEST_FILE).exists():
+                return None
+            entry = read_json(entry_dir / "entry.json")
+            manifest = load_manifest(entry_dir)
+            for rel in entry["files"]:
+                _link_or_copy(entry_dir / rel, run_dir / rel)
+            entry["last_used"] = time.time()
+            entry["hits"] = int(entry.get("hits", 0)) + 1
+            write_json(entry_dir / "entry.json", entry)
+
+        # Frame paths are template-relative, so only the header needs rebasing.
+        manifest.run_dir = run_dir
+        manifest.header["video_path"] = str(video_path)
+        manifest.save()
+        return manifest
+
+    def store(self, key: str, run_dir: Path, manifest: FrameManifest) -> int:
+        files: list[str] = []
+        frame_store = manifest.get("frame_store") or {}
+        if frame_store.get("backend") == "memmap":
+            files.append(str(frame_store["path"]))
+        else:
+            files.extend(manifest.rel_path(i) for i in range(len(manifest)))
+
+        # Build in a scratch dir and rename so readers never see a partial entry.
+        staging = self.root / f".tmp_{key}_{uuid.uuid4().hex[:8]}"
+        for rel in files:
+            _link_or_copy(run_dir / rel, staging / rel)
+        manifest.save(staging)
+        size = _tree_bytes(staging)
+        now = time.time()
+        write_json(staging / "entry.json", {"key": key, "files": files, "bytes": size, "created_at": now, "last_used": now, "hits": 0})
+
+        with _LOCK:
+            entry_dir = self.root / key
+            if entry_dir.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+            else:
+                staging.rename(entry_dir)
+            self._evict_locked()
+        return size
+
+    def _evict_locked(self) -> list[str]:
+        entries: list[tuple[float, int, Path]] = []
+        for entry_file in self.root.glob("*/entry.json"):
+            try:
+                entry = read_json(entry_file)
+            except Exception:
+                continue
+            entries.append((float(entry.get("last_used", 0.0)), int(entry.get("bytes", 0)), entry_file.parent))
+        total = sum(size for _used, size, _path in entries)
+        evicted: list[str] = []
+        for _used, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            evicted.append(path.name)
+        return evicted
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 from typing import Optional
@@ -9,10 +11,12 @@ from backend.config.perf import load_perf_config
 from backend.config.settings import Settings
 from backend.export.exporter import export_case_pack
 from backend.gemini.client import GeminiClient
+from backend.gemini.response_cache import GeminiResponseCache
+from backend.gemini.upload_registry import UploadRegistry
 from backend.logging_utils.json_logger import RunLogger
 from backend.models.types import RunState, RunStatus, Stage
 from backend.pipeline.store import RunStore
-from backend.utils.io import read_json
+from backend.utils.io import read_json, write_json
 
 
 def _set_status(
@@ -45,10 +49,92 @@ def _set_status(
     )
 
 
-def run_pipeline(run_id: str, store: RunStore, settings: Settings) -> None:
+def _run_live(
+    run_id: str,
+    run_dir: Path,
+    record: Any,
+    perf_config: dict[str, Any],
+    gemini: GeminiClient,
+    logger: RunLogger,
+    metrics: dict[str, Any],
+    stop_event: Optional[threading.Event],
+    roi_cache: Any,
+) -> tuple[Any, dict[str, int], dict[str, tuple[Any, dict[str, Any]]], dict[str, int]]:
+    """Follow a live source and run Flash on each packet as soon as the local engine closes it.
+
+    Returns ``(manifest, timings, flash_results, live_counts)``; ``live_counts``
+    holds the Flash counters of the streamed packets, which ``analyze()`` does
+    not count again.
+    """
+    from backend.local_engine.proposal_engine import run_live_proposals
+
+    started = time.perf_counter()
+    lock = threading.Lock()
+    flash_results: dict[str, tuple[Any, dict[str, Any]]] = {}
+    live_counts: dict[str, int] = {"packets_sent_flash": 0, "flash_errors": 0}
+    flush_sec = float(perf_config["live_flush_sec"])
+    last_flush = [0.0]
+
+    def write_flash_decisions() -> None:
+        # Provisional events in the review UI are built from this file while the stream runs.
+        write_json(run_dir / "flash_decisions.json", {"decisions": [d for _e, d in flash_results.values()]})
+        last_flush[0] = time.perf_counter()
+
+    def flash_packet(candidate: Any, clip_path: Optional[Path], clip_offset_s: float) -> None:
+        event, decision = gemini.analyze_live_packet(candidate, clip_path, perf_config, live_counts, clip_offset_s, metrics_lock=lock)
+        with lock:
+            flash_results[candidate.packet_id] = (event, decision)
+            metrics.update(live_counts)
+            metrics["flash_done"] = len(flash_results)
+            metrics.setdefault("live_first_flash_ms", int((time.perf_counter() - started) * 1000))
+            if time.perf_counter() - last_flush[0] >= flush_sec:
+                write_flash_decisions()
+
+    with ThreadPoolExecutor(max_workers=max(1, int(perf_config["gemini_flash_concurrency"]))) as executor:
+        futures = []
+
+        def on_packet(candidate: Any, packet: dict[str, Any], clip_path: Optional[Path], clip_offset_s: float) -> None:
+            packet["routing"]["sent_to_flash"] = True
+            with lock:
+                live_counts["packets_sent_flash"] += 1
+                metrics["packets_total"] += 1
+                metrics["packets_sent_flash"] = live_counts["packets_sent_flash"]
+            futures.append(executor.submit(flash_packet, candidate, clip_path, clip_offset_s))
+
+        manifest, _payload, live_timings = run_live_proposals(
+            run_id=run_id,
+            run_dir=run_dir,
+            source=record.video_path,
+            roi_config_path=Path(record.roi_config_path),
+            proposal_config_path=Path("backend/config/proposal_config.json"),
+            perf_config=perf_config,
+            logger=logger,
+            on_packet=on_packet,
+            stop_event=stop_event,
+            roi_cache=roi_cache,
+        )
+        for future in futures:
+            future.result()
+    if flash_results:
+        write_flash_decisions()
+    return manifest, live_timings, flash_results, live_counts
+
+
+def _merge_gemini_metrics(metrics: dict[str, Any], gemini_metrics: dict[str, Any], live_counts: dict[str, int]) -> None:
+    """``analyze()`` counters cover only its own requests; add the ones a live run counted while streaming."""
+    metrics.update(gemini_metrics)
+    for key, value in live_counts.items():
+        metrics[key] = gemini_metrics.get(key, 0) + value
+
+
+def run_pipeline(run_id: str, store: RunStore, settings: Settings, stop_event: Optional[threading.Event] = None) -> None:
     # Lazy imports keep API bootable even when CV deps are missing until pipeline start.
-    from backend.local_engine.proposal_engine import run_local_proposals
+    from backend.local_engine.detectors import registered_detectors
+    from backend.local_engine.proposal_engine import run_local_proposals, run_streaming_proposals
+    from backend.local_engine.roi_cache import RoiMaskCache
     from backend.pipeline.ingest import ingest_video
+    from backend.pipeline.ingest_cache import IngestCache
+    from backend.video.sampling import adaptive_settings
     from backend.postprocess.merge import merge_results
 
     record = store.get(run_id)
@@ -70,6 +156,7 @@ def run_pipeline(run_id: str, store: RunStore, settings: Settings) -> None:
         "flash_concurrency": int(perf_config["gemini_flash_concurrency"]),
         "pro_concurrency": int(perf_config["gemini_pro_concurrency"]),
     }
+    gemini: Optional[GeminiClient] = None
 
     try:
         _set_status(
@@ -83,37 +170,107 @@ def run_pipeline(run_id: str, store: RunStore, settings: Settings) -> None:
             metrics=metrics,
         )
 
-        t0 = time.perf_counter()
-        manifest = ingest_video(
-            video_path=Path(record.video_path),
-            run_dir=run_dir,
-            short_fps=int(perf_config["analysis_fps_short"]),
-            long_fps=int(perf_config["analysis_fps_long"]),
-            long_video_threshold_sec=int(perf_config["long_video_threshold_sec"]),
+        response_cache = None
+        if perf_config["gemini_cache_enabled"]:
+            response_cache = GeminiResponseCache(
+                settings.cache_dir / "gemini",
+                perf_config["gemini_cache_ttl_hours"] * 3600.0,
+                perf_config["gemini_cache_max_mb"] * 1024 * 1024,
+            )
+        upload_registry = None
+        if perf_config["gemini_upload_reuse"] and settings.gemini_api_key:
+            upload_registry = UploadRegistry(
+                settings.cache_dir / "gemini_uploads",
+                settings.gemini_api_key,
+                perf_config["gemini_upload_min_ttl_sec"],
+            )
+        gemini = GeminiClient(
+            api_key=settings.gemini_api_key,
+            flash_model=settings.flash_model,
+            pro_model=settings.pro_model,
             logger=logger,
+            response_cache=response_cache,
+            upload_registry=upload_registry,
         )
-        timings[Stage.INGEST.value] = int((time.perf_counter() - t0) * 1000)
+        live_flash: dict[str, tuple[Any, dict[str, Any]]] = {}
+        live_counts: dict[str, int] = {}
+        # Compiled ROI masks are shared by every run from the same camera at the same working size.
+        roi_cache = RoiMaskCache(settings.cache_dir / "roi_masks") if perf_config["roi_cache_enabled"] else None
 
-        _set_status(
-            store,
-            run_id,
-            state=RunState.RUNNING,
-            stage=Stage.LOCAL_PROPOSALS,
-            progress=30,
-            timings=timings,
-            stage_message="Running local proposal heuristics",
-            metrics=metrics,
-        )
-        t1 = time.perf_counter()
-        run_local_proposals(
-            run_id=run_id,
-            run_dir=run_dir,
-            roi_config_path=Path(record.roi_config_path),
-            proposal_config_path=Path("backend/config/proposal_config.json"),
-            perf_config=perf_config,
-            logger=logger,
-        )
-        timings[Stage.LOCAL_PROPOSALS.value] = int((time.perf_counter() - t1) * 1000)
+        if record.source_type == "live":
+            _set_status(
+                store,
+                run_id,
+                state=RunState.RUNNING,
+                stage=Stage.LOCAL_PROPOSALS,
+                progress=10,
+                timings=timings,
+                stage_message="Following live source",
+                metrics=metrics,
+            )
+            manifest, live_timings, live_flash, live_counts = _run_live(
+                run_id, run_dir, record, perf_config, gemini, logger, metrics, stop_event, roi_cache
+            )
+            timings.update(live_timings)
+        elif perf_config["ingest_mode"] == "streaming":
+            # Fused pass: frames flow from the decoder into the feature extractor without a JPEG round trip.
+            manifest, _payload, fused_timings = run_streaming_proposals(
+                run_id=run_id,
+                run_dir=run_dir,
+                video_path=Path(record.video_path),
+                roi_config_path=Path(record.roi_config_path),
+                proposal_config_path=Path("backend/config/proposal_config.json"),
+                perf_config=perf_config,
+                logger=logger,
+                roi_cache=roi_cache,
+            )
+            timings.update(fused_timings)
+        else:
+            t0 = time.perf_counter()
+            ingest_cache = None
+            if perf_config["ingest_cache_enabled"]:
+                ingest_cache = IngestCache(settings.cache_dir / "ingest", perf_config["ingest_cache_max_mb"] * 1024 * 1024)
+            manifest = ingest_video(
+                video_path=Path(record.video_path),
+                run_dir=run_dir,
+                short_fps=int(perf_config["analysis_fps_short"]),
+                long_fps=int(perf_config["analysis_fps_long"]),
+                long_video_threshold_sec=int(perf_config["long_video_threshold_sec"]),
+                logger=logger,
+                sampling_strategy=perf_config["ingest_sampling_strategy"],
+                seek_min_stride=perf_config["ingest_seek_min_stride"],
+                workers=perf_config["ingest_workers"],
+                frame_store_backend=perf_config["frame_store_backend"],
+                working_long_edge=perf_config["local_downscale_long_edge"],
+                working_res_only=perf_config["ingest_working_res_only"],
+                cache=ingest_cache,
+                adaptive=adaptive_settings(perf_config),
+                encode_workers=perf_config["ingest_encode_workers"],
+                encode_queue=perf_config["ingest_encode_queue"],
+            )
+            timings[Stage.INGEST.value] = int((time.perf_counter() - t0) * 1000)
+
+            _set_status(
+                store,
+                run_id,
+                state=RunState.RUNNING,
+                stage=Stage.LOCAL_PROPOSALS,
+                progress=30,
+                timings=timings,
+                stage_message="Running local proposal heuristics",
+                metrics=metrics,
+            )
+            t1 = time.perf_counter()
+            run_local_proposals(
+                run_id=run_id,
+                run_dir=run_dir,
+                roi_config_path=Path(record.roi_config_path),
+                proposal_config_path=Path("backend/config/proposal_config.json"),
+                perf_config=perf_config,
+                logger=logger,
+                roi_cache=roi_cache,
+            )
+            timings[Stage.LOCAL_PROPOSALS.value] = int((time.perf_counter() - t1) * 1000)
 
         _set_status(
             store,
@@ -126,17 +283,11 @@ def run_pipeline(run_id: str, store: RunStore, settings: Settings) -> None:
             metrics=metrics,
         )
         t2 = time.perf_counter()
-        gemini = GeminiClient(
-            api_key=settings.gemini_api_key,
-            flash_model=settings.flash_model,
-            pro_model=settings.pro_model,
-            logger=logger,
-        )
 
         def progress_cb(stage_name: str, progress_pct: int, message: str, payload: Optional[dict[str, Any]] = None) -> None:
             stage = Stage.GEMINI_FLASH if stage_name == "GEMINI_FLASH" else Stage.GEMINI_PRO
             if payload:
-                metrics.update(payload)
+                _merge_gemini_metrics(metrics, payload, live_counts)
             _set_status(
                 store,
                 run_id,
@@ -153,8 +304,11 @@ def run_pipeline(run_id: str, store: RunStore, settings: Settings) -> None:
             video_path=Path(manifest["video_path"]),
             perf_config=perf_config,
             progress_cb=progress_cb,
+            flash_precomputed=live_flash,
+            roi_config=read_json(Path(record.roi_config_path)),
+            evidence_roi_keys={d.event_type.value: list(d.evidence_roi_keys) for d in registered_detectors()},
         )
-        metrics.update(gemini_metrics)
+        _merge_gemini_metrics(metrics, gemini_metrics, live_counts)
         timings[Stage.GEMINI_FLASH.value] = flash_time_ms
         timings[Stage.GEMINI_PRO.value] = pro_time_ms
 
@@ -212,6 +366,9 @@ def run_pipeline(run_id: str, store: RunStore, settings: Settings) -> None:
             error=str(exc),
             failed_stage=current_stage,
         )
+    finally:
+        if gemini is not None:
+            gemini.close()
 
 
 def export_run(run_id: str, store: RunStore, settings: Settings) -> Path:
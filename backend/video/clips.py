@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+import cv2
+
+
+def cut_clip(video_path: Path, start_s: float, end_s: float, path: Path, fps: float) -> Optional[tuple[Path, float]]:
+    """Encode ``[start_s, end_s]`` of ``video_path`` as a short MP4 sampled at about ``fps``.
+
+    Frames keep the source resolution (plates stay readable). Returns the clip
+    path and the source time of its first frame, which maps clip timestamps
+    back to the full video; None if nothing could be decoded.
+    """
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        return None
+    writer: Optional[cv2.VideoWriter] = None
+    try:
+        src_fps = float(cap.get(cv2.CAP_PROP_FPS) or 0.0) or 30.0
+        first = max(0, int(round(start_s * src_fps)))
+        last = max(first, int(round(end_s * src_fps)))
+        step = max(1, int(round(src_fps / max(fps, 0.1))))
+        if first:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, first)
+        for frame_idx in range(first, last + 1):
+            if not cap.grab():
+                break
+            if (frame_idx - first) % step:
+                continue
+            ok, frame = cap.retrieve()
+            if not ok:
+                break
+            if writer is None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                h, w = frame.shape[:2]
+                writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), src_fps / step, (w, h))
+            writer.write(frame)
+    finally:
+        cap.release()
+        if writer is not None:
+            writer.release()
+    if writer is None or not path.exists():
+        return None
+    return path, first / src_fps
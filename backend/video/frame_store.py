@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import abc
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from backend.video.manifest import FrameManifest
+
+
+RAW_FRAMES_FILE = "frames.raw"
+
+
+def frame_name(slot: int) -> str:
+    return f"f_{slot:05d}.jpg"
+
+
+def _fit(frame: np.ndarray, frame_shape: Optional[tuple[int, ...]]) -> np.ndarray:
+    if frame_shape is None or frame.shape == frame_shape:
+        return frame
+    return cv2.resize(frame, (frame_shape[1], frame_shape[0]), interpolation=cv2.INTER_AREA)
+
+
+class JpegFrameWriter:
+    """One JPEG per sampled frame under ``frames/`` (the original layout).
+
+    With ``encode_workers > 0`` frames are handed to a bounded queue drained by
+    encoder threads (``cv2.imwrite`` releases the GIL), so JPEG encoding
+    overlaps decoding. ``write`` blocks while the queue is full.
+    """
+
+    def __init__(
+        self,
+        run_dir: Path,
+        frame_shape: Optional[tuple[int, int, int]] = None,
+        encode_workers: int = 0,
+        queue_size: int = 16,
+    ) -> None:
+        self.frames_dir = run_dir / "frames"
+        self.frames_dir.mkdir(parents=True, exist_ok=True)
+        self.frame_shape = tuple(frame_shape) if frame_shape else None
+        self._encode_ms: list[float] = []
+        self._queue_max = 0
+        self._blocked_puts = 0
+        self._error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+        self._queue: Optional[queue.Queue] = None
+        self._threads: list[threading.Thread] = []
+        if encode_workers > 0:
+            self._queue = queue.Queue(maxsize=max(1, queue_size))
+            for n in range(encode_workers):
+                thread = threading.Thread(target=self._drain, name=f"jpeg-encoder-{n}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _encode(self, frame_path: Path, frame: np.ndarray) -> None:
+        t0 = time.perf_counter()
+        cv2.imwrite(str(frame_path), _fit(frame, self.frame_shape))
+        elapsed = (time.perf_counter() - t0) * 1000
+        with self._lock:
+            self._encode_ms.append(elapsed)
+
+    def _drain(self) -> None:
+        assert self._queue is not None
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if self._error is None:
+                    self._encode(*item)
+            except BaseException as exc:  # surfaced on the decode thread by write()/close()
+                self._error = exc
+            finally:
+                self._queue.task_done()
+
+    def _raise_pending(self) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"JPEG encode failed: {self._error}") from self._error
+
+    def write(self, slot: int, frame: np.ndarray) -> str:
+        frame_path = self.frames_dir / frame_name(slot)
+        if self._queue is None:
+            self._encode(frame_path, frame)
+            return str(frame_path)
+        self._raise_pending()
+        if self._queue.full():
+            self._blocked_puts += 1
+        self._queue.put((frame_path, frame))
+        self._queue_max = max(self._queue_max, self._queue.qsize())
+        return str(frame_path)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            encode_ms = list(self._encode_ms)
+        return {
+            "encoded": len(encode_ms),
+            "encode_ms_total": round(sum(encode_ms), 3),
+            "encode_ms_max": round(max(encode_ms, default=0.0), 3),
+            "queue_max": self._queue_max,
+            "blocked_puts": self._blocked_puts,
+        }
+
+    def close(self) -> None:
+        if self._queue is None:
+            return
+        for _thread in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._queue = None
+        self._raise_pending()
+
+
+class RawFrameWriter:
+    """Fixed-stride raw BGR frames in a single file; slot ``k`` starts at ``k * stride``.
+
+    Several processes may write disjoint slots of the same file concurrently.
+    """
+
+    def __init__(self, run_dir: Path, frame_shape: tuple[int, int, int]) -> None:
+        self.frames_dir = run_dir / "frames"
+        self.frame_shape = tuple(frame_shape)
+        self.stride = int(np.prod(frame_shape))
+        raw_path = run_dir / RAW_FRAMES_FILE
+        raw_path.touch(exist_ok=True)
+        self._fh = raw_path.open("r+b")
+
+    def write(self, slot: int, frame: np.ndarray) -> str:
+        frame = _fit(frame, self.frame_shape)
+        self._fh.seek(slot * self.stride)
+        self._fh.write(np.ascontiguousarray(frame, dtype=np.uint8).tobytes())
+        # Virtual path: the review UI and exporter resolve it through the FrameStore.
+        return str(self.frames_dir / frame_name(slot))
+
+    def stats(self) -> dict[str, Any]:
+        return {}
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+def open_frame_writer(
+    backend: str,
+    run_dir: Path,
+    frame_shape: Optional[tuple[int, int, int]] = None,
+    encode_workers: int = 0,
+    queue_size: int = 16,
+) -> Any:
+    if backend == "memmap":
+        if frame_shape is None:
+            raise ValueError("memmap frame store needs a fixed frame shape")
+        return RawFrameWriter(run_dir, frame_shape)
+    return JpegFrameWriter(run_dir, frame_shape, encode_workers, queue_size)
+
+
+def merge_writer_stats(parts: list[dict[str, Any]]) -> dict[str, Any]:
+    """Combine per-segment writer stats into the INGEST log fields."""
+    parts = [p for p in parts if p]
+    if not parts:
+        return {}
+    encoded = sum(p["encoded"] for p in parts)
+    total_ms = sum(p["encode_ms_total"] for p in parts)
+    return {
+        "encode_frames": encoded,
+        "encode_ms_mean": round(total_ms / encoded, 3) if encoded else 0.0,
+        "encode_ms_max": max(p["encode_ms_max"] for p in parts),
+        "encode_queue_max": max(p["queue_max"] for p in parts),
+        "encode_blocked_puts": sum(p["blocked_puts"] for p in parts),
+    }
+
+
+def raw_store_spec(frame_shape: tuple[int, int, int], slots: int) -> dict[str, Any]:
+    return {"backend": "memmap", "path": RAW_FRAMES_FILE, "dtype": "uint8", "shape": list(frame_shape), "slots": slots}
+
+
+class FrameStore(abc.ABC):
+    """Read access to a run's sampled frames, indexed like the manifest's ``sample_idx``."""
+
+    def __init__(self, manifest: FrameManifest) -> None:
+        self.manifest = manifest
+
+    @abc.abstractmethod
+    def read(self, sample_idx: int) -> Optional[np.ndarray]:
+        """Decoded BGR frame for ``sample_idx``, or None if it cannot be read."""
+
+    def index_for_path(self, path_value: str) -> Optional[int]:
+        return self.manifest.index_for_path(path_value)
+
+    def read_path(self, path_value: str) -> Optional[np.ndarray]:
+        idx = self.index_for_path(path_value)
+        return None if idx is None else self.read(idx)
+
+    def encode_jpeg(self, path_value: str) -> Optional[bytes]:
+        frame = self.read_path(path_value)
+        if frame is None:
+            return None
+        ok, buf = cv2.imencode(".jpg", frame)
+        return buf.tobytes() if ok else None
+
+    def materialize(self, path_value: str, dst: Path) -> bool:
+        data = self.encode_jpeg(path_value)
+        if data is None:
+            return False
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        dst.write_bytes(data)
+        return True
+
+    def close(self) -> None:
+        return None
+
+
+class JpegFrameStore(FrameStore):
+    def read(self, sample_idx: int) -> Optional[np.ndarray]:
+        return cv2.imread(self.manifest.path(sample_idx))
+
+    def encode_jpeg(self, path_value: str) -> Optional[bytes]:
+        idx = self.index_for_path(path_value)
+        if idx is None:
+            return None
+        path = Path(self.manifest.path(idx))
+        return path.read_bytes() if path.exists() else None
+
+
+class MemmapFrameStore(FrameStore):
+    def __init__(self, manifest: FrameManifest, raw_path: Path, frame_shape: tuple[int, int, int], slots: int) -> None:
+        super().__init__(manifest)
+        if slots > 0:
+            self._mm = np.memmap(raw_path, dtype=np.uint8, mode="r", shape=(slots, *frame_shape))
+        else:
+            self._mm = np.zeros((0, *frame_shape), dtype=np.uint8)
+
+    def read(self, sample_idx: int) -> Optional[np.ndarray]:
+        # Zero-copy view into the page cache.
+        return self._mm[int(self.manifest.slot[sample_idx])]
+
+    def close(self) -> None:
+        # Views handed out by read() keep the mapping alive until they are released.
+        self._mm = None
+
+
+def open_frame_store(manifest: FrameManifest) -> FrameStore:
+    spec = manifest.get("frame_store") or {"backend": "jpeg"}
+    if spec.get("backend") == "memmap":
+        return MemmapFrameStore(manifest, manifest.run_dir / spec["path"], tuple(spec["shape"]), int(spec["slots"]))
+    return JpegFrameStore(manifest)
@@ -0,0 +1,155 @@
+"""Source-video helpers shared by ingest, the local engine and export: opening a
+video, the sampling plan, manifest frame records and targeted frame extraction.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+from typing import Iterable
+from typing import Optional
+
+import cv2
+
+from backend.video.manifest import FrameManifest
+
+
+def open_video(video_path: Path) -> cv2.VideoCapture:
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise RuntimeError("Failed to open video")
+    return cap
+
+
+def sampling_plan(cap: cv2.VideoCapture, short_fps: int, long_fps: int, long_video_threshold_sec: int) -> dict[str, Any]:
+    source_fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+    duration = frame_count / source_fps if source_fps > 0 else 0
+    analysis_fps = long_fps if duration > long_video_threshold_sec else short_fps
+    sample_every = max(int(round(source_fps / max(analysis_fps, 1))), 1)
+    return {
+        "source_width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0),
+        "source_height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0),
+        "source_fps": source_fps,
+        "frame_count": frame_count,
+        "duration_sec": duration,
+        "analysis_fps": analysis_fps,
+        "sample_every": sample_every,
+    }
+
+
+def frame_record(
+    frame_idx: int,
+    sample_idx: int,
+    source_fps: float,
+    frame_path: Path,
+    shape: tuple[int, ...],
+    slot: Optional[int] = None,
+    materialized: Optional[bool] = None,
+) -> dict[str, Any]:
+    record = {
+        "frame_idx": frame_idx,
+        "sample_idx": sample_idx,
+        "ts_sec": round(frame_idx / source_fps, 3),
+        "path": str(frame_path),
+        "height": int(shape[0]),
+        "width": int(shape[1]),
+    }
+    if slot is not None:
+        record["slot"] = slot
+    if materialized is not None:
+        record["materialized"] = materialized
+    return record
+
+
+def build_manifest(video_path: Path, plan: dict[str, Any], frames: list[dict[str, Any]], **extra: Any) -> dict[str, Any]:
+    manifest = {
+        "video_path": str(video_path),
+        "source_width": plan["source_width"],
+        "source_height": plan["source_height"],
+        "source_fps": plan["source_fps"],
+        "analysis_fps": plan["analysis_fps"],
+        "duration_sec": round(plan["duration_sec"], 3),
+        "frame_count": plan["frame_count"],
+        "sample_count": len(frames),
+        "frames": frames,
+    }
+    manifest.update(extra)
+    return manifest
+
+
+def extract_frames(video_path: Path, targets: dict[int, Path]) -> int:
+    """Decode the requested source frame indices and write them as JPEGs.
+
+    Indices are visited in ascending order; short gaps are bridged with grab()
+    and longer ones with a seek, so only a handful of frames are decoded.
+    """
+    if not targets:
+        return 0
+    cap = open_video(video_path)
+    written = 0
+    pos = 0
+    try:
+        for frame_idx in sorted(targets):
+            if frame_idx < pos or frame_idx - pos > 30:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+                pos = frame_idx
+            while pos < frame_idx:
+                if not cap.grab():
+                    break
+                pos += 1
+            ok, frame = cap.read()
+            if not ok:
+                break
+            pos += 1
+            out_path = targets[frame_idx]
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            cv2.imwrite(str(out_path), frame)
+            written += 1
+    finally:
+        cap.release()
+    return written
+
+
+def materialize_samples(manifest: FrameManifest, sample_indices: Iterable[int]) -> int:
+    """Write the listed samples that are not on disk yet, decoding them from the source video.
+
+    Only ``anchors_only`` manifests (streaming ingest) have such samples; they
+    are marked materialized once written. Returns the number of frames written.
+    """
+    indices = sorted(set(sample_indices))
+    missing = {int(manifest.frame_idx[i]): Path(manifest.path(i)) for i in indices if not Path(manifest.path(i)).exists()}
+    written = extract_frames(Path(str(manifest["video_path"])), missing)
+    manifest.mark_materialized([i for i in indices if not manifest.is_materialized(i) and Path(manifest.path(i)).exists()])
+    return written
+
+
+def full_res_frame_path(run_dir: Path, frame_idx: int) -> Path:
+    return run_dir / "anchors" / f"a_{frame_idx:06d}.jpg"
+
+
+def materialize_full_res_frames(run_dir: Path, manifest: FrameManifest, path_values: list[str]) -> dict[str, Path]:
+    """Lazily extract source-resolution copies of the given sampled frame paths.
+
+    Returns a mapping from each resolvable path value to its ``anchors/`` file.
+    Runs whose stored frames already are full resolution map to nothing.
+    """
+    source_width = int(manifest.get("source_width") or 0)
+    if not len(manifest) or not source_width or manifest.frame_width >= source_width:
+        return {}
+    video_path = Path(str(manifest.get("video_path", "")))
+    if not video_path.exists():
+        return {}
+
+    resolved: dict[str, Path] = {}
+    targets: dict[int, Path] = {}
+    for value in path_values:
+        sample_idx = manifest.index_for_path(value)
+        if sample_idx is None:
+            continue
+        frame_idx = int(manifest.frame_idx[sample_idx])
+        out_path = full_res_frame_path(run_dir, frame_idx)
+        resolved[value] = out_path
+        if not out_path.exists():
+            targets[frame_idx] = out_path
+    extract_frames(video_path, targets)
+    return {value: out_path for value, out_path in resolved.items() if out_path.exists()}
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Iterator
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+def is_stream_url(source: str) -> bool:
+    return "://" in source
+
+
+class FrameRing:
+    """Bounded buffer of the most recent working-resolution samples.
+
+    Holds ``(sample_idx, frame_idx, ts_sec, frame)``; memory is fixed by
+    ``capacity`` however long the stream runs.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._items: deque[tuple[int, int, float, np.ndarray]] = deque(maxlen=max(1, capacity))
+
+    def push(self, sample_idx: int, frame_idx: int, ts_sec: float, frame: np.ndarray) -> None:
+        self._items.append((sample_idx, frame_idx, ts_sec, frame))
+
+    @property
+    def oldest(self) -> int:
+        return self._items[0][0] if self._items else 0
+
+    def window(self, start_i: int, end_i: int) -> list[tuple[int, int, float, np.ndarray]]:
+        return [item for item in self._items if start_i <= item[0] <= end_i]
+
+
+def iter_live_frames(
+    source: str,
+    sample_every: int,
+    idle_timeout_sec: float,
+    poll_sec: float,
+    realtime: bool = False,
+    stop_event: Optional[threading.Event] = None,
+) -> Iterator[tuple[int, np.ndarray]]:
+    """Yield ``(frame_idx, frame)`` for every ``sample_every``-th frame of a live source.
+
+    Files are followed like ``tail -f``: at end of file the capture is reopened
+    and repositioned until no new frame shows up for ``idle_timeout_sec``.
+    Stream URLs are reconnected the same way. ``realtime`` paces a file replay
+    at the source frame rate so it behaves like a camera feed.
+    """
+    frame_idx = 0
+    started = time.perf_counter()
+    last_frame_at = time.perf_counter()
+    cap: Optional[cv2.VideoCapture] = None
+    fps = 0.0
+    try:
+        while stop_event is None or not stop_event.is_set():
+            if cap is None:
+                cap = cv2.VideoCapture(source)
+                if cap.isOpened():
+                    fps = fps or float(cap.get(cv2.CAP_PROP_FPS) or 30.0)
+                    if frame_idx and not is_stream_url(source):
+                        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+            if not cap.isOpened() or not cap.grab():
+                if time.perf_counter() - last_frame_at > idle_timeout_sec:
+                    break
+                cap.release()
+                cap = None
+                time.sleep(poll_sec)
+                continue
+            last_frame_at = time.perf_counter()
+            if frame_idx % sample_every == 0:
+                ok, frame = cap.retrieve()
+                if ok:
+                    if realtime and fps > 0:
+                        delay = frame_idx / fps - (time.perf_counter() - started)
+                        if delay > 0:
+                            time.sleep(delay)
+                    yield frame_idx, frame
+            frame_idx += 1
+    finally:
+        if cap is not None:
+            cap.release()
+
+
+def write_clip(frames: list[np.ndarray], path: Path, fps: float) -> Optional[Path]:
+    """Encode buffered frames as a short MP4 (what Gemini gets for a live packet)."""
+    if not frames:
+        return None
+    path.parent.mkdir(parents=True, exist_ok=True)
+    h, w = frames[0].shape[:2]
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), max(fps, 1.0), (w, h))
+    try:
+        for frame in frames:
+            writer.write(frame)
+    finally:
+        writer.release()
+    return path if path.exists() else None
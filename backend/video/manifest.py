@@ -0,0 +1,233 @@
+"""Columnar frames manifest.
+
+``frames_manifest.json`` holds only run-level fields; the per-frame columns
+(``frame_idx``, ``ts_sec``, ``slot`` and optionally ``sample_fps``) live in the
+``frames_index.npz`` sidecar and frame paths are rebuilt from a shared
+``path_template``. Streaming runs list every sample but only write the
+anchor frames; their optional ``materialized`` column says which are on
+disk. Every consumer goes through :func:`load_manifest`, which also reads
+the older one-dict-per-frame JSON layout.
+
+Usage: python -m backend.video.manifest RUN_DIR [--out frames_manifest_full.json]
+"""
+from __future__ import annotations
+
+import argparse
+import re
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+import numpy as np
+
+from backend.utils.io import read_json, write_json
+
+
+MANIFEST_FILE = "frames_manifest.json"
+FRAMES_INDEX_FILE = "frames_index.npz"
+MANIFEST_VERSION = 2
+DEFAULT_PATH_TEMPLATE = "frames/f_{slot:05d}.jpg"
+
+_SLOT_RE = re.compile(r"^f_(\d+)\.jpg$")
+
+
+class FrameManifest:
+    """Sampled frames of a run, indexed by ``sample_idx``.
+
+    Run-level fields are read with ``manifest["duration_sec"]`` /
+    ``manifest.get(...)``; per-frame values come from the NumPy columns.
+    """
+
+    def __init__(
+        self,
+        run_dir: Path,
+        header: dict[str, Any],
+        frame_idx: np.ndarray,
+        ts_sec: np.ndarray,
+        slot: np.ndarray,
+        sample_fps: Optional[np.ndarray] = None,
+        paths: Optional[list[str]] = None,
+        materialized: Optional[np.ndarray] = None,
+    ) -> None:
+        self.run_dir = run_dir
+        self.header = header
+        self.frame_idx = frame_idx
+        self.ts_sec = ts_sec
+        self.slot = slot
+        self.sample_fps = sample_fps
+        # Which frames are on disk; None when all of them are.
+        self.materialized = materialized
+        # Only set for legacy manifests whose frame names do not follow the template.
+        self._paths = paths
+        self._by_name: Optional[dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return int(self.frame_idx.shape[0])
+
+    def __getitem__(self, key: str) -> Any:
+        return self.header[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.header.get(key, default)
+
+    @property
+    def frame_width(self) -> int:
+        return int(self.header.get("frame_width") or 0)
+
+    @property
+    def frame_height(self) -> int:
+        return int(self.header.get("frame_height") or 0)
+
+    def rel_path(self, sample_idx: int) -> str:
+        if self._paths is not None:
+            return self._paths[sample_idx]
+        return self.header.get("path_template", DEFAULT_PATH_TEMPLATE).format(slot=int(self.slot[sample_idx]))
+
+    def path(self, sample_idx: int) -> str:
+        return str(self.run_dir / self.rel_path(sample_idx))
+
+    def is_materialized(self, sample_idx: int) -> bool:
+        return self.materialized is None or bool(self.materialized[sample_idx])
+
+    def mark_materialized(self, sample_indices: list[int]) -> None:
+        if self.materialized is None or not sample_indices:
+            return
+        self.materialized[sample_indices] = True
+        self.save()
+
+    def index_for_path(self, path_value: str) -> Optional[int]:
+        if self._by_name is None:
+            self._by_name = {Path(self.rel_path(i)).name: i for i in range(len(self))}
+        return self._by_name.get(Path(path_value).name)
+
+    def frame(self, sample_idx: int) -> dict[str, Any]:
+        record: dict[str, Any] = {
+            "frame_idx": int(self.frame_idx[sample_idx]),
+            "sample_idx": sample_idx,
+            "ts_sec": float(self.ts_sec[sample_idx]),
+            "path": self.path(sample_idx),
+            "height": self.frame_height,
+            "width": self.frame_width,
+        }
+        if (self.header.get("frame_store") or {}).get("backend") == "memmap":
+            record["slot"] = int(self.slot[sample_idx])
+        if self.sample_fps is not None:
+            record["sample_fps"] = float(self.sample_fps[sample_idx])
+        if not self.is_materialized(sample_idx):
+            # No file behind this sample; consumers must not build artifact URLs from it.
+            record["path"] = None
+            record["materialized"] = False
+        return record
+
+    def to_dict(self) -> dict[str, Any]:
+        """The expanded one-dict-per-frame JSON form (export only)."""
+        payload = {k: v for k, v in self.header.items() if k not in ("frames_format", "frames_index", "path_template")}
+        payload["frames"] = [self.frame(i) for i in range(len(self))]
+        return payload
+
+    def save(self, run_dir: Optional[Path] = None) -> None:
+        target = run_dir or self.run_dir
+        target.mkdir(parents=True, exist_ok=True)
+        columns = {"frame_idx": self.frame_idx, "ts_sec": self.ts_sec, "slot": self.slot}
+        if self.sample_fps is not None:
+            columns["sample_fps"] = self.sample_fps
+        if self.materialized is not None:
+            columns["materialized"] = self.materialized
+        with (target / FRAMES_INDEX_FILE).open("wb") as fh:
+            np.savez(fh, **columns)
+        write_json(target / MANIFEST_FILE, self.header)
+
+    @classmethod
+    def from_dict(cls, run_dir: Path, manifest: dict[str, Any]) -> "FrameManifest":
+        frames = manifest.get("frames", [])
+        header = {k: v for k, v in manifest.items() if k != "frames"}
+        header.update(
+            {
+                "manifest_version": MANIFEST_VERSION,
+                "frames_format": "columnar",
+                "frames_index": FRAMES_INDEX_FILE,
+                "path_template": DEFAULT_PATH_TEMPLATE,
+                "sample_count": len(frames),
+            }
+        )
+        header.setdefault("frame_width", int(frames[0]["width"]) if frames else int(manifest.get("source_width") or 0))
+        header.setdefault("frame_height", int(frames[0]["height"]) if frames else int(manifest.get("source_height") or 0))
+
+        slots: list[int] = []
+        paths: Optional[list[str]] = None
+        for i, frame in enumerate(frames):
+            match = _SLOT_RE.match(Path(str(frame["path"])).name)
+            if "slot" in frame:
+                slots.append(int(frame["slot"]))
+            elif match:
+                slots.append(int(match.group(1)))
+            else:
+                slots.append(i)
+                paths = []
+        if paths is not None:
+            paths = [str(f["path"]) for f in frames]
+
+        sample_fps = None
+        if frames and "sample_fps" in frames[0]:
+            sample_fps = np.array([f["sample_fps"] for f in frames], dtype=np.float32)
+        materialized = None
+        if any("materialized" in f for f in frames):
+            materialized = np.array([bool(f.get("materialized", True)) for f in frames], dtype=bool)
+        return cls(
+            run_dir,
+            header,
+            np.array([f["frame_idx"] for f in frames], dtype=np.int64),
+            np.array([f["ts_sec"] for f in frames], dtype=np.float64),
+            np.array(slots, dtype=np.int64),
+            sample_fps,
+            paths,
+            materialized,
+        )
+
+
+def write_manifest(run_dir: Path, manifest: dict[str, Any]) -> FrameManifest:
+    """Convert a manifest built with ``build_manifest`` to the columnar layout and write it."""
+    columnar = FrameManifest.from_dict(run_dir, manifest)
+    columnar.save()
+    return columnar
+
+
+def load_manifest(run_dir: Path) -> Optional[FrameManifest]:
+    header_path = run_dir / MANIFEST_FILE
+    if not header_path.exists():
+        return None
+    header = read_json(header_path)
+    if header.get("frames_format") != "columnar":
+        # Runs written before the columnar layout.
+        return FrameManifest.from_dict(run_dir, header)
+    with np.load(run_dir / header.get("frames_index", FRAMES_INDEX_FILE)) as columns:
+        return FrameManifest(
+            run_dir,
+            header,
+            columns["frame_idx"],
+            columns["ts_sec"],
+            columns["slot"],
+            columns["sample_fps"] if "sample_fps" in columns.files else None,
+            materialized=columns["materialized"] if "materialized" in columns.files else None,
+        )
+
+
+def export_manifest_json(run_dir: Path, out_path: Optional[Path] = None) -> Path:
+    manifest = load_manifest(run_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No frames manifest in {run_dir}")
+    out_path = out_path or run_dir / "frames_manifest_full.json"
+    write_json(out_path, manifest.to_dict())
+    return out_path
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Export a run's frames manifest as expanded JSON.")
+    parser.add_argument("run_dir", type=Path)
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args(argv)
+    print(export_manifest_json(args.run_dir, args.out))
+
+
+if __name__ == "__main__":
+    main()
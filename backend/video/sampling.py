@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from typing import Any
+from typing import Iterator
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from backend.config.perf import SAMPLING_STRATEGIES
+
+
+def resolve_strategy(strategy: str, sample_every: int, seek_min_stride: int) -> str:
+    if strategy not in SAMPLING_STRATEGIES or strategy == "auto":
+        # Seeking restarts decode at the previous keyframe, so it only pays off for sparse sampling.
+        return "seek" if sample_every >= seek_min_stride else "grab"
+    return strategy
+
+
+def _seek_to(cap: cv2.VideoCapture, start_frame: int) -> None:
+    if start_frame > 0:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+
+
+def _iter_read(cap: cv2.VideoCapture, sample_every: int, start_frame: int, end_frame: Optional[int]) -> Iterator[tuple[int, np.ndarray]]:
+    _seek_to(cap, start_frame)
+    frame_idx = start_frame
+    while end_frame is None or frame_idx < end_frame:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        if frame_idx % sample_every == 0:
+            yield frame_idx, frame
+        frame_idx += 1
+
+
+def _iter_grab(cap: cv2.VideoCapture, sample_every: int, start_frame: int, end_frame: Optional[int]) -> Iterator[tuple[int, np.ndarray]]:
+    # grab() demuxes and decodes without the colour conversion/copy; retrieve() only for kept frames.
+    _seek_to(cap, start_frame)
+    frame_idx = start_frame
+    while (end_frame is None or frame_idx < end_frame) and cap.grab():
+        if frame_idx % sample_every == 0:
+            ok, frame = cap.retrieve()
+            if not ok:
+                break
+            yield frame_idx, frame
+        frame_idx += 1
+
+
+def _iter_seek(cap: cv2.VideoCapture, sample_every: int, start_frame: int, end_frame: Optional[int]) -> Iterator[tuple[int, np.ndarray]]:
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+    if frame_count <= 0:
+        # Without a reliable length there is nothing to seek against.
+        yield from _iter_grab(cap, sample_every, start_frame, end_frame)
+        return
+    stop = frame_count if end_frame is None else min(end_frame, frame_count)
+    for frame_idx in range(start_frame, stop, sample_every):
+        if frame_idx:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+        ok, frame = cap.read()
+        if not ok:
+            break
+        yield frame_idx, frame
+
+
+def iter_sampled_frames(
+    cap: cv2.VideoCapture,
+    sample_every: int,
+    strategy: str = "grab",
+    start_frame: int = 0,
+    end_frame: Optional[int] = None,
+) -> Iterator[tuple[int, np.ndarray]]:
+    """Yield ``(frame_idx, frame)`` for every ``sample_every``-th source frame.
+
+    ``read`` decodes and converts every frame, ``grab`` decodes every frame but
+    only converts sampled ones, ``seek`` jumps straight to each sampled frame.
+    ``start_frame`` must sit on the sampling grid; ``end_frame`` is exclusive.
+    """
+    if strategy == "read":
+        return _iter_read(cap, sample_every, start_frame, end_frame)
+    if strategy == "seek":
+        return _iter_seek(cap, sample_every, start_frame, end_frame)
+    return _iter_grab(cap, sample_every, start_frame, end_frame)
+
+
+def adaptive_settings(perf_config: dict[str, Any]) -> Optional[dict[str, float]]:
+    if not perf_config.get("adaptive_sampling"):
+        return None
+    return {
+        "max_fps": float(perf_config["adaptive_max_fps"]),
+        "min_fps": float(perf_config["adaptive_min_fps"]),
+        "motion_threshold": float(perf_config["adaptive_motion_threshold"]),
+        "hold_sec": float(perf_config["adaptive_hold_sec"]),
+    }
+
+
+def adaptive_grid(source_fps: float, settings: dict[str, float]) -> dict[str, Any]:
+    fine_every = max(1, int(round(source_fps / max(settings["max_fps"], 0.1))))
+    floor_every = max(fine_every, int(round(source_fps / max(settings["min_fps"], 0.01))))
+    return {
+        "fine_every": fine_every,
+        "floor_every": floor_every,
+        "hold_frames": int(round(settings["hold_sec"] * source_fps)),
+        "motion_threshold": settings["motion_threshold"],
+    }
+
+
+def adaptive_lead_frames(grid: dict[str, Any], sample_every: int, start_frame: int) -> int:
+    """Grid-aligned source frames to replay before a segment starting at ``start_frame``.
+
+    ``iter_adaptive_frames`` keeps its motion hold and floor phase across the
+    stream, so a segment that starts cold keeps frames the sequential pass
+    drops and vice versa. Replaying one hold window or floor interval,
+    whichever is longer, restores a hold still running at the boundary and
+    puts the floor back within one ``floor_every`` of the sequential phase.
+    """
+    span = max(grid["hold_frames"], grid["floor_every"]) + sample_every
+    return min(start_frame, -(-span // sample_every) * sample_every)
+
+
+ADAPTIVE_PIXEL_DELTA = 12
+
+
+def _tiny_gray(frame: np.ndarray, width: int = 64) -> np.ndarray:
+    h, w = frame.shape[:2]
+    tiny = cv2.resize(frame, (width, max(1, int(round(h * width / float(w))))), interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(tiny, cv2.COLOR_BGR2GRAY)
+
+
+def iter_adaptive_frames(
+    frames: Iterator[tuple[int, np.ndarray]],
+    floor_every: int,
+    motion_threshold: float,
+    hold_frames: int,
+) -> Iterator[tuple[int, np.ndarray]]:
+    """Thin a fine-grid frame stream down to motion bursts plus a static floor.
+
+    Every frame is compared with the previous fine-grid frame at 64px wide;
+    when more than ``motion_threshold`` percent of the pixels changed, frames
+    are kept for the next ``hold_frames`` source frames. Otherwise only one
+    frame per ``floor_every`` survives.
+    """
+    prev_tiny: Optional[np.ndarray] = None
+    last_kept: Optional[int] = None
+    hold_until = -1
+    for frame_idx, frame in frames:
+        tiny = _tiny_gray(frame)
+        if prev_tiny is not None and tiny.shape == prev_tiny.shape:
+            # Fraction of changed pixels rather than mean difference: a small moving
+            # vehicle barely moves the mean but lights up a compact patch.
+            changed = cv2.countNonZero(cv2.threshold(cv2.absdiff(tiny, prev_tiny), ADAPTIVE_PIXEL_DELTA, 255, cv2.THRESH_BINARY)[1])
+            if changed * 100.0 / tiny.size >= motion_threshold:
+                hold_until = frame_idx + hold_frames
+        prev_tiny = tiny
+        if last_kept is None or frame_idx <= hold_until or frame_idx - last_kept >= floor_every:
+            last_kept = frame_idx
+            yield frame_idx, frame
+
+
+def sample_rates(frame_indices: list[int], source_fps: float, first_fps: float) -> list[float]:
+    """Local sampling density (samples/s) of each kept frame, from the gap to its predecessor."""
+    rates: list[float] = []
+    prev: Optional[int] = None
+    for frame_idx in frame_indices:
+        gap = frame_idx - prev if prev is not None else 0
+        rates.append(round(source_fps / gap, 3) if gap > 0 else float(first_fps))
+        prev = frame_idx
+    return rates
@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from backend.benchmarks.synthetic import write_synthetic_clip
+from backend.logging_utils.json_logger import RunLogger
+from backend.pipeline.ingest import ingest_video, segment_bounds
+from backend.video.sampling import adaptive_grid, adaptive_lead_frames
+
+ADAPTIVE = {"max_fps": 8.0, "min_fps": 0.5, "motion_threshold": 0.15, "hold_sec": 1.0}
+
+
+def test_lead_frames_stay_on_grid_and_inside_the_clip():
+    grid = adaptive_grid(30.0, ADAPTIVE)
+    lead = adaptive_lead_frames(grid, grid["fine_every"], 600)
+    assert lead % grid["fine_every"] == 0
+    assert lead > max(grid["hold_frames"], grid["floor_every"])
+    assert adaptive_lead_frames(grid, grid["fine_every"], 8) == 8
+
+
+def test_segmented_adaptive_ingest_matches_sequential_within_one_sample_per_boundary(tmp_path):
+    video = write_synthetic_clip(tmp_path / "synthetic.mp4", 20.0, 640, 360, 30)
+    logger = RunLogger("test", tmp_path / "log.jsonl")
+    sequential = ingest_video(video, tmp_path / "seq", 8, 2, 300, logger, adaptive=ADAPTIVE)
+    segmented = ingest_video(video, tmp_path / "seg", 8, 2, 300, logger, workers=6, adaptive=ADAPTIVE)
+    boundaries = len(segment_bounds(600, adaptive_grid(30.0, ADAPTIVE)["fine_every"], 6)) - 1
+    assert boundaries == 5
+    # Only the floor phase can drift at a boundary; motion bursts are restored by the lead-in.
+    assert len(set(segmented.frame_idx) ^ set(sequential.frame_idx)) <= boundaries
+    assert abs(len(segmented) - len(sequential)) <= boundaries
@@ -0,0 +1,43 @@
+from pathlib import Path
+
+import numpy as np
+
+from backend.local_engine.proposal_engine import _group_runs, _sample_weights
+from backend.video.manifest import FrameManifest
+
+
+def _adaptive_manifest(sample_fps: list[float], analysis_fps: float = 8.0) -> FrameManifest:
+    n = len(sample_fps)
+    return FrameManifest(
+        Path("."),
+        {"analysis_fps": analysis_fps, "duration_sec": float(n)},
+        np.arange(n, dtype=np.int64),
+        np.arange(n, dtype=np.float64),
+        np.arange(n, dtype=np.int64),
+        sample_fps=np.array(sample_fps, dtype=np.float32),
+    )
+
+
+def test_isolated_floor_rate_hit_makes_no_run():
+    # A static stretch sampled at the 0.5 fps floor: each sample spans 16 analysis ticks.
+    manifest = _adaptive_manifest([0.5] * 10)
+    assert _group_runs([4], 3, _sample_weights(manifest)) == []
+
+
+def test_floor_rate_run_needs_k_hits():
+    manifest = _adaptive_manifest([0.5] * 10)
+    weights = _sample_weights(manifest)
+    assert _group_runs([3, 4], 3, weights) == []
+    assert _group_runs([3, 4, 5], 3, weights) == [(3, 5)]
+
+
+def test_dense_burst_needs_the_same_stretch_of_time():
+    # Samples at twice analysis_fps count for half a hit each.
+    manifest = _adaptive_manifest([16.0] * 10)
+    weights = _sample_weights(manifest)
+    assert _group_runs([0, 1, 2, 3, 4], 3, weights) == []
+    assert _group_runs([0, 1, 2, 3, 4, 5], 3, weights) == [(0, 5)]
+
+
+def test_fixed_rate_runs_are_unweighted():
+    assert _group_runs([1, 2, 3, 7, 8], 3) == [(1, 3)]
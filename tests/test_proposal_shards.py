@@ -0,0 +1,42 @@
+from pathlib import Path
+
+from backend.benchmarks.synthetic import write_synthetic_clip
+from backend.config.perf import load_perf_config
+from backend.local_engine.proposal_engine import _load_config, _working_size, extract_features
+from backend.logging_utils.json_logger import RunLogger
+from backend.pipeline.ingest import ingest_video
+from backend.utils.io import read_json
+
+CONFIG_DIR = Path(__file__).resolve().parents[1] / "backend" / "config"
+
+
+def _track_count(extractor) -> int:
+    return len({row[0] for rows in extractor.track_rows.values() for row in rows})
+
+
+def _extract(tmp_path: Path, seconds: float, **perf_overrides):
+    video = write_synthetic_clip(tmp_path / "synthetic.mp4", seconds, 640, 360, 30)
+    manifest = ingest_video(video, tmp_path / "run", 8, 2, 300, RunLogger("test", tmp_path / "log.jsonl"))
+    perf = load_perf_config(CONFIG_DIR / "perf_config.json")
+    cfg = _load_config(CONFIG_DIR / "proposal_config.json")
+    roi_cfg = read_json(CONFIG_DIR / "default_roi_config.json")
+    work_w, work_h, _scale = _working_size(manifest.frame_width, manifest.frame_height, perf)
+    sequential, _ = extract_features(tmp_path / "run", manifest, roi_cfg, cfg, work_w, work_h, perf)
+    sharded, used = extract_features(
+        tmp_path / "run", manifest, roi_cfg, cfg, work_w, work_h, dict(perf, **perf_overrides)
+    )
+    return sequential, sharded, used
+
+
+def test_stitched_tracks_match_sequential_across_shard_boundary(tmp_path):
+    sequential, sharded, used = _extract(
+        tmp_path, 20.0, proposal_workers=2, proposal_warmup_frames=10, proposal_min_shard_samples=1
+    )
+    assert used == 2
+    assert _track_count(sharded) == _track_count(sequential)
+    assert sorted(sharded.track_rows) == sorted(sequential.track_rows)
+
+
+def test_short_clip_is_not_sharded(tmp_path):
+    _sequential, _sharded, used = _extract(tmp_path, 5.0, proposal_workers=4)
+    assert used == 1